@@ -88,4 +88,161 @@ insert into products (categoryid, name, price, stockquantity, status) values
 
 insert into customers (firstname, lastname, email, phonenumber) values
 ('jan', 'novk', 'jan.novak@email.cz', '123456789'),
-('marie', 'svobodov', 'marie.s@email.cz', '987654321');
\ No newline at end of file
+('marie', 'svobodov', 'marie.s@email.cz', '987654321');
+
+go
+-- indexy pro strnkovn objednvek podle (orderdate, orderid) a filtry
+create index ix_orders_orderdate on orders (orderdate desc, orderid desc)
+    include (customerid, totalamount, status, isdeleted);
+
+create index ix_orders_status_orderdate on orders (status, orderdate desc, orderid desc)
+    include (customerid, totalamount, isdeleted);
+
+create index ix_orders_customer_orderdate on orders (customerid, orderdate desc, orderid desc)
+    include (totalamount, status, isdeleted);
+go
+
+-- prstkov obnova produkt podle lastupdated
+create index ix_products_lastupdated on products (lastupdated)
+    include (categoryid, name, price, stockquantity, status);
+
+-- zznamy o smazanch produktech, aby je klient mohl odebrat bez plnho naten
+create table producttombstones (
+    productid int primary key,
+    deletedat datetime not null default getdate()
+);
+
+create index ix_producttombstones_deletedat on producttombstones (deletedat);
+go
+
+create trigger tr_products_delete on products
+after delete
+as
+begin
+    set nocount on;
+    insert into producttombstones (productid, deletedat)
+    select d.productid, getdate()
+    from deleted d
+    where not exists (select 1 from producttombstones t where t.productid = d.productid);
+end;
+go
+
+-- poloky objednvky jako tabulkov parametr pro usp_saveorder
+create type orderlinetype as table (
+    productid int not null,
+    quantity int not null,
+    unitprice float not null
+);
+go
+
+-- uloen objednvky jednm volnm: hlavika, sklad a poloky mnoinov
+create procedure usp_saveorder
+    @orderid int,
+    @customerid int,
+    @status varchar(20),
+    @totalamount float,
+    @lines orderlinetype readonly
+as
+begin
+    set nocount on;
+
+    if @orderid is null
+    begin
+        declare @neworder table (orderid int);
+        insert into orders (customerid, status, totalamount)
+        output inserted.orderid into @neworder
+        values (@customerid, @status, @totalamount);
+        select @orderid = orderid from @neworder;
+    end
+    else
+    begin
+        update orders
+        set customerid = @customerid, status = @status, totalamount = @totalamount
+        where orderid = @orderid;
+
+        delete from orderitems where orderid = @orderid;
+    end
+
+    update p
+    set stockquantity = p.stockquantity - l.quantity, lastupdated = getdate()
+    from products p
+    join (select productid, sum(quantity) as quantity
+          from @lines
+          group by productid) l on l.productid = p.productid;
+
+    insert into orderitems (orderid, productid, quantity, unitprice)
+    select @orderid, productid, quantity, unitprice
+    from @lines;
+
+    select @orderid as orderid;
+end;
+go
+
+-- archiv objednvek: star a uzaven objednvky se pesouvaj z horkch tabulek
+create table ordersarchive (
+    orderid int primary key,
+    customerid int foreign key references customers(customerid),
+    orderdate datetime,
+    totalamount float not null,
+    status varchar(20),
+    isdeleted bit default 0,
+    archivedat datetime not null default getdate()
+);
+
+create table orderitemsarchive (
+    orderid int foreign key references ordersarchive(orderid),
+    productid int foreign key references products(productid),
+    quantity int not null,
+    unitprice float not null,
+    primary key (orderid, productid)
+);
+
+create index ix_ordersarchive_orderdate on ordersarchive (orderdate desc, orderid desc)
+    include (customerid, totalamount, status, isdeleted);
+go
+
+-- souhrn objednvek; s @includearchive = 1 i z archivu
+create function fn_ordersummary (@includearchive bit)
+returns table
+as
+return
+    select 
+        o.orderid,
+        c.firstname + ' ' + c.lastname as customername,
+        o.orderdate,
+        o.totalamount,
+        count(oi.productid) as totalitems,
+        o.status,
+        cast(0 as bit) as archived
+    from orders o
+    join customers c on o.customerid = c.customerid
+    join orderitems oi on o.orderid = oi.orderid
+    where o.isdeleted = 0
+    group by o.orderid, c.firstname, c.lastname, o.orderdate, o.totalamount, o.status
+    union all
+    select 
+        o.orderid,
+        c.firstname + ' ' + c.lastname as customername,
+        o.orderdate,
+        o.totalamount,
+        count(oi.productid) as totalitems,
+        o.status,
+        cast(1 as bit) as archived
+    from ordersarchive o
+    join customers c on o.customerid = c.customerid
+    join orderitemsarchive oi on o.orderid = oi.orderid
+    where @includearchive = 1 and o.isdeleted = 0
+    group by o.orderid, c.firstname, c.lastname, o.orderdate, o.totalamount, o.status;
+go
+
+-- pohled nad horkmi daty bez smazanch objednvek
+alter view vw_ordersummary as
+select orderid, customername, orderdate, totalamount, totalitems, status
+from fn_ordersummary(0);
+go
+
+-- souhrn vetn archivu
+create view vw_ordersummaryall as
+select orderid, customername, orderdate, totalamount, totalitems, status, archived
+from fn_ordersummary(1);
+go
@@ -0,0 +1,64 @@
+-- 0001: indexy pro všechny dotazy aplikace
+-- Každý index se vytváří jen pokud chybí, takže migrace projde i na databázi
+-- založené skriptem SQLQuery1.sql, který část z nich už obsahuje.
+
+-- delete_category: SELECT COUNT(*) FROM Products WHERE CategoryID = ?
+if not exists (select 1 from sys.indexes where name = 'ix_products_categoryid' and object_id = object_id('products'))
+    create index ix_products_categoryid on products (categoryid);
+go
+
+-- delete_product: SELECT COUNT(*) FROM OrderItems WHERE ProductID = ?
+-- a vrácení skladu při mazání produktu/objednávek
+if not exists (select 1 from sys.indexes where name = 'ix_orderitems_productid' and object_id = object_id('orderitems'))
+    create index ix_orderitems_productid on orderitems (productid)
+        include (quantity);
+go
+
+-- OrderItemDialog.load_products: WHERE Status = 'available' AND StockQuantity > 0
+if not exists (select 1 from sys.indexes where name = 'ix_products_status_stock' and object_id = object_id('products'))
+    create index ix_products_status_stock on products (status, stockquantity)
+        include (name, price);
+go
+
+-- přírůstková obnova produktů: WHERE LastUpdated > ?
+if not exists (select 1 from sys.indexes where name = 'ix_products_lastupdated' and object_id = object_id('products'))
+    create index ix_products_lastupdated on products (lastupdated)
+        include (categoryid, name, price, stockquantity, status);
+go
+
+-- OrdersTab: stránkování podle (OrderDate, OrderID) bez filtru
+if not exists (select 1 from sys.indexes where name = 'ix_orders_orderdate' and object_id = object_id('orders'))
+    create index ix_orders_orderdate on orders (orderdate desc, orderid desc)
+        include (customerid, totalamount, status, isdeleted);
+go
+
+-- OrdersTab: filtr podle stavu
+if not exists (select 1 from sys.indexes where name = 'ix_orders_status_orderdate' and object_id = object_id('orders'))
+    create index ix_orders_status_orderdate on orders (status, orderdate desc, orderid desc)
+        include (customerid, totalamount, isdeleted);
+go
+
+-- OrdersTab: filtr podle zákazníka
+if not exists (select 1 from sys.indexes where name = 'ix_orders_customer_orderdate' and object_id = object_id('orders'))
+    create index ix_orders_customer_orderdate on orders (customerid, orderdate desc, orderid desc)
+        include (totalamount, status, isdeleted);
+go
+
+-- OrdersTab: seznam zákazníků ve filtru, ORDER BY LastName, FirstName
+if not exists (select 1 from sys.indexes where name = 'ix_customers_name' and object_id = object_id('customers'))
+    create index ix_customers_name on customers (lastname, firstname);
+go
+
+-- přírůstková obnova produktů: WHERE DeletedAt > ?
+if object_id('producttombstones') is not null
+   and not exists (select 1 from sys.indexes where name = 'ix_producttombstones_deletedat' and object_id = object_id('producttombstones'))
+    -- exec: tabulka nemusí existovat v době kompilace dávky
+    exec('create index ix_producttombstones_deletedat on producttombstones (deletedat)');
+go
+
+-- OrdersTab s archivem: stránkování nad ordersarchive
+if object_id('ordersarchive') is not null
+   and not exists (select 1 from sys.indexes where name = 'ix_ordersarchive_orderdate' and object_id = object_id('ordersarchive'))
+    exec('create index ix_ordersarchive_orderdate on ordersarchive (orderdate desc, orderid desc)
+        include (customerid, totalamount, status, isdeleted)');
+go
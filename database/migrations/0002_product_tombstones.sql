@@ -0,0 +1,27 @@
+-- 0002: záznamy o smazaných produktech pro přírůstkovou obnovu ProductsTab
+-- Objekty ze skriptu SQLQuery1.sql; na databázi, kde už jsou, migrace nic nezmění.
+-- create or alter vyžaduje SQL Server 2016 SP1.
+
+if object_id('producttombstones') is null
+    create table producttombstones (
+        productid int primary key,
+        deletedat datetime not null default getdate()
+    );
+go
+
+-- 0001 index přeskočila, pokud tabulka ještě neexistovala
+if not exists (select 1 from sys.indexes where name = 'ix_producttombstones_deletedat' and object_id = object_id('producttombstones'))
+    create index ix_producttombstones_deletedat on producttombstones (deletedat);
+go
+
+create or alter trigger tr_products_delete on products
+after delete
+as
+begin
+    set nocount on;
+    insert into producttombstones (productid, deletedat)
+    select d.productid, getdate()
+    from deleted d
+    where not exists (select 1 from producttombstones t where t.productid = d.productid);
+end;
+go
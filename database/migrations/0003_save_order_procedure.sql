@@ -0,0 +1,52 @@
+-- 0003: uložení objednávky jedním voláním (order_store, save_mode = procedure)
+-- Typ se vytváří jen pokud chybí - typ používaný procedurou nejde změnit.
+
+if type_id('orderlinetype') is null
+    create type orderlinetype as table (
+        productid int not null,
+        quantity int not null,
+        unitprice float not null
+    );
+go
+
+create or alter procedure usp_saveorder
+    @orderid int,
+    @customerid int,
+    @status varchar(20),
+    @totalamount float,
+    @lines orderlinetype readonly
+as
+begin
+    set nocount on;
+
+    if @orderid is null
+    begin
+        declare @neworder table (orderid int);
+        insert into orders (customerid, status, totalamount)
+        output inserted.orderid into @neworder
+        values (@customerid, @status, @totalamount);
+        select @orderid = orderid from @neworder;
+    end
+    else
+    begin
+        update orders
+        set customerid = @customerid, status = @status, totalamount = @totalamount
+        where orderid = @orderid;
+
+        delete from orderitems where orderid = @orderid;
+    end
+
+    update p
+    set stockquantity = p.stockquantity - l.quantity, lastupdated = getdate()
+    from products p
+    join (select productid, sum(quantity) as quantity
+          from @lines
+          group by productid) l on l.productid = p.productid;
+
+    insert into orderitems (orderid, productid, quantity, unitprice)
+    select @orderid, productid, quantity, unitprice
+    from @lines;
+
+    select @orderid as orderid;
+end;
+go
@@ -0,0 +1,75 @@
+-- 0004: archiv objednávek (archive.py) a souhrnné pohledy nad horkými i archivními daty
+
+if object_id('ordersarchive') is null
+    create table ordersarchive (
+        orderid int primary key,
+        customerid int foreign key references customers(customerid),
+        orderdate datetime,
+        totalamount float not null,
+        status varchar(20),
+        isdeleted bit default 0,
+        archivedat datetime not null default getdate()
+    );
+go
+
+if object_id('orderitemsarchive') is null
+    create table orderitemsarchive (
+        orderid int foreign key references ordersarchive(orderid),
+        productid int foreign key references products(productid),
+        quantity int not null,
+        unitprice float not null,
+        primary key (orderid, productid)
+    );
+go
+
+-- 0001 index přeskočila, pokud tabulka ještě neexistovala
+if not exists (select 1 from sys.indexes where name = 'ix_ordersarchive_orderdate' and object_id = object_id('ordersarchive'))
+    create index ix_ordersarchive_orderdate on ordersarchive (orderdate desc, orderid desc)
+        include (customerid, totalamount, status, isdeleted);
+go
+
+-- souhrn objednávek; s @includearchive = 1 i z archivu
+create or alter function fn_ordersummary (@includearchive bit)
+returns table
+as
+return
+    select 
+        o.orderid,
+        c.firstname + ' ' + c.lastname as customername,
+        o.orderdate,
+        o.totalamount,
+        count(oi.productid) as totalitems,
+        o.status,
+        cast(0 as bit) as archived
+    from orders o
+    join customers c on o.customerid = c.customerid
+    join orderitems oi on o.orderid = oi.orderid
+    where o.isdeleted = 0
+    group by o.orderid, c.firstname, c.lastname, o.orderdate, o.totalamount, o.status
+    union all
+    select 
+        o.orderid,
+        c.firstname + ' ' + c.lastname as customername,
+        o.orderdate,
+        o.totalamount,
+        count(oi.productid) as totalitems,
+        o.status,
+        cast(1 as bit) as archived
+    from ordersarchive o
+    join customers c on o.customerid = c.customerid
+    join orderitemsarchive oi on o.orderid = oi.orderid
+    where @includearchive = 1 and o.isdeleted = 0
+    group by o.orderid, c.firstname, c.lastname, o.orderdate, o.totalamount, o.status;
+go
+
+-- pohled nad horkými daty bez smazaných objednávek
+create or alter view vw_ordersummary as
+select orderid, customername, orderdate, totalamount, totalitems, status
+from fn_ordersummary(0);
+go
+
+-- souhrn včetně archivu
+create or alter view vw_ordersummaryall as
+select orderid, customername, orderdate, totalamount, totalitems, status, archived
+from fn_ordersummary(1);
+go
@@ -0,0 +1,5 @@
+-- 0005: delete_product kontroluje i archivované položky objednávek
+-- EXISTS (SELECT 1 FROM OrderItemsArchive WHERE ProductID = ?)
+if not exists (select 1 from sys.indexes where name = 'ix_orderitemsarchive_productid' and object_id = object_id('orderitemsarchive'))
+    create index ix_orderitemsarchive_productid on orderitemsarchive (productid);
+go
@@ -0,0 +1,198 @@
+# anomaly_runner.py
+import threading
+import time
+from collections import namedtuple
+
+import pyodbc
+
+from database import sql_error_numbers
+
+# One step of the timeline. ``at`` is seconds since the run started,
+# ``session`` is 'A' (reader under test) or 'B' (interleaved writer).
+TimelineEvent = namedtuple('TimelineEvent', ['at', 'session', 'kind', 'value', 'detail'])
+
+LOCK_TIMEOUT_ERROR = 1222
+
+_READ_SQL = "SELECT Name, StockQuantity FROM Products WHERE ProductID = ?"
+_WRITE_SQL = """
+    UPDATE Products
+    SET StockQuantity = StockQuantity + ?, LastUpdated = GETDATE()
+    WHERE ProductID = ?
+"""
+_WAIT_SQL = """
+    SELECT wait_type, wait_time, blocking_session_id
+    FROM sys.dm_exec_requests
+    WHERE session_id = ?
+"""
+
+
+class AnomalyRun:
+    """Timeline of one scripted run; events may be added from both sessions"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.events = []
+
+    def log(self, session, kind, value=None, detail=None):
+        event = TimelineEvent(time.perf_counter() - self.started, session, kind, value, detail)
+        with self._lock:
+            self.events.append(event)
+        return event
+
+
+def _session_id(connection):
+    return connection.execute("SELECT @@SPID").fetchone()[0]
+
+
+def _writer_wait(connection, writer_spid):
+    """(wait_type, wait ms, blocking session) of the writer's request, None if not visible"""
+    try:
+        row = connection.execute(_WAIT_SQL, (writer_spid,)).fetchone()
+    except pyodbc.Error:
+        return None
+    return tuple(row) if row else None
+
+
+def run_non_repeatable_read(db, product_id, level, delta=1, pause=0.5, lock_timeout=5.0):
+    """Script the non-repeatable read scenario with two pooled sessions.
+
+    Session A reads the product at ``level``; session B, at the default
+    level, adds ``delta`` to its stock on a separate thread; after
+    ``pause`` seconds A reads again and commits, then B commits. B's
+    change is reverted by a final compensating update, so the stock ends
+    where it started. B gives up after ``lock_timeout`` seconds of lock
+    waiting. Nothing waits on a human while a transaction is open.
+
+    Returns a dict with ``level``, ``first``/``second`` (name, quantity),
+    ``anomaly``, ``writer_blocked``, ``writer_wait`` (seconds the write
+    statement took, i.e. mostly lock wait), ``writer_timed_out`` and
+    ``events`` (a list of TimelineEvent).
+    """
+    run = AnomalyRun()
+    reader = db.pool.checkout()
+    writer = None
+    write_thread = None
+    try:
+        db.set_isolation_level(reader, level)
+        writer = db.pool.checkout()
+        writer_spid = _session_id(writer)
+        writer.execute(f"SET LOCK_TIMEOUT {int(lock_timeout * 1000)}")
+        reader_cursor = reader.cursor()
+
+        # A: first read opens the transaction (autocommit is off)
+        reader_cursor.execute(_READ_SQL, (product_id,))
+        first = tuple(reader_cursor.fetchone())
+        run.log('A', 'read', first[1], level)
+
+        outcome = {}
+
+        def write():
+            cursor = writer.cursor()
+            started = time.perf_counter()
+            run.log('B', 'write_start', delta)
+            try:
+                cursor.execute(_WRITE_SQL, (delta, product_id))
+                outcome['wait'] = time.perf_counter() - started
+                run.log('B', 'write_done', delta, outcome['wait'])
+            except pyodbc.Error as e:
+                outcome['wait'] = time.perf_counter() - started
+                outcome['error'] = e
+                kind = ('write_timeout' if LOCK_TIMEOUT_ERROR in sql_error_numbers(e)
+                        else 'write_error')
+                run.log('B', kind, None, str(e))
+            finally:
+                cursor.close()
+
+        write_thread = threading.Thread(target=write, name="anomaly-writer", daemon=True)
+        write_thread.start()
+
+        # Give the write time to finish or to block on A's locks
+        write_thread.join(pause)
+        writer_blocked = write_thread.is_alive()
+        if writer_blocked:
+            wait = _writer_wait(reader, writer_spid)
+            # value: ms waited so far, detail: (wait type, blocking session)
+            run.log('B', 'blocked', wait[1] if wait else None,
+                    (wait[0], wait[2]) if wait else None)
+
+        # A: second read in the same transaction, then end it
+        reader_cursor.execute(_READ_SQL, (product_id,))
+        second = tuple(reader_cursor.fetchone())
+        run.log('A', 'read', second[1], level)
+        reader.commit()
+        run.log('A', 'commit')
+        reader_cursor.close()
+
+        # A's locks are gone, B can finish
+        write_thread.join(lock_timeout + 1)
+        if 'error' in outcome:
+            writer.rollback()
+            run.log('B', 'rollback')
+        else:
+            writer.commit()
+            run.log('B', 'commit')
+            # Compensate, the demo must not change real stock
+            writer.execute(_WRITE_SQL, (-delta, product_id))
+            writer.commit()
+            run.log('B', 'restore', -delta)
+    finally:
+        # Roll A back first: after a failure it may still hold the locks B waits on
+        db.checkin(reader)
+        if write_thread is not None:
+            write_thread.join(lock_timeout + 1)
+        if writer is not None:
+            try:
+                writer.execute("SET LOCK_TIMEOUT -1")
+            except pyodbc.Error:
+                pass
+            db.checkin(writer)
+
+    return {
+        'level': level,
+        'first': first,
+        'second': second,
+        'anomaly': first[1] != second[1],
+        'writer_blocked': writer_blocked,
+        'writer_wait': outcome.get('wait'),
+        'writer_timed_out': ('error' in outcome
+                             and LOCK_TIMEOUT_ERROR in sql_error_numbers(outcome['error'])),
+        'events': list(run.events)
+    }
+
+
+def format_event(event):
+    """One timeline line for console output"""
+    value = '' if event.value is None else f" {event.value}"
+    detail = '' if event.detail is None else f" ({event.detail})"
+    return f"{event.at * 1000:8.1f} ms  {event.session}  {event.kind}{value}{detail}"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from database import ISOLATION_LEVELS, Database
+
+    parser = argparse.ArgumentParser(description="Run the non-repeatable read scenario")
+    parser.add_argument('product_id', type=int)
+    parser.add_argument('--levels', default=','.join(ISOLATION_LEVELS))
+    parser.add_argument('--pause', type=float, default=0.5)
+    args = parser.parse_args()
+
+    db = Database()
+    if not db.connect():
+        raise SystemExit("Failed to connect to database")
+    try:
+        for level in args.levels.split(','):
+            try:
+                result = run_non_repeatable_read(db, args.product_id, level.strip(),
+                                                 pause=args.pause)
+            except pyodbc.Error as e:
+                print(f"{level}: failed: {e}")
+                continue
+            print(f"{level}: first {result['first'][1]}, second {result['second'][1]}, "
+                  f"anomaly {result['anomaly']}, writer blocked {result['writer_blocked']}")
+            for event in result['events']:
+                print("   ", format_event(event))
+    finally:
+        db.disconnect()
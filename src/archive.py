@@ -0,0 +1,130 @@
+# archive.py
+import time
+from datetime import datetime, timedelta
+
+# Orders in these states never change again
+TERMINAL_STATUSES = ('delivered', 'cancelled')
+
+_ARCHIVE_BATCH_SQL = """
+SET NOCOUNT ON;
+DECLARE @batch TABLE (OrderID int PRIMARY KEY);
+
+INSERT INTO @batch (OrderID)
+SELECT TOP ({batch_size}) OrderID
+FROM Orders
+WHERE {condition}
+ORDER BY OrderID;
+
+INSERT INTO OrdersArchive (OrderID, CustomerID, OrderDate, TotalAmount, Status, IsDeleted)
+SELECT o.OrderID, o.CustomerID, o.OrderDate, o.TotalAmount, o.Status, ISNULL(o.IsDeleted, 0)
+FROM Orders o
+JOIN @batch b ON b.OrderID = o.OrderID;
+
+INSERT INTO OrderItemsArchive (OrderID, ProductID, Quantity, UnitPrice)
+SELECT oi.OrderID, oi.ProductID, oi.Quantity, oi.UnitPrice
+FROM OrderItems oi
+JOIN @batch b ON b.OrderID = oi.OrderID;
+
+DELETE oi
+FROM OrderItems oi
+JOIN @batch b ON b.OrderID = oi.OrderID;
+
+DELETE o
+FROM Orders o
+JOIN @batch b ON b.OrderID = o.OrderID;
+
+SELECT COUNT(*) FROM @batch;
+"""
+
+
+class ArchiveError(Exception):
+    """Raised when archiving fails; earlier batches stay committed"""
+
+    def __init__(self, message, orders_archived):
+        super().__init__(message)
+        self.orders_archived = orders_archived
+
+
+def archive_condition(max_age_days, statuses):
+    """WHERE clause and parameters selecting orders that belong in the archive.
+
+    An order qualifies when it is older than ``max_age_days`` (0 disables
+    the age rule), is in one of ``statuses``, or was soft-deleted.
+    """
+    conditions = ["IsDeleted = 1"]
+    params = []
+    if max_age_days > 0:
+        conditions.append("OrderDate < ?")
+        params.append(datetime.now() - timedelta(days=max_age_days))
+    if statuses:
+        conditions.append(f"Status IN ({', '.join(['?'] * len(statuses))})")
+        params.extend(statuses)
+    return " OR ".join(conditions), params
+
+
+def count_archivable(connection, max_age_days, statuses=TERMINAL_STATUSES):
+    """Number of hot orders that would be moved by ``archive_orders``"""
+    condition, params = archive_condition(max_age_days, statuses)
+    cursor = connection.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM Orders WHERE {condition}", params)
+    count = cursor.fetchone()[0]
+    cursor.close()
+    return count
+
+
+def archive_orders(connection, max_age_days, statuses=TERMINAL_STATUSES,
+                   batch_size=1000, progress=None, retry=None):
+    """Move finished and old orders from the hot tables to the archive.
+
+    Each batch of at most ``batch_size`` orders is copied to OrdersArchive
+    and OrderItemsArchive and removed from Orders and OrderItems in one
+    server round trip, then committed, so an order is always in exactly one
+    place and locks are held only for one batch. Stock is not touched.
+    ``progress(orders_done, elapsed)`` is called after every commit.
+    ``retry(fn)``, when given, runs each batch and may call it again after a
+    transient error such as a deadlock; a failed batch is rolled back first.
+
+    Returns a dict with ``orders``, ``batches``, ``seconds`` and
+    ``orders_per_second``.
+    """
+    condition, params = archive_condition(max_age_days, statuses)
+    sql = _ARCHIVE_BATCH_SQL.format(batch_size=int(batch_size), condition=condition)
+    cursor = connection.cursor()
+
+    def run_batch():
+        try:
+            cursor.execute(sql, params)
+            while cursor.description is None and cursor.nextset():
+                pass
+            moved = cursor.fetchone()[0]
+            connection.commit()
+            return moved
+        except Exception:
+            connection.rollback()
+            raise
+
+    started = time.monotonic()
+    archived = 0
+    batches = 0
+    while True:
+        try:
+            moved = retry(run_batch) if retry else run_batch()
+        except Exception as e:
+            raise ArchiveError(
+                f"Batch {batches + 1} failed after {archived} archived orders: {e}",
+                archived) from e
+        if not moved:
+            break
+        archived += moved
+        batches += 1
+        if progress:
+            progress(archived, time.monotonic() - started)
+    cursor.close()
+
+    seconds = time.monotonic() - started
+    return {
+        'orders': archived,
+        'batches': batches,
+        'seconds': seconds,
+        'orders_per_second': archived / seconds if seconds > 0 else 0.0
+    }
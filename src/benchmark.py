@@ -0,0 +1,377 @@
+# benchmark.py
+"""Headless isolation level benchmark.
+
+Runs a mix of reader and writer threads against Products.StockQuantity at
+every isolation level offered in the UI and reports throughput, latency,
+lock waits and the anomalies each level let through:
+
+- a reader reads the same row twice in one transaction; a different value
+  the second time is a non-repeatable read
+- a writer reads a row and writes back read + 1; increments it committed
+  that are missing from the final value are lost updates
+
+Run it against a local stand-in database, never production:
+
+    python benchmark.py --server localhost --database eshop_bench --mix 4:1,1:4
+
+The benchmark works on its own rows (a "Benchmark" category and products
+named "BENCH n") and deletes them when it finishes.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+
+import pyodbc
+
+from config import Config
+from database import ISOLATION_LEVELS, sql_error_numbers
+
+BENCH_CATEGORY = "Benchmark"
+BENCH_PREFIX = "BENCH "
+INITIAL_STOCK = 1000000
+
+
+def connection_string(config, server=None, database=None):
+    """Connection string from config.conf with server/database overridden"""
+    db_config = dict(config.get_db_config())
+    if server:
+        db_config['server'] = server
+    if database:
+        db_config['database'] = database
+    return (
+        f"DRIVER={{{db_config['driver']}}};"
+        f"SERVER={db_config['server']};"
+        f"DATABASE={db_config['database']};"
+        f"UID={db_config['username']};"
+        f"PWD={db_config['password']}"
+    )
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an unsorted list, None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def setup_rows(connection, products):
+    """Create the benchmark category and ``products`` rows; return their IDs"""
+    cursor = connection.cursor()
+    teardown_rows(connection)
+    cursor.execute("""
+        INSERT INTO Categories (Name, Description, IsActive)
+        OUTPUT inserted.CategoryID
+        VALUES (?, 'Isolation benchmark rows', 1)
+    """, (BENCH_CATEGORY,))
+    category_id = cursor.fetchone()[0]
+    product_ids = []
+    for number in range(products):
+        cursor.execute("""
+            INSERT INTO Products (Name, CategoryID, Price, StockQuantity, Status)
+            OUTPUT inserted.ProductID
+            VALUES (?, ?, 1, ?, 'available')
+        """, (f"{BENCH_PREFIX}{number + 1}", category_id, INITIAL_STOCK))
+        product_ids.append(cursor.fetchone()[0])
+    connection.commit()
+    cursor.close()
+    return product_ids
+
+
+def teardown_rows(connection):
+    """Delete rows left by this or an earlier, interrupted run"""
+    cursor = connection.cursor()
+    cursor.execute("""
+        DELETE p FROM Products p
+        JOIN Categories c ON c.CategoryID = p.CategoryID
+        WHERE c.Name = ? AND p.Name LIKE ?
+    """, (BENCH_CATEGORY, BENCH_PREFIX + '%'))
+    cursor.execute("""
+        DELETE FROM Categories
+        WHERE Name = ? AND NOT EXISTS (
+            SELECT 1 FROM Products p WHERE p.CategoryID = Categories.CategoryID)
+    """, (BENCH_CATEGORY,))
+    connection.commit()
+    cursor.close()
+
+
+def reset_stock(connection, product_ids):
+    cursor = connection.cursor()
+    cursor.execute(
+        f"UPDATE Products SET StockQuantity = ? "
+        f"WHERE ProductID IN ({', '.join(['?'] * len(product_ids))})",
+        [INITIAL_STOCK] + list(product_ids))
+    connection.commit()
+    cursor.close()
+
+
+def read_stock(connection, product_ids):
+    cursor = connection.cursor()
+    cursor.execute(
+        f"SELECT ProductID, StockQuantity FROM Products "
+        f"WHERE ProductID IN ({', '.join(['?'] * len(product_ids))})",
+        list(product_ids))
+    stock = {product_id: quantity for product_id, quantity in cursor.fetchall()}
+    connection.commit()
+    cursor.close()
+    return stock
+
+
+def snapshot_allowed(connection):
+    cursor = connection.cursor()
+    cursor.execute("SELECT snapshot_isolation_state FROM sys.databases WHERE name = DB_NAME()")
+    state = cursor.fetchone()[0]
+    connection.commit()
+    cursor.close()
+    return state == 1
+
+
+def lock_wait_ms(cursor):
+    """Milliseconds this session spent waiting for locks (LCK_M_*), None if not visible"""
+    try:
+        cursor.execute("""
+            SELECT ISNULL(SUM(wait_time_ms), 0)
+            FROM sys.dm_exec_session_wait_stats
+            WHERE session_id = @@SPID AND wait_type LIKE 'LCK_M_%'
+        """)
+        return cursor.fetchone()[0]
+    except pyodbc.Error:
+        return None
+
+
+class Worker(threading.Thread):
+    """One benchmark session running transactions until ``stop`` is set"""
+
+    def __init__(self, role, conn_str, level, product_ids, stop, options):
+        super().__init__(name=f"{role}-{level}", daemon=True)
+        self.role = role
+        self.conn_str = conn_str
+        self.level = level
+        self.product_ids = product_ids
+        self.stop = stop
+        self.options = options
+        self.latencies = []
+        self.committed = 0
+        self.aborted = 0
+        self.errors = {}
+        self.non_repeatable_reads = 0
+        self.lock_wait_ms = None
+        self.failure = None
+
+    def run(self):
+        try:
+            connection = pyodbc.connect(self.conn_str, timeout=self.options['timeout'])
+        except pyodbc.Error as e:
+            self.failure = str(e)
+            return
+        cursor = connection.cursor()
+        try:
+            cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {self.level}")
+            cursor.execute(f"SET LOCK_TIMEOUT {int(self.options['lock_timeout'] * 1000)}")
+            transaction = self.read_twice if self.role == 'reader' else self.read_modify_write
+            while not self.stop.is_set():
+                product_id = random.choice(self.product_ids)
+                started = time.perf_counter()
+                try:
+                    transaction(cursor, product_id)
+                    connection.commit()
+                except pyodbc.Error as e:
+                    try:
+                        connection.rollback()
+                    except pyodbc.Error:
+                        pass
+                    self.aborted += 1
+                    for number in sql_error_numbers(e) or {0}:
+                        self.errors[number] = self.errors.get(number, 0) + 1
+                    continue
+                self.latencies.append(time.perf_counter() - started)
+                self.committed += 1
+            self.lock_wait_ms = lock_wait_ms(cursor)
+        finally:
+            cursor.close()
+            connection.close()
+
+    def read_twice(self, cursor, product_id):
+        cursor.execute("SELECT StockQuantity FROM Products WHERE ProductID = ?", (product_id,))
+        first = cursor.fetchone()[0]
+        time.sleep(self.options['read_gap'])
+        cursor.execute("SELECT StockQuantity FROM Products WHERE ProductID = ?", (product_id,))
+        second = cursor.fetchone()[0]
+        if first != second:
+            self.non_repeatable_reads += 1
+
+    def read_modify_write(self, cursor, product_id):
+        cursor.execute("SELECT StockQuantity FROM Products WHERE ProductID = ?", (product_id,))
+        quantity = cursor.fetchone()[0]
+        time.sleep(self.options['write_gap'])
+        cursor.execute("""
+            UPDATE Products SET StockQuantity = ?, LastUpdated = GETDATE()
+            WHERE ProductID = ?
+        """, (quantity + 1, product_id))
+
+
+def run_case(conn_str, control, product_ids, level, readers, writers, options):
+    """Run one level/mix combination and return its result dict"""
+    reset_stock(control, product_ids)
+    stop = threading.Event()
+    workers = ([Worker('reader', conn_str, level, product_ids, stop, options)
+                for _ in range(readers)] +
+               [Worker('writer', conn_str, level, product_ids, stop, options)
+                for _ in range(writers)])
+    for worker in workers:
+        worker.start()
+    time.sleep(options['duration'])
+    stop.set()
+    for worker in workers:
+        worker.join()
+
+    failures = [worker.failure for worker in workers if worker.failure]
+    if failures:
+        raise RuntimeError(f"Worker could not connect: {failures[0]}")
+
+    final = read_stock(control, product_ids)
+    committed_increments = sum(w.committed for w in workers if w.role == 'writer')
+    applied_increments = sum(final[product_id] - INITIAL_STOCK for product_id in product_ids)
+
+    latencies = [latency for worker in workers for latency in worker.latencies]
+    committed = sum(worker.committed for worker in workers)
+    errors = {}
+    for worker in workers:
+        for number, count in worker.errors.items():
+            errors[number] = errors.get(number, 0) + count
+    waits = [worker.lock_wait_ms for worker in workers if worker.lock_wait_ms is not None]
+
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        'level': level,
+        'readers': readers,
+        'writers': writers,
+        'seconds': options['duration'],
+        'transactions': committed,
+        'throughput': round(committed / options['duration'], 1),
+        'reads_per_second': round(
+            sum(w.committed for w in workers if w.role == 'reader') / options['duration'], 1),
+        'writes_per_second': round(committed_increments / options['duration'], 1),
+        'p50_ms': ms(percentile(latencies, 0.50)),
+        'p99_ms': ms(percentile(latencies, 0.99)),
+        'lock_wait_ms': sum(waits) if waits else None,
+        'aborted': sum(worker.aborted for worker in workers),
+        'errors': errors,
+        'non_repeatable_reads': sum(worker.non_repeatable_reads for worker in workers),
+        'lost_updates': committed_increments - applied_increments
+    }
+
+
+def format_table(results):
+    """Render results as a fixed-width text table"""
+    columns = [
+        ('Level', 'level', 16),
+        ('R:W', None, 5),
+        ('Tx/s', 'throughput', 8),
+        ('p50 ms', 'p50_ms', 8),
+        ('p99 ms', 'p99_ms', 8),
+        ('Lock ms', 'lock_wait_ms', 9),
+        ('Aborted', 'aborted', 8),
+        ('NonRep', 'non_repeatable_reads', 7),
+        ('Lost', 'lost_updates', 6)
+    ]
+    lines = [' '.join(title.ljust(width) for title, _, width in columns)]
+    lines.append(' '.join('-' * width for _, _, width in columns))
+    for result in results:
+        cells = []
+        for _, key, width in columns:
+            if key is None:
+                value = f"{result['readers']}:{result['writers']}"
+            elif result.get('skipped'):
+                value = result['level'] if key == 'level' else ('skipped' if key == 'throughput' else '')
+            else:
+                value = result[key]
+            cells.append(('-' if value is None else str(value)).ljust(width))
+        lines.append(' '.join(cells))
+    return '\n'.join(lines)
+
+
+def parse_mix(text):
+    """"4:1,1:4" -> [(4, 1), (1, 4)]"""
+    mixes = []
+    for part in text.split(','):
+        readers, writers = part.split(':')
+        mixes.append((int(readers), int(writers)))
+    return mixes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark isolation levels on Products.StockQuantity")
+    parser.add_argument('--server', help="stand-in server (overrides config.conf)")
+    parser.add_argument('--database', help="stand-in database (overrides config.conf)")
+    parser.add_argument('--force', action='store_true',
+                        help="allow running against the database from config.conf")
+    parser.add_argument('--levels', default=','.join(ISOLATION_LEVELS),
+                        help="comma separated isolation levels")
+    parser.add_argument('--mix', default='4:1,1:1,1:4',
+                        help="comma separated readers:writers thread mixes")
+    parser.add_argument('--duration', type=float, default=10, help="seconds per case")
+    parser.add_argument('--products', type=int, default=5, help="number of hot rows")
+    parser.add_argument('--read-gap', type=float, default=0.005,
+                        help="seconds between the two reads of a reader")
+    parser.add_argument('--write-gap', type=float, default=0.005,
+                        help="seconds between read and write of a writer")
+    parser.add_argument('--lock-timeout', type=float, default=5,
+                        help="SET LOCK_TIMEOUT of every session in seconds")
+    parser.add_argument('--json', dest='json_path', help="also write results to this JSON file")
+    args = parser.parse_args()
+
+    config = Config()
+    if not (args.server or args.database) and not args.force:
+        parser.error("point --server/--database at a stand-in database "
+                     "(or pass --force to use config.conf)")
+
+    levels = [' '.join(level.upper().split()) for level in args.levels.split(',')]
+    for level in levels:
+        if level not in ISOLATION_LEVELS:
+            parser.error(f"unknown isolation level: {level}")
+    mixes = parse_mix(args.mix)
+    options = {
+        'duration': args.duration,
+        'read_gap': args.read_gap,
+        'write_gap': args.write_gap,
+        'lock_timeout': args.lock_timeout,
+        'timeout': config.get_connection_settings()['timeout']
+    }
+
+    conn_str = connection_string(config, args.server, args.database)
+    control = pyodbc.connect(conn_str, timeout=options['timeout'])
+    results = []
+    try:
+        product_ids = setup_rows(control, args.products)
+        snapshot = snapshot_allowed(control)
+        for level in levels:
+            for readers, writers in mixes:
+                if level == 'SNAPSHOT' and not snapshot:
+                    results.append({'level': level, 'readers': readers, 'writers': writers,
+                                    'skipped': "ALLOW_SNAPSHOT_ISOLATION is OFF"})
+                    continue
+                print(f"Running {level} with {readers} readers, {writers} writers...")
+                results.append(run_case(conn_str, control, product_ids, level,
+                                        readers, writers, options))
+    finally:
+        teardown_rows(control)
+        control.close()
+
+    print()
+    print(format_table(results))
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as file:
+            json.dump({'options': options, 'products': args.products, 'results': results},
+                      file, indent=2)
+        print(f"\nResults written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,309 @@
 # config.py
 import configparser
 import os
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.conf')
+
+# Parsed, read-only view of config.conf
+ConfigSnapshot = namedtuple('ConfigSnapshot', [
+    'mtime',
+    'db_config',
+    'connection_string',
+    'isolation_level',
+    'connection_settings',
+    'pool_settings',
+    'transfer_settings',
+    'cache_settings',
+    'order_settings',
+    'archive_settings',
+    'isolation_profiles',
+    'retry_settings',
+    'monitor_settings',
+    'tracing_settings',
+    'watchdog_settings'
+])
+
+# Used for profiles missing from the [ISOLATION_PROFILES] section
+DEFAULT_ISOLATION_PROFILES = {
+    'list_read': 'READ COMMITTED',
+    'report': 'READ COMMITTED',
+    'order_write': 'REPEATABLE READ',
+    'inventory_adjust': 'SERIALIZABLE',
+    'catalog_write': 'READ COMMITTED',
+    'bulk_import': 'READ COMMITTED'
+}
+
+
+def parse_config(path):
+    """Read config.conf and build an immutable snapshot"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Configuration file not found at {path}")
+
+    mtime = os.stat(path).st_mtime
+    config = configparser.ConfigParser()
+    config.read(path)
+
+    try:
+        db_config = {
+            'server': config.get('DATABASE', 'server'),
+            'database': config.get('DATABASE', 'database'),
+            'username': config.get('DATABASE', 'username'),
+            'password': config.get('DATABASE', 'password'),
+            'driver': config.get('DATABASE', 'driver')
+        }
+    except configparser.Error as e:
+        raise Exception(f"Error reading database configuration: {str(e)}")
+
+    connection_string = (
+        f"DRIVER={db_config['driver']};"
+        f"SERVER={db_config['server']};"
+        f"DATABASE={db_config['database']};"
+        f"UID={db_config['username']};"
+        f"PWD={db_config['password']}"
+    )
+
+    return ConfigSnapshot(
+        mtime=mtime,
+        db_config=MappingProxyType(db_config),
+        connection_string=connection_string,
+        isolation_level=config.get('TRANSACTION', 'default_isolation_level'),
+        connection_settings=MappingProxyType({
+            'retries': config.getint('SETTINGS', 'connection_retries'),
+            'timeout': config.getint('SETTINGS', 'connection_timeout'),
+            'retry_delay': config.getfloat('SETTINGS', 'connection_retry_delay', fallback=1.0),
+            'retry_max_delay': config.getfloat('SETTINGS', 'connection_retry_max_delay',
+                                               fallback=15.0),
+            'keepalive_interval': config.getfloat('SETTINGS', 'keepalive_interval',
+                                                  fallback=60.0)
+        }),
+        pool_settings=MappingProxyType({
+            'min_size': config.getint('POOL', 'min_size', fallback=1),
+            'max_size': config.getint('POOL', 'max_size', fallback=5),
+            'idle_timeout': config.getfloat('POOL', 'idle_timeout', fallback=300),
+            'checkout_timeout': config.getfloat('POOL', 'checkout_timeout', fallback=30),
+            'validation_interval': config.getfloat('POOL', 'validation_interval', fallback=0)
+        }),
+        transfer_settings=MappingProxyType({
+            'batch_size': config.getint('TRANSFER', 'batch_size', fallback=5000),
+            'fetch_size': config.getint('TRANSFER', 'fetch_size', fallback=5000)
+        }),
+        cache_settings=MappingProxyType({
+            'max_entries': config.getint('CACHE', 'max_entries', fallback=256),
+            'max_rows': config.getint('CACHE', 'max_rows', fallback=50000),
+            'default_ttl': config.getfloat('CACHE', 'default_ttl', fallback=60)
+        }),
+        order_settings=MappingProxyType({
+            'save_mode': config.get('ORDERS', 'save_mode', fallback='batch').strip().lower(),
+            'delete_chunk_size': config.getint('ORDERS', 'delete_chunk_size', fallback=1000),
+            'soft_delete': config.getboolean('ORDERS', 'soft_delete', fallback=False)
+        }),
+        archive_settings=MappingProxyType({
+            'max_age_days': config.getint('ARCHIVE', 'max_age_days', fallback=365),
+            'statuses': tuple(
+                status.strip() for status in
+                config.get('ARCHIVE', 'statuses', fallback='delivered, cancelled').split(',')
+                if status.strip()),
+            'batch_size': config.getint('ARCHIVE', 'batch_size', fallback=1000)
+        }),
+        isolation_profiles=MappingProxyType(dict(
+            DEFAULT_ISOLATION_PROFILES,
+            **{name: ' '.join(level.upper().split())
+               for name, level in (config.items('ISOLATION_PROFILES')
+                                   if config.has_section('ISOLATION_PROFILES') else [])}
+        )),
+        retry_settings=MappingProxyType({
+            'max_attempts': config.getint('RETRY', 'max_attempts', fallback=4),
+            'base_delay': config.getfloat('RETRY', 'base_delay', fallback=0.1),
+            'max_delay': config.getfloat('RETRY', 'max_delay', fallback=2.0),
+            'error_numbers': frozenset(
+                int(number) for number in
+                config.get('RETRY', 'error_numbers', fallback='1205, 1222, 3960').split(',')
+                if number.strip())
+        }),
+        monitor_settings=MappingProxyType({
+            'poll_interval': config.getfloat('MONITOR', 'poll_interval', fallback=2.0),
+            'tables': tuple(
+                table.strip() for table in
+                config.get('MONITOR', 'tables', fallback='Products, Orders, OrderItems').split(',')
+                if table.strip()),
+            'capture_deadlocks': config.getboolean('MONITOR', 'capture_deadlocks', fallback=False),
+            'deadlock_limit': config.getint('MONITOR', 'deadlock_limit', fallback=20)
+        }),
+        tracing_settings=MappingProxyType({
+            'enabled': config.getboolean('TRACING', 'enabled', fallback=True),
+            'buffer_size': config.getint('TRACING', 'buffer_size', fallback=5000),
+            'slow_threshold_ms': config.getfloat('TRACING', 'slow_threshold_ms', fallback=500),
+            'slow_log': config.get('TRACING', 'slow_log', fallback='slow_queries.log'),
+            'slow_log_max_bytes': config.getint('TRACING', 'slow_log_max_bytes',
+                                                fallback=1048576),
+            'slow_log_backups': config.getint('TRACING', 'slow_log_backups', fallback=3)
+        }),
+        watchdog_settings=MappingProxyType({
+            'enabled': config.getboolean('WATCHDOG', 'enabled', fallback=True),
+            'heartbeat_ms': config.getint('WATCHDOG', 'heartbeat_ms', fallback=50),
+            'threshold_ms': config.getint('WATCHDOG', 'threshold_ms', fallback=250),
+            'report': config.get('WATCHDOG', 'report', fallback='stall_report.json')
+        })
+    )
+
+
+class ConfigStore:
+    """Process-wide holder of the current configuration snapshot.
+
+    The file is parsed once; afterwards its mtime is checked at most every
+    ``check_interval`` seconds and the snapshot is replaced only when the
+    file actually changed. Subscribers are called with ``(old, new)``.
+    """
+
+    def __init__(self, path, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._snapshot = None
+        self._last_check = 0.0
+        self._subscribers = []
+
+    def get(self):
+        """Return the current snapshot, reloading if the file changed"""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = parse_config(self.path)
+                self._last_check = time.monotonic()
+                return self._snapshot
+            due = time.monotonic() - self._last_check >= self.check_interval
+        # Subscribers run outside the lock
+        if due:
+            self.check_for_changes()
+        return self._snapshot
+
+    def check_for_changes(self):
+        """Reload the snapshot if the file's mtime changed; return True on reload"""
+        with self._lock:
+            self._last_check = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                return False
+            if self._snapshot is not None and mtime == self._snapshot.mtime:
+                return False
+        return self.reload()
+
+    def reload(self):
+        """Parse the file again and notify subscribers"""
+        with self._lock:
+            old = self._snapshot
+            try:
+                new = parse_config(self.path)
+            except Exception as e:
+                # Keep running with the last valid configuration
+                print(f"Configuration reload failed, keeping previous values: {str(e)}")
+                return False
+            self._snapshot = new
+            subscribers = list(self._subscribers)
+
+        if old is not None:
+            for callback in subscribers:
+                try:
+                    callback(old, new)
+                except Exception as e:
+                    print(f"Configuration subscriber failed: {str(e)}")
+        return True
+
+    def subscribe(self, callback):
+        """Call ``callback(old, new)`` after every reload"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop notifying ``callback``"""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+
+_store = ConfigStore(CONFIG_PATH)
+
+
+def get_config_store():
+    """Return the process-wide configuration store"""
+    return _store
+
 
 class Config:
+    """Accessors over the shared configuration snapshot"""
+
     def __init__(self):
-        self.config = configparser.ConfigParser()
-        self.config_path = os.path.join(os.path.dirname(__file__), 'config.conf')
-        self.load_config()
+        self.store = _store
+        self.config_path = self.store.path
+        self.store.get()
 
     def load_config(self):
         """Load configuration from file"""
-        if not os.path.exists(self.config_path):
-            raise FileNotFoundError(f"Configuration file not found at {self.config_path}")
-        
-        self.config.read(self.config_path)
+        self.store.reload()
+
+    def get_snapshot(self):
+        """Get the current immutable configuration snapshot"""
+        return self.store.get()
 
     def get_db_config(self):
         """Get database configuration"""
-        try:
-            return {
-                'server': self.config.get('DATABASE', 'server'),
-                'database': self.config.get('DATABASE', 'database'),
-                'username': self.config.get('DATABASE', 'username'),
-                'password': self.config.get('DATABASE', 'password'),
-                'driver': self.config.get('DATABASE', 'driver')
-            }
-        except configparser.Error as e:
-            raise Exception(f"Error reading database configuration: {str(e)}")
+        return dict(self.store.get().db_config)
 
     def get_connection_string(self):
         """Get database connection string"""
-        db_config = self.get_db_config()
-        return (
-            f"DRIVER={db_config['driver']};"
-            f"SERVER={db_config['server']};"
-            f"DATABASE={db_config['database']};"
-            f"UID={db_config['username']};"
-            f"PWD={db_config['password']}"
-        )
+        return self.store.get().connection_string
 
     def get_isolation_level(self):
         """Get transaction isolation level"""
-        return self.config.get('TRANSACTION', 'default_isolation_level')
+        return self.store.get().isolation_level
 
     def get_connection_settings(self):
         """Get connection settings"""
-        return {
-            'retries': self.config.getint('SETTINGS', 'connection_retries'),
-            'timeout': self.config.getint('SETTINGS', 'connection_timeout')
-        }
+        return dict(self.store.get().connection_settings)
+
+    def get_pool_settings(self):
+        """Get connection pool settings"""
+        return dict(self.store.get().pool_settings)
+
+    def get_transfer_settings(self):
+        """Get import/export settings"""
+        return dict(self.store.get().transfer_settings)
+
+    def get_cache_settings(self):
+        """Get query result cache settings"""
+        return dict(self.store.get().cache_settings)
+
+    def get_order_settings(self):
+        """Get order processing settings"""
+        return dict(self.store.get().order_settings)
+
+    def get_archive_settings(self):
+        """Get order archival settings"""
+        return dict(self.store.get().archive_settings)
+
+    def get_isolation_profiles(self):
+        """Get isolation level of every named operation profile"""
+        return dict(self.store.get().isolation_profiles)
+
+    def get_retry_settings(self):
+        """Get transient error retry settings"""
+        return dict(self.store.get().retry_settings)
+
+    def get_monitor_settings(self):
+        """Get lock monitor settings"""
+        return dict(self.store.get().monitor_settings)
+
+    def get_tracing_settings(self):
+        """Get statement tracing settings"""
+        return dict(self.store.get().tracing_settings)
+
+    def get_watchdog_settings(self):
+        """Get GUI stall watchdog settings"""
+        return dict(self.store.get().watchdog_settings)
 
 # Example usage
 if __name__ == "__main__":
@@ -57,5 +312,6 @@ if __name__ == "__main__":
         print("Connection string:", config.get_connection_string())
         print("Isolation level:", config.get_isolation_level())
         print("Connection settings:", config.get_connection_settings())
+        print("Pool settings:", config.get_pool_settings())
     except Exception as e:
-        print(f"Error: {str(e)}")
\ No newline at end of file
+        print(f"Error: {str(e)}")
@@ -0,0 +1,397 @@
+# data_transfer.py
+import csv
+import io
+import itertools
+import json
+import time
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import XMLGenerator
+
+# Columns as they appear in import/export files
+COLUMNS = {
+    'products': ['CategoryID', 'Name', 'Price', 'StockQuantity', 'Status'],
+    'categories': ['Name', 'Description', 'IsActive']
+}
+
+# Element holding one record in import/export XML files
+XML_RECORD_TAGS = {
+    'products': 'product',
+    'categories': 'category'
+}
+
+INSERT_SQL = {
+    'products': """
+        INSERT INTO Products (CategoryID, Name, Price, StockQuantity, Status)
+        VALUES (?, ?, ?, ?, ?)
+    """,
+    'categories': """
+        INSERT INTO Categories (Name, Description, IsActive)
+        VALUES (?, ?, ?)
+    """
+}
+
+
+SELECT_SQL = {
+    'products': """
+        SELECT CategoryID, Name, Price, StockQuantity, Status
+        FROM Products
+    """,
+    'categories': """
+        SELECT Name, Description, IsActive
+        FROM Categories
+    """
+}
+
+
+class BulkLoadError(Exception):
+    """Raised when a bulk load fails; earlier batches stay committed"""
+
+    def __init__(self, message, rows_committed):
+        super().__init__(message)
+        self.rows_committed = rows_committed
+
+
+def parse_bool(value):
+    """Convert 'true'/'false' text (or a JSON bool) to bool"""
+    if isinstance(value, str):
+        return value.strip().lower() == 'true'
+    return bool(value)
+
+
+def product_params(record):
+    """Convert a product record (text or typed values) to INSERT parameters"""
+    return (
+        int(record['CategoryID']),
+        record['Name'],
+        float(record['Price']),
+        int(record['StockQuantity']),
+        record['Status']
+    )
+
+
+def category_params(record):
+    """Convert a category record (text or typed values) to INSERT parameters"""
+    return (
+        record['Name'],
+        record['Description'],
+        parse_bool(record['IsActive'])
+    )
+
+
+CONVERTERS = {
+    'products': product_params,
+    'categories': category_params
+}
+
+
+def iter_xml_records(source, data_type):
+    """Stream records from an XML file without building the whole tree.
+
+    Yields one dict per ``<product>``/``<category>`` child of the root
+    element as soon as its end tag is parsed, then clears it, so memory use
+    does not depend on the file size.
+    """
+    record_tag = XML_RECORD_TAGS[data_type]
+    columns = COLUMNS[data_type]
+    depth = 0
+    root = None
+
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth == 1 and element.tag == record_tag:
+            record = {}
+            for column in columns:
+                child = element.find(column)
+                record[column] = child.text if child is not None else None
+            yield record
+            element.clear()
+        if depth == 1:
+            # Processed records would otherwise stay attached to the root
+            root.clear()
+
+
+def iter_ndjson_records(lines):
+    """Stream records from newline-delimited JSON (one object per line)"""
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON on line {number}: {e}") from e
+
+
+def iter_json_array(file, buffer='', chunk_size=64 * 1024):
+    """Stream the items of a top-level JSON array.
+
+    Reads the file in chunks and decodes one item at a time with
+    ``JSONDecoder.raw_decode``; only the current item and one chunk are held
+    in memory. ``buffer`` is text already read from the file.
+    """
+    decoder = json.JSONDecoder()
+    position = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = file.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def skip_whitespace():
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            fill()
+
+    skip_whitespace()
+    if position >= len(buffer) or buffer[position] != '[':
+        raise ValueError("JSON file must contain an array of records")
+    position += 1
+    expect_item = True
+    after_comma = False
+
+    while True:
+        skip_whitespace()
+        if position >= len(buffer):
+            raise ValueError("Unexpected end of JSON array")
+        char = buffer[position]
+        if char == ']':
+            if after_comma:
+                raise ValueError("Trailing comma before ']' in JSON array")
+            return
+        if char == ',' and not expect_item:
+            position += 1
+            expect_item = True
+            after_comma = True
+            continue
+        if not expect_item:
+            raise ValueError(f"Expected ',' or ']' but found {char!r}")
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except ValueError:
+            if eof:
+                raise
+            fill()
+            continue
+        if end == len(buffer) and not eof:
+            # A number may continue in the next chunk - decode again with more data
+            fill()
+            continue
+        position = end
+        expect_item = False
+        after_comma = False
+        yield item
+        if position > chunk_size:
+            buffer = buffer[position:]
+            position = 0
+
+
+def iter_json_records(file, chunk_size=64 * 1024):
+    """Stream records from a JSON array or NDJSON file, detected by content"""
+    head = file.read(chunk_size)
+    stripped = head.lstrip()
+    while not stripped and head:
+        head = file.read(chunk_size)
+        stripped = head.lstrip()
+
+    if stripped.startswith('['):
+        return iter_json_array(file, stripped, chunk_size)
+
+    # Complete the partially read last line, then continue line by line
+    first_lines = io.StringIO(stripped + file.readline())
+    return iter_ndjson_records(itertools.chain(first_lines, file))
+
+
+def bulk_insert(connection, data_type, records, batch_size=5000, progress=None):
+    """Insert records in batches using parameter arrays.
+
+    Every batch is sent with one ``executemany`` call (``fast_executemany``
+    packs the whole batch into a single round trip) and committed on its
+    own, so locks on the target table are held only for one batch.
+    ``progress(rows_done, elapsed)`` is called after every commit.
+
+    Returns a dict with ``rows``, ``batches``, ``seconds`` and
+    ``rows_per_second``.
+    """
+    sql = INSERT_SQL[data_type]
+    convert = CONVERTERS[data_type]
+    cursor = connection.cursor()
+    cursor.fast_executemany = True
+
+    started = time.monotonic()
+    rows_done = 0
+    batches = 0
+    batch = []
+
+    def flush():
+        nonlocal rows_done, batches
+        try:
+            cursor.executemany(sql, batch)
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            raise BulkLoadError(
+                f"Batch {batches + 1} failed after {rows_done} committed rows: {e}",
+                rows_done) from e
+        rows_done += len(batch)
+        batches += 1
+        batch.clear()
+        if progress:
+            progress(rows_done, time.monotonic() - started)
+
+    for number, record in enumerate(records, start=1):
+        try:
+            batch.append(convert(record))
+        except (KeyError, TypeError, ValueError) as e:
+            raise BulkLoadError(f"Invalid record {number}: {e}", rows_done) from e
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    cursor.close()
+
+    seconds = time.monotonic() - started
+    return {
+        'rows': rows_done,
+        'batches': batches,
+        'seconds': seconds,
+        'rows_per_second': rows_done / seconds if seconds > 0 else 0.0
+    }
+
+
+class CsvExportWriter:
+    """Writes rows as CSV with a header line"""
+
+    def __init__(self, file, data_type):
+        self.writer = csv.writer(file)
+        self.writer.writerow(COLUMNS[data_type])
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        pass
+
+
+class JsonArrayExportWriter:
+    """Writes rows as a JSON array, one object per line"""
+
+    def __init__(self, file, data_type):
+        self.file = file
+        self.columns = COLUMNS[data_type]
+        self.first = True
+        self.file.write('[')
+
+    def write(self, row):
+        separator = '\n  ' if self.first else ',\n  '
+        self.first = False
+        self.file.write(separator)
+        self.file.write(json.dumps(dict(zip(self.columns, row)),
+                                   ensure_ascii=False, default=str))
+
+    def close(self):
+        self.file.write('\n]\n' if not self.first else ']\n')
+
+
+class NdjsonExportWriter:
+    """Writes rows as newline-delimited JSON"""
+
+    def __init__(self, file, data_type):
+        self.file = file
+        self.columns = COLUMNS[data_type]
+
+    def write(self, row):
+        self.file.write(json.dumps(dict(zip(self.columns, row)),
+                                   ensure_ascii=False, default=str))
+        self.file.write('\n')
+
+    def close(self):
+        pass
+
+
+class XmlExportWriter:
+    """Writes rows as XML elements one by one, without building a tree"""
+
+    def __init__(self, file, data_type):
+        self.generator = XMLGenerator(file, encoding='utf-8', short_empty_elements=True)
+        self.file = file
+        self.record_tag = XML_RECORD_TAGS[data_type]
+        self.columns = COLUMNS[data_type]
+        self.generator.startDocument()
+        self.generator.startElement('data', {})
+
+    def write(self, row):
+        generator = self.generator
+        generator.startElement(self.record_tag, {})
+        for column, value in zip(self.columns, row):
+            generator.startElement(column, {})
+            if value is not None:
+                generator.characters(str(value))
+            generator.endElement(column)
+        generator.endElement(self.record_tag)
+        self.file.write('\n')
+
+    def close(self):
+        self.generator.endElement('data')
+        self.generator.endDocument()
+
+
+EXPORT_WRITERS = {
+    'csv': CsvExportWriter,
+    'json': JsonArrayExportWriter,
+    'ndjson': NdjsonExportWriter,
+    'xml': XmlExportWriter
+}
+
+
+def export_table(connection, data_type, file_name, file_format,
+                 fetch_size=5000, progress=None):
+    """Stream a table into a file in constant memory.
+
+    Rows are pulled with ``fetchmany(fetch_size)`` and written immediately
+    by the writer for ``file_format`` (csv, json, ndjson or xml).
+    ``progress(rows_done, elapsed)`` is called after every chunk.
+
+    Returns a dict with ``rows``, ``seconds`` and ``rows_per_second``.
+    """
+    writer_class = EXPORT_WRITERS[file_format]
+    cursor = connection.cursor()
+    cursor.execute(SELECT_SQL[data_type])
+
+    started = time.monotonic()
+    rows_done = 0
+    newline = '' if file_format == 'csv' else None
+    with open(file_name, 'w', encoding='utf-8', newline=newline) as file:
+        writer = writer_class(file, data_type)
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            for row in rows:
+                writer.write(row)
+            rows_done += len(rows)
+            if progress:
+                progress(rows_done, time.monotonic() - started)
+        writer.close()
+    cursor.close()
+
+    seconds = time.monotonic() - started
+    return {
+        'rows': rows_done,
+        'seconds': seconds,
+        'rows_per_second': rows_done / seconds if seconds > 0 else 0.0
+    }
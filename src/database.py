@@ -1,57 +1,834 @@
 # database.py
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
 import pyodbc
 from config import Config
+from query_cache import QueryCache
+from tracing import Tracer, untraced
+
+# Levels offered in the UI, from weakest to strongest
+ISOLATION_LEVELS = [
+    "READ UNCOMMITTED",
+    "READ COMMITTED",
+    "REPEATABLE READ",
+    "SNAPSHOT",
+    "SERIALIZABLE"
+]
+
+# Snapshot isolation transaction aborted due to update conflict
+SNAPSHOT_CONFLICT_ERROR = 3960
+
+# Native errors of a dropped connection: no process on the other end of the
+# pipe, connection aborted, connection reset, connection timed out
+CONNECTION_ERRORS = {233, 10053, 10054, 10060}
+
+
+def sql_error_numbers(error):
+    """Native SQL Server error numbers mentioned in a pyodbc error"""
+    message = ' '.join(str(arg) for arg in getattr(error, 'args', ()))
+    return {int(number) for number in re.findall(r'\((\d{3,5})\)', message)}
+
+
+def has_sql_error(error, numbers):
+    """True if ``error`` or any exception it was raised from carries one of ``numbers``"""
+    while error is not None:
+        if isinstance(error, pyodbc.Error) and sql_error_numbers(error) & set(numbers):
+            return True
+        error = error.__cause__
+    return False
+
+
+def is_snapshot_conflict(error):
+    """True if ``error`` (or its cause) is a snapshot update conflict (3960)"""
+    return has_sql_error(error, (SNAPSHOT_CONFLICT_ERROR,))
+
+
+def is_connection_error(error):
+    """True if ``error`` (or its cause) means the connection itself is gone.
+
+    ODBC reports a dropped link with SQLSTATE class 08 (08S01 communication
+    link failure, 08001 cannot connect, 08003 connection closed); the native
+    numbers cover "connection forcibly closed" style errors some drivers
+    report under a generic state.
+    """
+    while error is not None:
+        if isinstance(error, pyodbc.Error):
+            if error.args and str(error.args[0]).startswith('08'):
+                return True
+            if sql_error_numbers(error) & CONNECTION_ERRORS:
+                return True
+        error = error.__cause__
+    return False
+
+
+def ping(connection):
+    """True if ``connection`` still answers a trivial query"""
+    try:
+        # Pings would dominate the statement statistics
+        cursor = untraced(connection).cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+        cursor.close()
+        return True
+    except pyodbc.Error:
+        return False
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection becomes free in time"""
+
+
+class RetryableConnectionError(Exception):
+    """Raised when the connection broke during a write transaction.
+
+    The transaction was rolled back by the server, or never committed, so
+    the whole operation can be run again once the database is reachable.
+    """
+
+
+class ConnectionPool:
+    """Bounded pool of database connections.
+
+    Connections are created on demand up to ``max_size`` and kept open down
+    to ``min_size``. A thread that already holds a connection gets the same
+    one back from nested ``connection()`` blocks, so helpers can be called
+    from inside a checkout without exhausting the pool.
+    """
+
+    def __init__(self, connect, min_size=1, max_size=5, idle_timeout=300,
+                 checkout_timeout=30, validation_interval=0, on_close=None):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.validation_interval = validation_interval
+        # Called with every connection the pool closes
+        self._on_close = on_close
+
+        self._lock = threading.Condition()
+        self._idle = []  # (connection, last_used) - most recently used at the end
+        self._size = 0
+        self._closed = False
+        self._local = threading.local()
+        # Connections opened before the last recycle() are closed on checkin
+        self._generation = 0
+        self._born = {}
+
+        self._stats = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'created': 0,
+            'closed': 0,
+            'failed_pings': 0,
+            'wait_time': 0.0,
+            'max_wait_time': 0.0
+        }
+
+    def open(self):
+        """Create the minimum number of connections"""
+        with self._lock:
+            missing = self.min_size - self._size
+            self._size += max(missing, 0)
+        for _ in range(max(missing, 0)):
+            try:
+                connection = self._create()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                    self._lock.notify()
+                raise
+            with self._lock:
+                self._idle.append((connection, time.monotonic()))
+
+    def _create(self):
+        with self._lock:
+            generation = self._generation
+        connection = self._connect()
+        with self._lock:
+            self._stats['created'] += 1
+            self._born[id(connection)] = generation
+        return connection
+
+    def _discard(self, connection):
+        try:
+            connection.close()
+        except pyodbc.Error:
+            pass
+        if self._on_close:
+            self._on_close(connection)
+        with self._lock:
+            self._born.pop(id(connection), None)
+            self._size -= 1
+            self._stats['closed'] += 1
+            self._lock.notify()
+
+    def _ping(self, connection):
+        if ping(connection):
+            return True
+        with self._lock:
+            self._stats['failed_pings'] += 1
+        return False
+
+    def checkout(self, timeout=None):
+        """Take a connection from the pool, waiting up to ``timeout`` seconds"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            create = False
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise PoolTimeout("Connection pool is closed")
+                    if self._idle:
+                        connection, last_used = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        connection, last_used, create = None, None, True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolTimeout(
+                            f"No free connection within {timeout:.1f} s "
+                            f"({self.max_size} in use)")
+                    self._lock.wait(remaining)
+
+            if create:
+                try:
+                    connection = self._create()
+                except Exception:
+                    with self._lock:
+                        self._size -= 1
+                        self._lock.notify()
+                    raise
+            elif time.monotonic() - last_used >= self.validation_interval:
+                if not self._ping(connection):
+                    self._discard(connection)
+                    continue
+
+            waited = time.monotonic() - started
+            with self._lock:
+                self._stats['checkouts'] += 1
+                self._stats['wait_time'] += waited
+                self._stats['max_wait_time'] = max(self._stats['max_wait_time'], waited)
+            return connection
+
+    def checkin(self, connection, discard=False):
+        """Return a connection to the pool"""
+        if not discard:
+            try:
+                # Never hand an open transaction to the next borrower
+                connection.rollback()
+            except pyodbc.Error:
+                discard = True
+
+        with self._lock:
+            stale = self._born.get(id(connection), self._generation) < self._generation
+            surplus = self._size > self.max_size
+            closed = self._closed
+        if discard or closed or stale or surplus:
+            self._discard(connection)
+            return
+
+        with self._lock:
+            self._idle.append((connection, time.monotonic()))
+            self._lock.notify()
+        self.evict_idle()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Context manager that checks a connection out and back in.
+
+        Nested use on the same thread yields the connection the thread
+        already holds.
+        """
+        held = getattr(self._local, 'held', None)
+        if held is not None:
+            held[1] += 1
+            try:
+                yield held[0]
+            finally:
+                held[1] -= 1
+            return
+
+        connection = self.checkout(timeout)
+        self._local.held = [connection, 1]
+        broken = False
+        try:
+            yield connection
+        except pyodbc.Error:
+            broken = True
+            raise
+        finally:
+            self._local.held = None
+            self.checkin(connection, discard=broken and not self._ping(connection))
+
+    def evict_idle(self):
+        """Close connections idle longer than ``idle_timeout`` above ``min_size``"""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            # Least recently used connections are at the front
+            while (self._idle and self._size - len(expired) > self.min_size
+                   and now - self._idle[0][1] > self.idle_timeout):
+                expired.append(self._idle.pop(0)[0])
+        for connection in expired:
+            self._discard(connection)
+        return len(expired)
+
+    def ping_idle(self):
+        """Ping every idle connection, close dead ones and refill to ``min_size``.
+
+        Keeps idle connections from being dropped by firewalls and server
+        idle timeouts, and finds broken ones before a borrower does.
+        Returns the number of dead connections closed.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        alive = []
+        dead = 0
+        for connection, last_used in idle:
+            if self._ping(connection):
+                alive.append((connection, last_used))
+            else:
+                self._discard(connection)
+                dead += 1
+        with self._lock:
+            # Keep the least recently used order for evict_idle()
+            self._idle = sorted(alive + self._idle, key=lambda item: item[1])
+            self._lock.notify_all()
+            closed = self._closed
+        if not closed:
+            self.open()
+        return dead
+
+    def configure(self, min_size=None, max_size=None, idle_timeout=None,
+                  checkout_timeout=None, validation_interval=None):
+        """Change pool limits at runtime; surplus connections close as they go idle"""
+        with self._lock:
+            new_min = self.min_size if min_size is None else min_size
+            new_max = self.max_size if max_size is None else max_size
+            if new_max < 1 or new_min < 0 or new_min > new_max:
+                raise ValueError(f"Invalid pool size: min={new_min}, max={new_max}")
+            self.min_size, self.max_size = new_min, new_max
+            if idle_timeout is not None:
+                self.idle_timeout = idle_timeout
+            if checkout_timeout is not None:
+                self.checkout_timeout = checkout_timeout
+            if validation_interval is not None:
+                self.validation_interval = validation_interval
+
+            surplus = []
+            while self._idle and self._size - len(surplus) > self.max_size:
+                surplus.append(self._idle.pop(0)[0])
+            # A larger pool may wake up waiting threads
+            self._lock.notify_all()
+        for connection in surplus:
+            self._discard(connection)
+
+    def recycle(self):
+        """Replace all connections, e.g. after the connection string changed.
+
+        Idle connections are closed now, connections in use when they are
+        checked back in.
+        """
+        with self._lock:
+            self._generation += 1
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def close(self):
+        """Close all idle connections; connections in use are closed on checkin"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._lock.notify_all()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def get_stats(self):
+        """Return pool statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = self._size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._size - len(self._idle)
+            stats['min_size'] = self.min_size
+            stats['max_size'] = self.max_size
+        checkouts = stats['checkouts']
+        stats['avg_wait_time'] = stats['wait_time'] / checkouts if checkouts else 0.0
+        return stats
+
 
 class Database:
     def __init__(self):
         self.config = Config()
-        self.connection = None
-        self.cursor = None
+        self.pool = None
+        self.cache = QueryCache(**self.config.get_cache_settings())
+        # Times every statement on connections opened by _create_connection
+        self.tracer = Tracer(**self.config.get_tracing_settings())
+        # Isolation level each open connection currently runs at, by id()
+        self._levels = {}
+        self._local = threading.local()
+        # Per-operation counters of run_in_transaction/retrying
+        self._retry_lock = threading.Lock()
+        self._retry_stats = {}
+        # Set by disconnect() to cut short a connect() waiting between attempts
+        # and to stop the keepalive thread
+        self._closing = threading.Event()
+        self._keepalive = None
+        self._health_lock = threading.Lock()
+        self._health = {
+            'connected': False,
+            'last_check': None,
+            'last_error': None,
+            'broken_connections': 0,
+            'reconnects': 0
+        }
+        self.config.store.subscribe(self.on_config_changed)
 
-    def connect(self):
-        """Connect to database"""
+    def on_config_changed(self, old, new):
+        """Apply a reloaded config.conf to the pool without restarting"""
+        if new.cache_settings != old.cache_settings:
+            self.cache.configure(**new.cache_settings)
+        if new.tracing_settings != old.tracing_settings:
+            self.tracer.configure(**new.tracing_settings)
+        if self.pool is None:
+            return
+        if new.pool_settings != old.pool_settings:
+            self.pool.configure(**new.pool_settings)
+            print(f"Connection pool resized: {dict(new.pool_settings)}")
+        if (new.connection_string != old.connection_string
+                or new.isolation_level != old.isolation_level
+                or new.connection_settings['timeout'] != old.connection_settings['timeout']):
+            self.pool.recycle()
+            print("Connection settings changed, pooled connections will be reopened")
+
+    def _create_connection(self):
+        """Open a new (traced) connection with the default isolation level set"""
+        settings = self.config.get_connection_settings()
+        connection = self.tracer.wrap(pyodbc.connect(
+            self.config.get_connection_string(),
+            timeout=settings['timeout']
+        ))
+        self.set_isolation_level(connection, self.config.get_isolation_level())
+        return connection
+
+    def set_isolation_level(self, connection, level):
+        """Run SET TRANSACTION ISOLATION LEVEL on ``connection``"""
+        level = ' '.join(level.upper().split())
+        if level not in ISOLATION_LEVELS:
+            raise ValueError(f"Unknown isolation level: {level}")
+        connection.execute(f"SET TRANSACTION ISOLATION LEVEL {level}")
+        self._levels[id(connection)] = level
+
+    def get_profile_level(self, profile):
+        """Isolation level configured for an operation profile"""
+        profiles = self.config.get_isolation_profiles()
+        if profile not in profiles:
+            raise ValueError(f"Unknown isolation profile: {profile}")
+        return profiles[profile]
+
+    @contextmanager
+    def connection_for(self, profile, timeout=None):
+        """Pooled connection running at the isolation level of ``profile``.
+
+        The previous level is restored on exit, so the connection goes back
+        to the pool at its default level. Nested blocks on the same thread
+        share the connection; the inner profile applies until it exits.
+        """
+        level = self.get_profile_level(profile)
+        with self.pool.connection(timeout) as connection:
+            previous = self._levels.get(id(connection))
+            depth = getattr(self._local, 'depth', 0)
+            self._local.depth = depth + 1
+            try:
+                if level != previous:
+                    self.set_isolation_level(connection, level)
+                yield connection
+            finally:
+                self._local.depth = depth
+                if previous is not None and level != previous:
+                    try:
+                        if depth == 0:
+                            # The pool would roll back anyway; SNAPSHOT cannot be left mid-transaction
+                            connection.rollback()
+                        self.set_isolation_level(connection, previous)
+                    except pyodbc.Error:
+                        pass
+
+    def checkout(self, profile, timeout=None):
+        """Check out a connection at the level of ``profile`` for use beyond one block.
+
+        Must be returned with ``checkin``.
+        """
+        connection = self.pool.checkout(timeout)
+        try:
+            self.set_isolation_level(connection, self.get_profile_level(profile))
+        except Exception:
+            self.pool.checkin(connection)
+            raise
+        return connection
+
+    def checkin(self, connection):
+        """Return a connection from ``checkout`` at the default isolation level"""
+        discard = False
+        try:
+            connection.rollback()
+            self.set_isolation_level(connection, self.config.get_isolation_level())
+        except pyodbc.Error:
+            discard = True
+        self.pool.checkin(connection, discard=discard)
+
+    def connect(self, on_attempt=None):
+        """Connect to database.
+
+        Failed attempts are retried up to ``connection_retries`` times with
+        an exponentially growing delay (``connection_retry_delay`` doubled
+        per attempt, capped at ``connection_retry_max_delay``). Blocks for
+        the whole time, so GUI code must call it from a worker thread.
+        ``on_attempt(attempt, retries, error, delay)`` is called after every
+        failed attempt that will be retried. Returns False without further
+        attempts once ``disconnect()`` has been called.
+        """
+        self._closing.clear()
+        # A repeated connect replaces the pool
+        if self.pool:
+            self.pool.close()
         try:
             # Get connection settings
             settings = self.config.get_connection_settings()
-            
+            self.pool = ConnectionPool(self._create_connection,
+                                       on_close=self._forget_connection,
+                                       **self.config.get_pool_settings())
+
             # Try to connect with retries
             for attempt in range(settings['retries']):
                 try:
-                    self.connection = pyodbc.connect(
-                        self.config.get_connection_string(),
-                        timeout=settings['timeout']
-                    )
-                    self.cursor = self.connection.cursor()
-                    
-                    # Set isolation level
-                    isolation_level = self.config.get_isolation_level()
-                    self.cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {isolation_level}")
-                    
-                    print(f"Connected to database (attempt {attempt + 1})")
-                    return True
+                    # The first pooled connection proves the server is reachable
+                    self.pool.open()
+                    with self.pool.connection():
+                        pass
+                    break
                 except pyodbc.Error as e:
                     if attempt == settings['retries'] - 1:  # Last attempt
                         raise
-                    print(f"Connection attempt {attempt + 1} failed, retrying...")
-            
-            return False
+                    delay = min(settings['retry_max_delay'],
+                                settings['retry_delay'] * 2 ** attempt)
+                    print(f"Connection attempt {attempt + 1} failed, "
+                          f"retrying in {delay:.1f} s...")
+                    if on_attempt:
+                        on_attempt(attempt + 1, settings['retries'], e, delay)
+                    if self._closing.wait(delay):
+                        return False
+
+            self._set_health(True)
+
+            if self._keepalive is None or not self._keepalive.is_alive():
+                self._keepalive = threading.Thread(target=self._keepalive_loop,
+                                                   name="db-keepalive", daemon=True)
+                self._keepalive.start()
+
+            print(f"Connected to database (attempt {attempt + 1})")
+            return True
         except pyodbc.Error as e:
             print(f"Database connection error: {str(e)}")
             return False
 
+    def _forget_connection(self, connection):
+        """Drop bookkeeping of a closed connection (its id() may be reused)"""
+        self._levels.pop(id(connection), None)
+
+    def _set_health(self, connected, error=None):
+        with self._health_lock:
+            self._health['connected'] = connected
+            self._health['last_check'] = time.time()
+            if error is not None:
+                self._health['last_error'] = str(error)
+
+    def _connection_broken(self, error):
+        """Record a dropped connection and replace the pooled ones.
+
+        A failover or network outage kills every open connection, not just
+        the one that noticed, so idle connections are closed right away and
+        connections in use when they come back.
+        """
+        with self._health_lock:
+            self._health['broken_connections'] += 1
+        self._set_health(False, error)
+        if self.pool:
+            self.pool.recycle()
+        print(f"Database connection lost: {error}")
+
+    def get_health(self):
+        """Return the connection health seen by the keepalive and by failed queries"""
+        with self._health_lock:
+            return dict(self._health)
+
+    def keepalive(self):
+        """Ping idle pooled connections once; True if the database answered"""
+        if self.pool is None:
+            return False
+        try:
+            dead = self.pool.ping_idle()
+        except (pyodbc.Error, PoolTimeout) as e:
+            self._set_health(False, e)
+            return False
+        if dead:
+            with self._health_lock:
+                self._health['broken_connections'] += dead
+        self._set_health(True)
+        return True
+
+    def _keepalive_loop(self):
+        while True:
+            interval = self.config.get_connection_settings()['keepalive_interval']
+            # A disabled keepalive still checks the config now and then
+            if self._closing.wait(interval if interval > 0 else 60):
+                return
+            if interval > 0:
+                self.keepalive()
+
+    def reconnecting(self, fn):
+        """Call an idempotent ``fn()`` and re-issue it after a dropped connection.
+
+        Only for reads: ``fn`` may have run partly before the link broke.
+        The first re-issue is immediate on a fresh pooled connection, later
+        ones back off like ``connect`` up to ``connection_retries`` attempts.
+        """
+        settings = self.config.get_connection_settings()
+        attempt = 0
+        while True:
+            try:
+                result = fn()
+            except Exception as e:
+                if not is_connection_error(e) or attempt >= settings['retries'] - 1:
+                    raise
+                self._connection_broken(e)
+                delay = (min(settings['retry_max_delay'],
+                             settings['retry_delay'] * 2 ** (attempt - 1)) if attempt else 0)
+                if self._closing.wait(delay):
+                    raise
+                attempt += 1
+                continue
+            if attempt:
+                with self._health_lock:
+                    self._health['reconnects'] += 1
+                self._set_health(True)
+            return result
+
+    def run_read(self, fn, profile='list_read'):
+        """Run the read ``fn(connection)`` at the level of ``profile``, reconnecting if needed"""
+        def attempt():
+            with self.connection_for(profile) as connection:
+                return fn(connection)
+
+        return self.reconnecting(attempt)
+
+    def retrying(self, operation, fn):
+        """Call ``fn()`` and call it again when it fails with a transient error.
+
+        Errors listed in [RETRY] error_numbers (deadlock victim, lock
+        timeout, snapshot conflict) are retried up to ``max_attempts`` times
+        with exponential backoff and full jitter; anything else, or the last
+        failure, is raised. ``fn`` must leave no partial work behind when it
+        raises, i.e. roll back its own transaction. Counters are kept per
+        ``operation`` name.
+        """
+        settings = self.config.get_retry_settings()
+        attempt = 1
+        while True:
+            try:
+                result = fn()
+            except Exception as e:
+                transient = has_sql_error(e, settings['error_numbers'])
+                if not transient or attempt >= settings['max_attempts']:
+                    self._count_retry(operation, 'failures', e if transient else None)
+                    raise
+                self._count_retry(operation, 'retries', e)
+                ceiling = min(settings['max_delay'], settings['base_delay'] * 2 ** (attempt - 1))
+                time.sleep(random.uniform(0, ceiling))
+                attempt += 1
+                continue
+            self._count_retry(operation, 'succeeded')
+            if attempt > 1:
+                self._count_retry(operation, 'succeeded_after_retry')
+            return result
+
+    def run_in_transaction(self, operation, fn, profile, tables=()):
+        """Unit of work: run ``fn(cursor)`` in one transaction and commit it.
+
+        The connection comes from the pool at the isolation level of
+        ``profile``. The connection is not in autocommit mode, so the first
+        statement starts the transaction - no BEGIN TRANSACTION is needed.
+        On any error the transaction is rolled back; transient errors run
+        the whole of ``fn`` again on a fresh transaction (see ``retrying``),
+        so ``fn`` must not have side effects outside the database.
+        A dropped connection is not retried here - whether a commit in
+        flight reached the server is unknown - but raised as
+        ``RetryableConnectionError`` for the caller to offer a retry.
+        The cache entries of ``tables`` are invalidated once the transaction
+        is over, also after a failure, as a lost commit may still have applied.
+        Returns what ``fn`` returns.
+        """
+        def attempt():
+            with self.connection_for(profile) as connection:
+                cursor = connection.cursor()
+                try:
+                    result = fn(cursor)
+                    connection.commit()
+                    return result
+                except Exception:
+                    try:
+                        connection.rollback()
+                    except pyodbc.Error:
+                        pass
+                    raise
+                finally:
+                    cursor.close()
+
+        try:
+            return self.retrying(operation, attempt)
+        except pyodbc.Error as e:
+            if not is_connection_error(e):
+                raise
+            self._connection_broken(e)
+            raise RetryableConnectionError(
+                f"Connection lost during {operation}; the transaction was not "
+                f"committed and can be run again") from e
+        finally:
+            if tables:
+                self.invalidate(*tables)
+
+    def _count_retry(self, operation, counter, error=None):
+        with self._retry_lock:
+            stats = self._retry_stats.setdefault(operation, {
+                'succeeded': 0,
+                'succeeded_after_retry': 0,
+                'retries': 0,
+                'failures': 0,
+                'errors': {}
+            })
+            stats[counter] += 1
+            while error is not None:
+                if isinstance(error, pyodbc.Error):
+                    for number in sql_error_numbers(error):
+                        stats['errors'][number] = stats['errors'].get(number, 0) + 1
+                error = error.__cause__
+
+    def get_retry_stats(self):
+        """Return {operation: counters} of transactional operations"""
+        with self._retry_lock:
+            return {operation: dict(stats, errors=dict(stats['errors']))
+                    for operation, stats in self._retry_stats.items()}
+
+    def fetch_cached(self, sql, params=(), tables=(), ttl=None):
+        """Run a read query through the result cache.
+
+        ``tables`` lists every table the query reads; a later
+        ``invalidate`` of any of them drops the cached result.
+        """
+        key = self.cache.make_key(sql, params)
+        rows = self.cache.get(key)
+        if rows is not None:
+            return rows
+
+        def read(connection):
+            cursor = connection.cursor()
+            cursor.execute(sql, params)
+            rows = [tuple(row) for row in cursor.fetchall()]
+            cursor.close()
+            return rows
+
+        version = self.cache.version
+        rows = self.run_read(read)
+        self.cache.put(key, rows, tables, ttl, version)
+        return rows
+
+    def get_snapshot_status(self):
+        """Return (snapshot isolation allowed, READ_COMMITTED_SNAPSHOT on) for this database"""
+        def read(connection):
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT snapshot_isolation_state, is_read_committed_snapshot_on
+                FROM sys.databases
+                WHERE name = DB_NAME()
+            """)
+            row = cursor.fetchone()
+            cursor.close()
+            return row
+
+        state, rcsi = self.run_read(read)
+        # snapshot_isolation_state: 0 off, 1 on, 2 turning off, 3 turning on
+        return state == 1, bool(rcsi)
+
+    def enable_snapshot_isolation(self, read_committed_snapshot=False, timeout=30):
+        """Turn on ALLOW_SNAPSHOT_ISOLATION and optionally READ_COMMITTED_SNAPSHOT.
+
+        ALTER DATABASE cannot run inside a transaction, so a separate
+        autocommit connection is used. ALLOW_SNAPSHOT_ISOLATION waits until
+        every open transaction has finished, so the statement gets a query
+        timeout of ``timeout`` seconds instead of waiting forever.
+        READ_COMMITTED_SNAPSHOT needs the database to itself: open
+        transactions of other sessions are rolled back, so pooled
+        connections are recycled afterwards. Blocks, call from a worker thread.
+        """
+        settings = self.config.get_connection_settings()
+        connection = pyodbc.connect(self.config.get_connection_string(),
+                                    timeout=settings['timeout'], autocommit=True)
+        try:
+            # Login timeout above, query timeout here
+            connection.timeout = timeout
+            cursor = connection.cursor()
+            cursor.execute("ALTER DATABASE CURRENT SET ALLOW_SNAPSHOT_ISOLATION ON")
+            if read_committed_snapshot:
+                cursor.execute(
+                    "ALTER DATABASE CURRENT SET READ_COMMITTED_SNAPSHOT ON WITH ROLLBACK IMMEDIATE")
+            cursor.close()
+        finally:
+            connection.close()
+        if read_committed_snapshot and self.pool:
+            self.pool.recycle()
+        return self.get_snapshot_status()
+
+    def invalidate(self, *tables):
+        """Tell the cache that ``tables`` were written"""
+        return self.cache.invalidate(*tables)
+
+    def get_pool_stats(self):
+        """Return connection pool statistics, or None before connecting"""
+        return self.pool.get_stats() if self.pool else None
+
     def disconnect(self):
-        """Close database connection"""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        """Close database connection; safe to call more than once"""
+        self._closing.set()
+        self.config.store.unsubscribe(self.on_config_changed)
+        if self.pool:
+            self.pool.close()
             print("Disconnected from database")
+        self._set_health(False)
 
 # Example usage
 if __name__ == "__main__":
     db = Database()
     if db.connect():
         print("Successfully connected to database")
+        with db.pool.connection() as connection:
+            connection.cursor().execute("SELECT 1").fetchone()
+        print("Pool stats:", db.get_pool_stats())
+        print("Retry stats:", db.get_retry_stats())
+        print("Health:", db.get_health())
         db.disconnect()
     else:
-        print("Failed to connect to database")
\ No newline at end of file
+        print("Failed to connect to database")
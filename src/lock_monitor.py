@@ -0,0 +1,243 @@
+# lock_monitor.py
+import time
+import xml.etree.ElementTree as ET
+
+import pyodbc
+
+from database import is_connection_error
+
+# Reading the system_health ring buffer is expensive, so deadlocks are
+# fetched at most this often however fast the monitor polls
+DEADLOCK_POLL_SECONDS = 30
+
+# Statement text is cut to this many characters
+SQL_TEXT_LENGTH = 200
+
+_REQUESTS_SQL = f"""
+SELECT r.session_id, r.blocking_session_id, r.status, r.command, r.wait_type,
+       r.wait_time, r.wait_resource, r.open_transaction_count,
+       LEFT(SUBSTRING(t.text, r.statement_start_offset / 2 + 1,
+            CASE WHEN r.statement_end_offset = -1 THEN DATALENGTH(t.text)
+                 ELSE (r.statement_end_offset - r.statement_start_offset) / 2 + 1 END),
+            {SQL_TEXT_LENGTH})
+FROM sys.dm_exec_requests r
+JOIN sys.dm_exec_sessions s ON s.session_id = r.session_id
+OUTER APPLY sys.dm_exec_sql_text(r.sql_handle) t
+WHERE s.is_user_process = 1 AND r.session_id <> @@SPID
+ORDER BY r.wait_time DESC
+"""
+
+# Edges of the blocking graph; a parallel query has several waiting tasks
+_WAITING_SQL = """
+SELECT wt.session_id, wt.blocking_session_id, wt.wait_type,
+       MAX(wt.wait_duration_ms), MAX(wt.resource_description)
+FROM sys.dm_os_waiting_tasks wt
+WHERE wt.blocking_session_id IS NOT NULL
+  AND wt.blocking_session_id <> wt.session_id
+GROUP BY wt.session_id, wt.blocking_session_id, wt.wait_type
+"""
+
+# Head blockers are often idle sessions with an open transaction, which
+# have no row in dm_exec_requests - their last statement comes from the connection
+_SESSIONS_SQL = f"""
+SELECT s.session_id, s.status, s.login_name, s.host_name, s.program_name,
+       s.open_transaction_count, LEFT(t.text, {SQL_TEXT_LENGTH})
+FROM sys.dm_exec_sessions s
+LEFT JOIN sys.dm_exec_connections c ON c.session_id = s.session_id
+OUTER APPLY sys.dm_exec_sql_text(c.most_recent_sql_handle) t
+WHERE s.session_id IN ({{ids}})
+"""
+
+_LOCKS_SQL = """
+SELECT o.object_name, l.request_session_id, l.resource_type, l.request_mode,
+       l.request_status, COUNT(*)
+FROM sys.dm_tran_locks l
+LEFT JOIN sys.partitions p
+       ON l.resource_type IN ('PAGE', 'KEY', 'RID', 'HOBT')
+      AND p.hobt_id = l.resource_associated_entity_id
+CROSS APPLY (SELECT CASE WHEN l.resource_type = 'OBJECT'
+                         THEN OBJECT_NAME(l.resource_associated_entity_id)
+                         ELSE OBJECT_NAME(p.object_id) END AS object_name) o
+WHERE l.resource_database_id = DB_ID()
+  AND o.object_name IN ({tables})
+GROUP BY o.object_name, l.request_session_id, l.resource_type, l.request_mode, l.request_status
+ORDER BY o.object_name, l.request_status DESC, l.request_session_id
+"""
+
+_DEADLOCKS_SQL = """
+SELECT CAST(st.target_data AS nvarchar(max))
+FROM sys.dm_xe_session_targets st
+JOIN sys.dm_xe_sessions s ON s.address = st.event_session_address
+WHERE s.name = 'system_health' AND st.target_name = 'ring_buffer'
+"""
+
+
+def build_chains(edges):
+    """Blocking chains as (depth, session_id, blocked_by_edge) in display order.
+
+    ``edges`` is a list of (waiter, blocker, wait_type, wait_ms, resource).
+    Head blockers - sessions that block others but wait on nobody - start
+    a chain at depth 0; the sessions waiting on them follow, indented.
+    Blockers not reachable from any head are waiting in a cycle (a deadlock
+    in progress); each cycle is shown from its lowest session id.
+    """
+    waiting_on = {}
+    for edge in edges:
+        waiting_on.setdefault(edge[1], []).append(edge)
+    waiters = {edge[0] for edge in edges}
+    heads = sorted(blocker for blocker in waiting_on if blocker not in waiters)
+
+    chains = []
+    seen = set()
+
+    def visit(session_id, depth, edge):
+        chains.append((depth, session_id, edge))
+        if session_id in seen:
+            return
+        seen.add(session_id)
+        for child in sorted(waiting_on.get(session_id, []), key=lambda e: -(e[3] or 0)):
+            visit(child[0], depth + 1, child)
+
+    for head in heads:
+        visit(head, 0, None)
+    for blocker in sorted(waiting_on):
+        if blocker not in seen:
+            visit(blocker, 0, None)
+    return chains
+
+
+def parse_deadlocks(target_data, limit=20):
+    """Deadlock reports from the system_health ring buffer, newest first.
+
+    Each item is a dict with ``timestamp``, ``victims`` (spids), ``processes``
+    (list of (spid, wait resource, input buffer)), ``objects`` and the raw
+    ``xml`` of the deadlock graph.
+    """
+    if not target_data:
+        return []
+    root = ET.fromstring(target_data)
+    deadlocks = []
+    for event in root.iter('event'):
+        if event.get('name') != 'xml_deadlock_report':
+            continue
+        graph = event.find("./data[@name='xml_report']/value/deadlock")
+        if graph is None:
+            continue
+        victim_ids = {victim.get('id') for victim in graph.iter('victimProcess')}
+        processes = []
+        victims = []
+        for process in graph.iter('process'):
+            spid = process.get('spid')
+            inputbuf = (process.findtext('inputbuf') or '').strip()
+            processes.append((spid, process.get('waitresource'), inputbuf[:SQL_TEXT_LENGTH]))
+            if process.get('id') in victim_ids:
+                victims.append(spid)
+        resources = graph.find('resource-list')
+        objects = sorted({resource.get('objectname') for resource in resources
+                          if resource.get('objectname')}) if resources is not None else []
+        deadlocks.append({
+            'timestamp': event.get('timestamp'),
+            'victims': victims,
+            'processes': processes,
+            'objects': objects,
+            'xml': ET.tostring(graph, encoding='unicode')
+        })
+    deadlocks.sort(key=lambda deadlock: deadlock['timestamp'] or '', reverse=True)
+    return deadlocks[:limit]
+
+
+class LockMonitor:
+    """Polls lock and blocking DMVs on its own connection.
+
+    The connection is outside the pool, so the monitor keeps working when
+    blocked writers hold every pooled connection. It runs in autocommit
+    mode with a short lock timeout and low deadlock priority, so it never
+    holds locks or becomes part of the problem it is watching. Needs the
+    VIEW SERVER STATE permission to see other sessions.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.connection = None
+        self._deadlocks_fetched = None
+        self._deadlocks = []
+
+    def _connect(self):
+        settings = self.config.get_connection_settings()
+        connection = pyodbc.connect(self.config.get_connection_string(),
+                                    timeout=settings['timeout'], autocommit=True)
+        connection.execute("SET LOCK_TIMEOUT 1000")
+        connection.execute("SET DEADLOCK_PRIORITY LOW")
+        return connection
+
+    def snapshot(self, tables=None, capture_deadlocks=None):
+        """Read requests, blocking chains, locks and (optionally) deadlocks once.
+
+        Returns a dict with ``taken_at``, ``seconds`` (time the poll took),
+        ``requests``, ``chains``, ``sessions`` (session info by id),
+        ``head_blockers``, ``locks`` and ``deadlocks``.
+        """
+        settings = self.config.get_monitor_settings()
+        tables = settings['tables'] if tables is None else tables
+        if capture_deadlocks is None:
+            capture_deadlocks = settings['capture_deadlocks']
+
+        if self.connection is None:
+            self.connection = self._connect()
+        started = time.monotonic()
+        try:
+            result = self._read(tables, capture_deadlocks, settings['deadlock_limit'])
+        except pyodbc.Error as e:
+            if is_connection_error(e):
+                self.close()
+            raise
+        result['seconds'] = time.monotonic() - started
+        return result
+
+    def _read(self, tables, capture_deadlocks, deadlock_limit):
+        cursor = self.connection.cursor()
+        cursor.execute(_REQUESTS_SQL)
+        requests = [tuple(row) for row in cursor.fetchall()]
+
+        cursor.execute(_WAITING_SQL)
+        edges = [tuple(row) for row in cursor.fetchall()]
+        chains = build_chains(edges)
+
+        session_ids = sorted({session_id for _, session_id, _ in chains})
+        sessions = {}
+        if session_ids:
+            cursor.execute(_SESSIONS_SQL.format(ids=', '.join('?' * len(session_ids))),
+                           session_ids)
+            sessions = {row[0]: tuple(row) for row in cursor.fetchall()}
+
+        locks = []
+        if tables:
+            cursor.execute(_LOCKS_SQL.format(tables=', '.join('?' * len(tables))), list(tables))
+            locks = [tuple(row) for row in cursor.fetchall()]
+
+        if capture_deadlocks and (self._deadlocks_fetched is None or
+                                  time.monotonic() - self._deadlocks_fetched >= DEADLOCK_POLL_SECONDS):
+            cursor.execute(_DEADLOCKS_SQL)
+            row = cursor.fetchone()
+            self._deadlocks = parse_deadlocks(row[0] if row else None, deadlock_limit)
+            self._deadlocks_fetched = time.monotonic()
+        cursor.close()
+
+        return {
+            'taken_at': time.time(),
+            'requests': requests,
+            'chains': chains,
+            'sessions': sessions,
+            'head_blockers': [session_id for depth, session_id, _ in chains if depth == 0],
+            'locks': locks,
+            'deadlocks': list(self._deadlocks) if capture_deadlocks else None
+        }
+
+    def close(self):
+        """Close the monitor connection; the next snapshot opens a new one"""
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except pyodbc.Error:
+                pass
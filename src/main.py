@@ -9,9 +9,7 @@ def main():
     db = Database()
         
     try:
-        if not db.connect():
-            raise Exception("Nepodařilo se připojit k databázi")
-        
+        # Okno se zobrazí hned, k databázi se připojuje na pozadí
         window = MainWindow(db)
         window.show()
         
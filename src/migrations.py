@@ -0,0 +1,171 @@
+# migrations.py
+import argparse
+import hashlib
+import os
+import re
+from collections import namedtuple
+
+import pyodbc
+
+from config import Config
+
+MIGRATIONS_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(__file__), '..', 'database', 'migrations'))
+
+# Migration files are named NNNN_description.sql and applied in version order
+MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+BATCH_SEPARATOR = re.compile(r'^\s*go\s*(?:--.*)?$', re.IGNORECASE | re.MULTILINE)
+
+Migration = namedtuple('Migration', ['version', 'name', 'path', 'checksum'])
+
+
+class MigrationError(Exception):
+    """Raised when a migration script fails; earlier migrations stay applied"""
+
+    def __init__(self, message, migration):
+        super().__init__(message)
+        self.migration = migration
+
+
+def split_batches(script):
+    """Split a script on ``go`` lines the way SSMS/sqlcmd do"""
+    return [batch.strip() for batch in BATCH_SEPARATOR.split(script) if batch.strip()]
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Return all migration files in ``directory`` sorted by version"""
+    migrations = []
+    for file_name in os.listdir(directory):
+        match = MIGRATION_FILE.match(file_name)
+        if not match:
+            continue
+        path = os.path.join(directory, file_name)
+        with open(path, 'rb') as file:
+            checksum = hashlib.sha256(file.read()).hexdigest()
+        migrations.append(Migration(int(match.group(1)), match.group(2), path, checksum))
+
+    migrations.sort(key=lambda migration: migration.version)
+    for previous, current in zip(migrations, migrations[1:]):
+        if previous.version == current.version:
+            raise ValueError(f"Duplicate migration version {current.version}")
+    return migrations
+
+
+def ensure_version_table(connection):
+    """Create the SchemaVersions table on first use"""
+    cursor = connection.cursor()
+    cursor.execute("""
+        IF OBJECT_ID('SchemaVersions') IS NULL
+            CREATE TABLE SchemaVersions (
+                Version int PRIMARY KEY,
+                Name varchar(200) NOT NULL,
+                Checksum char(64) NOT NULL,
+                AppliedAt datetime NOT NULL DEFAULT GETDATE()
+            )
+    """)
+    connection.commit()
+    cursor.close()
+
+
+def applied_versions(connection):
+    """Return {version: checksum} of migrations already applied"""
+    ensure_version_table(connection)
+    cursor = connection.cursor()
+    cursor.execute("SELECT Version, Checksum FROM SchemaVersions")
+    applied = {version: checksum for version, checksum in cursor.fetchall()}
+    cursor.close()
+    return applied
+
+
+def pending_migrations(connection, directory=MIGRATIONS_DIR):
+    """Migrations not yet recorded in SchemaVersions, in order.
+
+    Also returns the applied migrations whose file changed since it ran,
+    which usually means someone edited a migration instead of adding one.
+    """
+    applied = applied_versions(connection)
+    pending = []
+    modified = []
+    for migration in discover_migrations(directory):
+        checksum = applied.get(migration.version)
+        if checksum is None:
+            pending.append(migration)
+        elif checksum.strip() != migration.checksum:
+            modified.append(migration)
+    return pending, modified
+
+
+def apply_migration(connection, migration):
+    """Run one migration and record it, all in one transaction"""
+    with open(migration.path, 'r', encoding='utf-8-sig') as file:
+        batches = split_batches(file.read())
+
+    cursor = connection.cursor()
+    try:
+        for batch in batches:
+            cursor.execute(batch)
+            while cursor.nextset():
+                pass
+        cursor.execute(
+            "INSERT INTO SchemaVersions (Version, Name, Checksum) VALUES (?, ?, ?)",
+            (migration.version, migration.name, migration.checksum))
+        connection.commit()
+    except pyodbc.Error as e:
+        connection.rollback()
+        raise MigrationError(
+            f"Migration {migration.version} ({migration.name}) failed: {e}", migration) from e
+    finally:
+        cursor.close()
+
+
+def migrate(connection, directory=MIGRATIONS_DIR, target=None, progress=None):
+    """Apply pending migrations up to ``target`` (all if None) in version order.
+
+    ``progress(migration)`` is called after each applied migration.
+    Returns the list of applied migrations.
+    """
+    pending, _ = pending_migrations(connection, directory)
+    done = []
+    for migration in pending:
+        if target is not None and migration.version > target:
+            break
+        apply_migration(connection, migration)
+        done.append(migration)
+        if progress:
+            progress(migration)
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument('--status', action='store_true',
+                        help="only list applied and pending migrations")
+    parser.add_argument('--target', type=int, default=None,
+                        help="apply migrations up to this version")
+    parser.add_argument('--dir', default=MIGRATIONS_DIR, help="migrations directory")
+    args = parser.parse_args()
+
+    config = Config()
+    # DDL like CREATE INDEX runs inside the migration's own transaction
+    connection = pyodbc.connect(config.get_connection_string(),
+                                timeout=config.get_connection_settings()['timeout'])
+    try:
+        pending, modified = pending_migrations(connection, args.dir)
+        for migration in modified:
+            print(f"Warning: migration {migration.version} ({migration.name}) "
+                  f"changed after it was applied")
+        if args.status:
+            applied = applied_versions(connection)
+            print(f"Applied: {', '.join(str(v) for v in sorted(applied)) or 'none'}")
+            print(f"Pending: {', '.join(str(m.version) for m in pending) or 'none'}")
+            return
+
+        done = migrate(connection, args.dir, args.target,
+                       lambda m: print(f"Applied {m.version:04d}_{m.name}"))
+        print(f"{len(done)} migration(s) applied")
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# order_store.py
+
+# SQL Server accepts at most 2100 parameters per request
+MAX_PARAMETERS = 2100
+# ... and at most 1000 rows in one VALUES list
+MAX_VALUES_ROWS = 1000
+HEADER_PARAMETERS = 7
+
+# Header and set-based line processing; expects the lines in @lines
+_SAVE_ORDER_BODY = """
+DECLARE @OrderID int = ?;
+
+IF @OrderID IS NULL
+BEGIN
+    DECLARE @NewOrder TABLE (OrderID int);
+    INSERT INTO Orders (CustomerID, Status, TotalAmount)
+    OUTPUT inserted.OrderID INTO @NewOrder
+    VALUES (?, ?, ?);
+    SELECT @OrderID = OrderID FROM @NewOrder;
+END
+ELSE
+BEGIN
+    UPDATE Orders
+    SET CustomerID = ?, Status = ?, TotalAmount = ?
+    WHERE OrderID = @OrderID;
+
+    DELETE FROM OrderItems WHERE OrderID = @OrderID;
+END
+
+UPDATE p
+SET StockQuantity = p.StockQuantity - l.Quantity, LastUpdated = GETDATE()
+FROM Products p
+JOIN (SELECT ProductID, SUM(Quantity) AS Quantity
+      FROM {lines}
+      GROUP BY ProductID) l ON l.ProductID = p.ProductID;
+
+INSERT INTO OrderItems (OrderID, ProductID, Quantity, UnitPrice)
+SELECT @OrderID, ProductID, Quantity, UnitPrice
+FROM {lines};
+
+SELECT @OrderID AS OrderID;
+"""
+
+
+def _header_params(order_id, customer_id, status, total):
+    return [order_id, customer_id, status, total, customer_id, status, total]
+
+
+def _fetch_scalar(cursor):
+    # Skip row counts of statements that produced no result set
+    while cursor.description is None:
+        if not cursor.nextset():
+            raise RuntimeError("Batch did not return a result")
+    return int(cursor.fetchone()[0])
+
+
+def save_order_procedure(cursor, order_id, customer_id, status, total, lines):
+    """Save an order with one call to usp_SaveOrder, lines as a table-valued parameter"""
+    cursor.execute("{CALL usp_SaveOrder (?, ?, ?, ?, ?)}",
+                   (order_id, customer_id, status, total, [tuple(line) for line in lines]))
+    return _fetch_scalar(cursor)
+
+
+def save_order_batch(cursor, order_id, customer_id, status, total, lines):
+    """Save an order with a single parameterized T-SQL batch.
+
+    Lines go into a table variable through multi-row VALUES, so the header,
+    the stock decrement (one join-based UPDATE) and the line inserts (one
+    INSERT ... SELECT) travel in one round trip. Orders with too many lines
+    for the parameter limit load the lines into a temp table with
+    ``fast_executemany`` first, which costs one extra round trip.
+    """
+    lines = [tuple(line) for line in lines]
+    if len(lines) * 3 + HEADER_PARAMETERS > MAX_PARAMETERS:
+        return _save_order_temp_table(cursor, order_id, customer_id, status, total, lines)
+
+    statements = [
+        "SET NOCOUNT ON;",
+        "DECLARE @lines TABLE (ProductID int NOT NULL, Quantity int NOT NULL, UnitPrice float NOT NULL);"
+    ]
+    params = []
+    for start in range(0, len(lines), MAX_VALUES_ROWS):
+        chunk = lines[start:start + MAX_VALUES_ROWS]
+        values = ", ".join(["(?, ?, ?)"] * len(chunk))
+        statements.append(f"INSERT INTO @lines (ProductID, Quantity, UnitPrice) VALUES {values};")
+        for line in chunk:
+            params.extend(line)
+    statements.append(_SAVE_ORDER_BODY.format(lines="@lines"))
+    params.extend(_header_params(order_id, customer_id, status, total))
+
+    cursor.execute("\n".join(statements), params)
+    return _fetch_scalar(cursor)
+
+
+def _drop_temp_table(cursor, name):
+    """Drop a temp table if it exists, never raising.
+
+    Used in cleanup, where an error (e.g. from a broken connection) would
+    replace the one being propagated; the table goes away with the session.
+    """
+    try:
+        cursor.execute(f"IF OBJECT_ID('tempdb..{name}') IS NOT NULL DROP TABLE {name}")
+    except Exception:
+        pass
+
+
+def _save_order_temp_table(cursor, order_id, customer_id, status, total, lines):
+    cursor.execute("""
+        IF OBJECT_ID('tempdb..#order_lines') IS NOT NULL DROP TABLE #order_lines;
+        CREATE TABLE #order_lines (ProductID int NOT NULL, Quantity int NOT NULL, UnitPrice float NOT NULL);
+    """)
+    try:
+        cursor.fast_executemany = True
+        cursor.executemany(
+            "INSERT INTO #order_lines (ProductID, Quantity, UnitPrice) VALUES (?, ?, ?)", lines)
+        cursor.fast_executemany = False
+        cursor.execute("SET NOCOUNT ON;" + _SAVE_ORDER_BODY.format(lines="#order_lines"),
+                       _header_params(order_id, customer_id, status, total))
+        return _fetch_scalar(cursor)
+    finally:
+        _drop_temp_table(cursor, "#order_lines")
+
+
+def save_order(cursor, order_id, customer_id, status, total, lines, use_procedure=False):
+    """Insert or update an order with all its lines; returns the order ID.
+
+    ``order_id`` is None for a new order. ``lines`` are
+    ``(product_id, quantity, unit_price)`` tuples. The caller owns the
+    transaction.
+    """
+    if use_procedure:
+        return save_order_procedure(cursor, order_id, customer_id, status, total, lines)
+    return save_order_batch(cursor, order_id, customer_id, status, total, lines)
+
+
+# Orders deleted per statement; keeps row locks on OrderItems well below the
+# ~5000 locks at which SQL Server escalates to a table lock
+DELETE_CHUNK_SIZE = 1000
+
+# Stock is returned only for orders that were not soft-deleted before
+_RESTORE_STOCK_SQL = """
+SET NOCOUNT ON;
+DECLARE @FromID int = ?, @ToID int = ?;
+
+UPDATE p
+SET StockQuantity = p.StockQuantity + r.Quantity, LastUpdated = GETDATE()
+FROM Products p
+JOIN (SELECT oi.ProductID, SUM(oi.Quantity) AS Quantity
+      FROM OrderItems oi
+      JOIN #delete_orders d ON d.OrderID = oi.OrderID
+      JOIN Orders o ON o.OrderID = oi.OrderID
+      WHERE oi.OrderID BETWEEN @FromID AND @ToID AND ISNULL(o.IsDeleted, 0) = 0
+      GROUP BY oi.ProductID) r ON r.ProductID = p.ProductID;
+"""
+
+_DELETE_CHUNK_SQL = _RESTORE_STOCK_SQL + """
+DELETE oi
+FROM OrderItems oi
+JOIN #delete_orders d ON d.OrderID = oi.OrderID
+WHERE oi.OrderID BETWEEN @FromID AND @ToID;
+
+DELETE o
+FROM Orders o
+JOIN #delete_orders d ON d.OrderID = o.OrderID
+WHERE o.OrderID BETWEEN @FromID AND @ToID;
+
+SELECT @@ROWCOUNT;
+"""
+
+# Soft delete keeps the rows for the archive and only flags the orders
+_SOFT_DELETE_CHUNK_SQL = _RESTORE_STOCK_SQL + """
+UPDATE o
+SET IsDeleted = 1
+FROM Orders o
+JOIN #delete_orders d ON d.OrderID = o.OrderID
+WHERE o.OrderID BETWEEN @FromID AND @ToID AND ISNULL(o.IsDeleted, 0) = 0;
+
+SELECT @@ROWCOUNT;
+"""
+
+
+class BulkDeleteError(Exception):
+    """Raised when a bulk delete fails; earlier chunks stay committed"""
+
+    def __init__(self, message, orders_deleted):
+        super().__init__(message)
+        self.orders_deleted = orders_deleted
+
+
+def delete_orders(connection, order_ids, chunk_size=DELETE_CHUNK_SIZE, progress=None,
+                  soft=False, retry=None):
+    """Delete orders with their items and return the ordered stock.
+
+    The IDs are loaded into a temp table once; then every key range of
+    ``chunk_size`` orders is handled by one batch: a single aggregated
+    ``UPDATE Products ... FROM (SELECT ProductID, SUM(Quantity) ...)``
+    followed by range deletes of OrderItems and Orders. Each chunk is
+    committed on its own, so stock always matches the deleted orders and
+    locks are held only for one chunk. With ``soft`` the orders are only
+    flagged with IsDeleted and later moved to the archive.
+    ``progress(orders_done, total)`` is called after every commit.
+    ``retry(fn)``, when given, runs each chunk and may call it again after a
+    transient error such as a deadlock; a failed chunk is rolled back first.
+
+    Returns the number of deleted orders.
+    """
+    order_ids = sorted(set(int(order_id) for order_id in order_ids))
+    if not order_ids:
+        return 0
+
+    cursor = connection.cursor()
+    cursor.execute("""
+        IF OBJECT_ID('tempdb..#delete_orders') IS NOT NULL DROP TABLE #delete_orders;
+        CREATE TABLE #delete_orders (OrderID int PRIMARY KEY);
+    """)
+    cursor.fast_executemany = True
+    cursor.executemany("INSERT INTO #delete_orders (OrderID) VALUES (?)",
+                       [(order_id,) for order_id in order_ids])
+    cursor.fast_executemany = False
+    connection.commit()
+
+    sql = _SOFT_DELETE_CHUNK_SQL if soft else _DELETE_CHUNK_SQL
+
+    def run_chunk(first, last):
+        try:
+            cursor.execute(sql, (first, last))
+            count = _fetch_scalar(cursor)
+            connection.commit()
+            return count
+        except Exception:
+            connection.rollback()
+            raise
+
+    deleted = 0
+    try:
+        for start in range(0, len(order_ids), chunk_size):
+            chunk = order_ids[start:start + chunk_size]
+            try:
+                run = lambda: run_chunk(chunk[0], chunk[-1])
+                deleted += retry(run) if retry else run()
+            except Exception as e:
+                raise BulkDeleteError(
+                    f"Deleting orders {chunk[0]}-{chunk[-1]} failed after "
+                    f"{deleted} deleted orders: {e}", deleted) from e
+            if progress:
+                progress(deleted, len(order_ids))
+    finally:
+        _drop_temp_table(cursor, "#delete_orders")
+        try:
+            connection.commit()
+            cursor.close()
+        except Exception:
+            # Keep the original error and its deleted count
+            pass
+    return deleted
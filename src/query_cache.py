@@ -0,0 +1,139 @@
+# query_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_tag(table):
+    """Table names are case-insensitive in SQL Server, tags are too"""
+    return table.strip().strip('[]').lower()
+
+
+class QueryCache:
+    """LRU cache of query results with per-entry TTL and table tags.
+
+    Every entry records which tables the query reads. ``invalidate`` drops
+    all entries tagged with any of the given tables, so a write only has to
+    name the tables it touched. The cache is bounded both by the number of
+    entries and by the total number of cached rows.
+    """
+
+    def __init__(self, max_entries=256, max_rows=50000, default_ttl=60.0):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (rows, expires_at, tags)
+        self._tags = {}                # tag -> set of keys
+        self._rows = 0
+        # Bumped by every invalidation so results of reads that overlapped
+        # a write are not stored
+        self._version = 0
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0
+        }
+
+    @staticmethod
+    def make_key(sql, params):
+        return ' '.join(sql.split()), tuple(params or ())
+
+    def get(self, key):
+        """Return cached rows or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry[0]
+
+    @property
+    def version(self):
+        return self._version
+
+    def put(self, key, rows, tables, ttl=None, version=None):
+        """Store rows read from ``tables``.
+
+        ``version`` is the value of ``self.version`` taken before the query
+        ran; if anything was invalidated meanwhile the rows are not stored.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or len(rows) > self.max_rows:
+            return
+        tags = frozenset(normalize_tag(table) for table in tables)
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (rows, time.monotonic() + ttl, tags)
+            self._rows += len(rows)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            self._evict()
+
+    def invalidate(self, *tables):
+        """Drop every entry that reads any of ``tables``; return the count"""
+        removed = 0
+        with self._lock:
+            for table in tables:
+                for key in list(self._tags.get(normalize_tag(table), ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+            self._stats['invalidations'] += removed
+            self._version += 1
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._rows = 0
+
+    def configure(self, max_entries=None, max_rows=None, default_ttl=None):
+        """Change limits at runtime"""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_rows is not None:
+                self.max_rows = max_rows
+            if default_ttl is not None:
+                self.default_ttl = default_ttl
+            self._evict()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['rows'] = self._rows
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _remove(self, key):
+        rows, _, tags = self._entries.pop(key)
+        self._rows -= len(rows)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _evict(self):
+        # Least recently used entries are at the front
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self._rows > self.max_rows):
+            self._remove(next(iter(self._entries)))
+            self._stats['evictions'] += 1
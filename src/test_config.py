@@ -0,0 +1,113 @@
+# test_config.py
+import os
+
+import pytest
+
+from config import DEFAULT_ISOLATION_PROFILES, ConfigStore, parse_config
+
+MINIMAL_CONFIG = """
+[DATABASE]
+server = localhost
+database = eshop
+username = app
+password = secret
+driver = ODBC Driver 17 for SQL Server
+
+[TRANSACTION]
+default_isolation_level = READ COMMITTED
+
+[SETTINGS]
+connection_retries = 3
+connection_timeout = 30
+"""
+
+
+def write_config(path, text, mtime=None):
+    path.write_text(text, encoding='utf-8')
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / 'config.conf'
+    write_config(path, MINIMAL_CONFIG, mtime=1000)
+    return path
+
+
+def test_defaults(config_path):
+    snapshot = parse_config(str(config_path))
+    assert snapshot.connection_string == (
+        "DRIVER=ODBC Driver 17 for SQL Server;SERVER=localhost;DATABASE=eshop;UID=app;PWD=secret")
+    assert snapshot.pool_settings['max_size'] == 5
+    assert snapshot.archive_settings['statuses'] == ('delivered', 'cancelled')
+    assert snapshot.retry_settings['error_numbers'] == frozenset({1205, 1222, 3960})
+    assert dict(snapshot.isolation_profiles) == DEFAULT_ISOLATION_PROFILES
+
+
+def test_snapshot_is_read_only(config_path):
+    snapshot = parse_config(str(config_path))
+    with pytest.raises(TypeError):
+        snapshot.pool_settings['max_size'] = 50
+
+
+def test_isolation_profiles_override(config_path):
+    write_config(config_path, MINIMAL_CONFIG + """
+[ISOLATION_PROFILES]
+report =  snapshot
+custom_read = read   uncommitted
+""")
+    profiles = parse_config(str(config_path)).isolation_profiles
+    assert profiles['report'] == 'SNAPSHOT'
+    assert profiles['custom_read'] == 'READ UNCOMMITTED'
+    assert profiles['order_write'] == DEFAULT_ISOLATION_PROFILES['order_write']
+
+
+def test_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        parse_config(str(tmp_path / 'missing.conf'))
+
+
+def test_reload_on_mtime_change(config_path):
+    store = ConfigStore(str(config_path), check_interval=0)
+    changes = []
+    store.subscribe(lambda old, new: changes.append((old, new)))
+    first = store.get()
+    assert store.get() is first
+
+    write_config(config_path, MINIMAL_CONFIG + "\n[POOL]\nmax_size = 9\n", mtime=2000)
+    second = store.get()
+    assert second.pool_settings['max_size'] == 9
+    assert changes == [(first, second)]
+
+
+def test_mtime_checked_at_most_every_interval(config_path):
+    store = ConfigStore(str(config_path), check_interval=3600)
+    first = store.get()
+    write_config(config_path, MINIMAL_CONFIG + "\n[POOL]\nmax_size = 9\n", mtime=2000)
+    assert store.get() is first
+    assert store.check_for_changes()
+    assert store.get().pool_settings['max_size'] == 9
+
+
+def test_invalid_file_keeps_previous_snapshot(config_path):
+    store = ConfigStore(str(config_path), check_interval=0)
+    first = store.get()
+    write_config(config_path, "[DATABASE]\nserver = broken\n", mtime=2000)
+    assert store.get() is first
+
+
+def test_failing_subscriber_does_not_stop_others(config_path):
+    store = ConfigStore(str(config_path), check_interval=0)
+    store.get()
+    calls = []
+
+    def failing(old, new):
+        raise RuntimeError("subscriber bug")
+
+    store.subscribe(failing)
+    store.subscribe(lambda old, new: calls.append(new))
+    store.unsubscribe(failing)
+    store.subscribe(failing)
+    assert store.reload()
+    assert len(calls) == 1
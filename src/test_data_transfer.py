@@ -0,0 +1,100 @@
+# test_data_transfer.py
+import io
+
+import pytest
+
+from data_transfer import (JsonArrayExportWriter, XmlExportWriter, iter_json_array,
+                           iter_json_records, iter_xml_records)
+
+
+def records(text, chunk_size=64 * 1024):
+    return list(iter_json_records(io.StringIO(text), chunk_size))
+
+
+def test_json_array():
+    assert records('[{"Name": "a"}, {"Name": "b"}]') == [{'Name': 'a'}, {'Name': 'b'}]
+
+
+def test_json_empty_array():
+    assert records(' [ ] ') == []
+
+
+@pytest.mark.parametrize('text', ['[1,]', '[{"Name": "a"},]', '[{"Name": "a"}, \n ]'])
+def test_json_trailing_comma(text):
+    with pytest.raises(ValueError, match="Trailing comma"):
+        records(text)
+
+
+@pytest.mark.parametrize('text', ['[,1]', '[1,,2]', '[1 2]', '[1, 2'])
+def test_json_malformed(text):
+    with pytest.raises(ValueError):
+        records(text)
+
+
+def test_json_value_split_across_chunks():
+    # With 4-character chunks every value spans a chunk boundary
+    text = '[{"Name": "long name", "Price": 12345.678}, 1234567, "text"]'
+    assert records(text, chunk_size=4) == [
+        {'Name': 'long name', 'Price': 12345.678}, 1234567, 'text']
+
+
+def test_json_number_ending_at_chunk_boundary():
+    # "[12" fills the first chunk exactly; the number continues in the next one
+    assert list(iter_json_array(io.StringIO('345]'), '[12', chunk_size=3)) == [12345]
+
+
+def test_ndjson_records():
+    assert records('{"Name": "a"}\n\n{"Name": "b"}\n') == [{'Name': 'a'}, {'Name': 'b'}]
+
+
+def test_ndjson_invalid_line():
+    with pytest.raises(ValueError, match="line 2"):
+        records('{"Name": "a"}\n{"Name": \n')
+
+
+PRODUCTS_XML = """<?xml version="1.0" encoding="utf-8"?>
+<products>
+  <product>
+    <CategoryID>1</CategoryID><Name>Mouse</Name><Price>199.9</Price>
+    <StockQuantity>5</StockQuantity><Status>available</Status>
+  </product>
+  <product>
+    <Name>No category</Name>
+    <Details><product><Name>nested, not a record</Name></product></Details>
+  </product>
+</products>
+"""
+
+
+def test_xml_records():
+    parsed = list(iter_xml_records(io.BytesIO(PRODUCTS_XML.encode('utf-8')), 'products'))
+    assert parsed == [
+        {'CategoryID': '1', 'Name': 'Mouse', 'Price': '199.9',
+         'StockQuantity': '5', 'Status': 'available'},
+        {'CategoryID': None, 'Name': 'No category', 'Price': None,
+         'StockQuantity': None, 'Status': None}]
+
+
+def test_xml_export_round_trip(tmp_path):
+    path = tmp_path / 'categories.xml'
+    # export_table writes through a text file
+    with open(path, 'w', encoding='utf-8') as file:
+        writer = XmlExportWriter(file, 'categories')
+        writer.write(('Books', 'Paper & ink', True))
+        writer.write(('Toys', None, False))
+        writer.close()
+    parsed = list(iter_xml_records(str(path), 'categories'))
+    assert parsed == [
+        {'Name': 'Books', 'Description': 'Paper & ink', 'IsActive': 'True'},
+        {'Name': 'Toys', 'Description': None, 'IsActive': 'False'}]
+
+
+def test_json_export_round_trip():
+    file = io.StringIO()
+    writer = JsonArrayExportWriter(file, 'categories')
+    writer.write(('Books', 'Paper', True))
+    writer.write(('Toys', 'Wood', False))
+    writer.close()
+    assert records(file.getvalue(), chunk_size=8) == [
+        {'Name': 'Books', 'Description': 'Paper', 'IsActive': True},
+        {'Name': 'Toys', 'Description': 'Wood', 'IsActive': False}]
@@ -0,0 +1,276 @@
+# test_indexes.py
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+import pyodbc
+import pytest
+
+# ODBC connection string of a test database with realistic data volumes.
+# Deliberately not taken from config.conf, which points at the live server.
+CONNECTION_ENV = 'ESHOP_TEST_CONNECTION'
+LOGIN_TIMEOUT = 5
+
+SHOWPLAN_NS = {'p': 'http://schemas.microsoft.com/sqlserver/2004/07/showplan'}
+SCAN_OPERATORS = {'Table Scan', 'Index Scan', 'Clustered Index Scan'}
+
+# Queries issued by the application with sample literals instead of parameters
+# (SHOWPLAN_XML compiles the batch without running it). "seek" lists the
+# tables that must be read by an index seek; "index" an index the plan must use.
+# Run against realistic data volumes - on a few rows a scan is legitimately cheaper.
+QUERIES = [
+    {
+        'name': "CategoriesTab.delete_category - products in category",
+        'sql': "SELECT COUNT(*) FROM Products WHERE CategoryID = 1",
+        'seek': ['Products'],
+        'index': 'ix_products_categoryid'
+    },
+    {
+        'name': "ProductsTab.delete_product - order items of product",
+        'sql': "SELECT CASE WHEN EXISTS (SELECT 1 FROM OrderItems WHERE ProductID = 1) THEN 1 END",
+        'seek': ['OrderItems'],
+        'index': 'ix_orderitems_productid'
+    },
+    {
+        'name': "ProductsTab.delete_product - archived order items of product",
+        'sql': "SELECT CASE WHEN EXISTS (SELECT 1 FROM OrderItemsArchive WHERE ProductID = 1) THEN 1 END",
+        'seek': ['OrderItemsArchive'],
+        'index': 'ix_orderitemsarchive_productid'
+    },
+    {
+        'name': "OrderItemDialog.load_products",
+        'sql': """
+            SELECT ProductID, Name, Price
+            FROM Products
+            WHERE Status = 'available' AND StockQuantity > 0
+        """,
+        'seek': ['Products'],
+        'index': 'ix_products_status_stock'
+    },
+    {
+        'name': "ProductsTab.fetch_page",
+        'sql': """
+            SELECT p.ProductID, c.Name, p.Name, p.Price, p.StockQuantity, p.Status, p.LastUpdated
+            FROM Products p
+            JOIN Categories c ON p.CategoryID = c.CategoryID
+            WHERE p.ProductID > 1000
+            ORDER BY p.ProductID
+            OFFSET 0 ROWS FETCH NEXT 500 ROWS ONLY
+        """,
+        'seek': ['Products']
+    },
+    {
+        'name': "ProductsTab.fetch_changes - changed products",
+        'sql': """
+            SELECT p.ProductID, c.Name, p.Name, p.Price, p.StockQuantity, p.Status, p.LastUpdated
+            FROM Products p
+            JOIN Categories c ON p.CategoryID = c.CategoryID
+            WHERE p.LastUpdated > DATEADD(minute, -5, GETDATE())
+        """,
+        'seek': ['Products'],
+        'index': 'ix_products_lastupdated'
+    },
+    {
+        'name': "ProductsTab.fetch_changes - tombstones",
+        'sql': """
+            SELECT ProductID, DeletedAt
+            FROM ProductTombstones
+            WHERE DeletedAt > DATEADD(minute, -5, GETDATE())
+        """,
+        'seek': ['ProductTombstones'],
+        'index': 'ix_producttombstones_deletedat'
+    },
+    {
+        'name': "OrdersTab - first page",
+        'sql': """
+            SELECT TOP (101) o.OrderID, CONCAT(c.FirstName, ' ', c.LastName), o.OrderDate,
+                   o.TotalAmount, o.Status
+            FROM Orders o
+            JOIN Customers c ON o.CustomerID = c.CustomerID
+            WHERE o.IsDeleted = 0
+            ORDER BY o.OrderDate DESC, o.OrderID DESC
+        """,
+        # An ordered scan stopped by TOP reads only one page of the index
+        'seek': ['Customers'],
+        'index': 'ix_orders_orderdate'
+    },
+    {
+        'name': "OrdersTab - next page",
+        'sql': """
+            SELECT TOP (101) o.OrderID, CONCAT(c.FirstName, ' ', c.LastName), o.OrderDate,
+                   o.TotalAmount, o.Status
+            FROM Orders o
+            JOIN Customers c ON o.CustomerID = c.CustomerID
+            WHERE o.IsDeleted = 0
+              AND (o.OrderDate < '20240101' OR (o.OrderDate = '20240101' AND o.OrderID < 1000))
+            ORDER BY o.OrderDate DESC, o.OrderID DESC
+        """,
+        'seek': ['Orders', 'Customers'],
+        'index': 'ix_orders_orderdate'
+    },
+    {
+        'name': "OrdersTab - previous page",
+        'sql': """
+            SELECT TOP (101) o.OrderID, CONCAT(c.FirstName, ' ', c.LastName), o.OrderDate,
+                   o.TotalAmount, o.Status
+            FROM Orders o
+            JOIN Customers c ON o.CustomerID = c.CustomerID
+            WHERE o.IsDeleted = 0
+              AND (o.OrderDate > '20240101' OR (o.OrderDate = '20240101' AND o.OrderID > 1000))
+            ORDER BY o.OrderDate ASC, o.OrderID ASC
+        """,
+        # The DESC index read backward
+        'seek': ['Orders', 'Customers'],
+        'index': 'ix_orders_orderdate'
+    },
+    {
+        'name': "OrdersTab - date range filter",
+        'sql': """
+            SELECT TOP (101) o.OrderID, CONCAT(c.FirstName, ' ', c.LastName), o.OrderDate,
+                   o.TotalAmount, o.Status
+            FROM Orders o
+            JOIN Customers c ON o.CustomerID = c.CustomerID
+            WHERE o.OrderDate >= '20240101' AND o.OrderDate < '20240201' AND o.IsDeleted = 0
+            ORDER BY o.OrderDate DESC, o.OrderID DESC
+        """,
+        'seek': ['Orders', 'Customers'],
+        'index': 'ix_orders_orderdate'
+    },
+    {
+        'name': "OrdersTab - status filter",
+        'sql': """
+            SELECT TOP (101) o.OrderID, CONCAT(c.FirstName, ' ', c.LastName), o.OrderDate,
+                   o.TotalAmount, o.Status
+            FROM Orders o
+            JOIN Customers c ON o.CustomerID = c.CustomerID
+            WHERE o.Status = 'pending' AND o.IsDeleted = 0
+            ORDER BY o.OrderDate DESC, o.OrderID DESC
+        """,
+        'seek': ['Orders', 'Customers'],
+        'index': 'ix_orders_status_orderdate'
+    },
+    {
+        'name': "OrdersTab - customer filter",
+        'sql': """
+            SELECT TOP (101) o.OrderID, CONCAT(c.FirstName, ' ', c.LastName), o.OrderDate,
+                   o.TotalAmount, o.Status
+            FROM Orders o
+            JOIN Customers c ON o.CustomerID = c.CustomerID
+            WHERE o.CustomerID = 1 AND o.IsDeleted = 0
+            ORDER BY o.OrderDate DESC, o.OrderID DESC
+        """,
+        'seek': ['Orders', 'Customers'],
+        'index': 'ix_orders_customer_orderdate'
+    },
+    {
+        'name': "OrderDialog / delete - order items of order",
+        'sql': "SELECT ProductID, Quantity FROM OrderItems WHERE OrderID = 1",
+        'seek': ['OrderItems']
+    },
+    {
+        'name': "ProductDialog.load_product_data",
+        'sql': """
+            SELECT p.Name, c.Name, p.Price, p.StockQuantity, p.Status
+            FROM Products p
+            JOIN Categories c ON p.CategoryID = c.CategoryID
+            WHERE p.ProductID = 1
+        """,
+        'seek': ['Products', 'Categories']
+    },
+    {
+        'name': "CategoryDialog.load_category_data",
+        'sql': "SELECT Name, Description, IsActive FROM Categories WHERE CategoryID = 1",
+        'seek': ['Categories']
+    }
+]
+
+
+def get_plan(cursor, sql):
+    """Return the estimated plan of ``sql`` as an XML element"""
+    cursor.execute("SET SHOWPLAN_XML ON")
+    try:
+        cursor.execute(sql)
+        plan = cursor.fetchone()[0]
+    finally:
+        cursor.execute("SET SHOWPLAN_XML OFF")
+    return ET.fromstring(plan)
+
+
+def plan_accesses(plan):
+    """Yield (operator, table, index) for every table access in the plan"""
+    for relop in plan.iter(f"{{{SHOWPLAN_NS['p']}}}RelOp"):
+        operator = relop.get('PhysicalOp')
+        # The accessed object is on the operator's own element, not on nested RelOps
+        for child in relop:
+            obj = child.find('p:Object', SHOWPLAN_NS)
+            if obj is not None:
+                table = obj.get('Table', '').strip('[]')
+                index = obj.get('Index', '').strip('[]')
+                yield operator, table, index
+                break
+
+
+def check_query(cursor, query):
+    """Return a list of problems found in the plan of one query"""
+    accesses = list(plan_accesses(get_plan(cursor, query['sql'])))
+    problems = []
+    for table in query.get('seek', []):
+        table_accesses = [a for a in accesses if a[1].lower() == table.lower()]
+        if not table_accesses:
+            problems.append(f"{table} not found in plan")
+        for operator, _, index in table_accesses:
+            if operator in SCAN_OPERATORS:
+                problems.append(f"{operator} on {table} ({index or 'heap'})")
+    expected_index = query.get('index')
+    if expected_index and not any(a[2].lower() == expected_index.lower() for a in accesses):
+        used = ', '.join(sorted({a[2] for a in accesses if a[2]})) or 'none'
+        problems.append(f"index {expected_index} not used (used: {used})")
+    return problems
+
+
+def check_all(cursor):
+    """Return [(query name, problems)] for every query in QUERIES"""
+    return [(query['name'], check_query(cursor, query)) for query in QUERIES]
+
+
+@pytest.fixture
+def cursor():
+    connection_string = os.environ.get(CONNECTION_ENV)
+    if not connection_string:
+        pytest.skip(f"{CONNECTION_ENV} is not set")
+    try:
+        connection = pyodbc.connect(connection_string, timeout=LOGIN_TIMEOUT)
+    except pyodbc.Error as e:
+        pytest.skip(f"Test database unreachable: {e}")
+    cursor = connection.cursor()
+    yield cursor
+    cursor.close()
+    connection.close()
+
+
+def test_index_usage(cursor):
+    """Check that every application query is answered by index seeks"""
+    failures = [(name, problems) for name, problems in check_all(cursor) if problems]
+    assert not failures, "Queries without the expected seeks:\n" + "\n".join(
+        f"{name}: {'; '.join(problems)}" for name, problems in failures)
+
+
+if __name__ == "__main__":
+    print("Index Usage Test Starting...")
+    print("=" * 50)
+    if not os.environ.get(CONNECTION_ENV):
+        sys.exit(f"Set {CONNECTION_ENV} to the connection string of a test database")
+    connection = pyodbc.connect(os.environ[CONNECTION_ENV], timeout=LOGIN_TIMEOUT)
+    try:
+        results = check_all(connection.cursor())
+    finally:
+        connection.close()
+    for name, problems in results:
+        print(f"{'FAIL' if problems else 'OK  '}  {name}")
+        for problem in problems:
+            print(f"      - {problem}")
+    failures = sum(1 for _, problems in results if problems)
+    print(f"\n{len(QUERIES) - failures} of {len(QUERIES)} queries use seeks")
+    print("=" * 50)
+    print("Test Complete")
+    sys.exit(1 if failures else 0)
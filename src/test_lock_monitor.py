@@ -0,0 +1,97 @@
+# test_lock_monitor.py
+import pytest
+
+pytest.importorskip('pyodbc')
+
+from lock_monitor import build_chains, parse_deadlocks
+
+
+def edge(waiter, blocker, wait_ms=100):
+    return (waiter, blocker, 'LCK_M_X', wait_ms, 'KEY: 5:1 (abc)')
+
+
+def layout(chains):
+    return [(depth, session_id) for depth, session_id, _ in chains]
+
+
+def test_no_blocking():
+    assert build_chains([]) == []
+
+
+def test_chain_from_head_blocker():
+    chains = build_chains([edge(3, 2), edge(2, 1)])
+    assert layout(chains) == [(0, 1), (1, 2), (2, 3)]
+    assert chains[0][2] is None
+    assert chains[1][2] == edge(2, 1)
+
+
+def test_waiters_ordered_by_wait_time():
+    chains = build_chains([edge(2, 1, wait_ms=10), edge(3, 1, wait_ms=500)])
+    assert layout(chains) == [(0, 1), (1, 3), (1, 2)]
+
+
+def test_cycle_only():
+    assert layout(build_chains([edge(2, 1), edge(1, 2)])) == [(0, 1), (1, 2), (2, 1)]
+
+
+def test_cycle_alongside_chain():
+    chains = build_chains([edge(2, 1), edge(4, 3), edge(3, 4)])
+    assert layout(chains) == [(0, 1), (1, 2), (0, 3), (1, 4), (2, 3)]
+
+
+def test_waiter_on_cycle():
+    chains = build_chains([edge(5, 3), edge(4, 3), edge(3, 4)])
+    sessions = {session_id for _, session_id, _ in chains}
+    assert sessions == {3, 4, 5}
+
+
+DEADLOCK_XML = """
+<RingBufferTarget>
+  <event name="xml_deadlock_report" timestamp="2024-05-01T10:00:00.000Z">
+    <data name="xml_report"><value>
+      <deadlock>
+        <victim-list><victimProcess id="process1"/></victim-list>
+        <process-list>
+          <process id="process1" spid="51" waitresource="KEY: 5:1 (aa)">
+            <inputbuf> UPDATE Products SET StockQuantity = 1 </inputbuf>
+          </process>
+          <process id="process2" spid="52" waitresource="KEY: 5:2 (bb)">
+            <inputbuf>DELETE FROM Orders</inputbuf>
+          </process>
+        </process-list>
+        <resource-list>
+          <keylock objectname="boska.dbo.Products"/>
+          <keylock objectname="boska.dbo.Orders"/>
+        </resource-list>
+      </deadlock>
+    </value></data>
+  </event>
+  <event name="xml_deadlock_report" timestamp="2024-05-02T10:00:00.000Z">
+    <data name="xml_report"><value>
+      <deadlock>
+        <victim-list/>
+        <process-list/>
+      </deadlock>
+    </value></data>
+  </event>
+  <event name="wait_info" timestamp="2024-05-03T10:00:00.000Z"/>
+</RingBufferTarget>
+"""
+
+
+def test_parse_deadlocks():
+    deadlocks = parse_deadlocks(DEADLOCK_XML)
+    assert [deadlock['timestamp'] for deadlock in deadlocks] == [
+        "2024-05-02T10:00:00.000Z", "2024-05-01T10:00:00.000Z"]
+    deadlock = deadlocks[1]
+    assert deadlock['victims'] == ['51']
+    assert deadlock['processes'] == [
+        ('51', 'KEY: 5:1 (aa)', 'UPDATE Products SET StockQuantity = 1'),
+        ('52', 'KEY: 5:2 (bb)', 'DELETE FROM Orders')]
+    assert deadlock['objects'] == ['boska.dbo.Orders', 'boska.dbo.Products']
+    assert deadlocks[0]['objects'] == []
+
+
+def test_parse_deadlocks_limit_and_empty():
+    assert parse_deadlocks(None) == []
+    assert len(parse_deadlocks(DEADLOCK_XML, limit=1)) == 1
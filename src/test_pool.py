@@ -0,0 +1,189 @@
+# test_pool.py
+import threading
+
+import pytest
+
+pyodbc = pytest.importorskip('pyodbc')
+
+from database import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    """Connection double: ``alive = False`` makes pings and rollbacks fail"""
+
+    def __init__(self, number):
+        self.number = number
+        self.alive = True
+        self.closed = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        if not self.alive:
+            raise pyodbc.Error('08S01', 'Communication link failure')
+        return self
+
+    def execute(self, sql, *params):
+        return self
+
+    def fetchone(self):
+        return (1,)
+
+    def rollback(self):
+        if not self.alive:
+            raise pyodbc.Error('08S01', 'Communication link failure')
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class Factory:
+    def __init__(self):
+        self.created = []
+
+    def __call__(self):
+        connection = FakeConnection(len(self.created) + 1)
+        self.created.append(connection)
+        return connection
+
+
+@pytest.fixture
+def factory():
+    return Factory()
+
+
+def make_pool(factory, **settings):
+    settings.setdefault('min_size', 1)
+    settings.setdefault('max_size', 2)
+    settings.setdefault('checkout_timeout', 0.2)
+    pool = ConnectionPool(factory, **settings)
+    pool.open()
+    return pool
+
+
+def test_open_creates_min_size(factory):
+    pool = make_pool(factory, min_size=2, max_size=3)
+    assert len(factory.created) == 2
+    assert pool.get_stats()['idle'] == 2
+
+
+def test_checkin_rolls_back_and_reuses(factory):
+    pool = make_pool(factory)
+    with pool.connection() as connection:
+        pass
+    assert connection.rollbacks == 1
+    with pool.connection() as again:
+        assert again is connection
+    assert len(factory.created) == 1
+
+
+def test_nested_connection_is_reentrant(factory):
+    pool = make_pool(factory, max_size=1)
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+        assert pool.get_stats()['in_use'] == 1
+    assert pool.get_stats()['in_use'] == 0
+
+
+def test_checkout_timeout(factory):
+    pool = make_pool(factory, max_size=1)
+    held = pool.checkout()
+    errors = []
+
+    def other_thread():
+        try:
+            pool.checkout(timeout=0.05)
+        except PoolTimeout as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    thread.join()
+    assert len(errors) == 1
+    assert pool.get_stats()['timeouts'] == 1
+    pool.checkin(held)
+
+
+def test_waiting_checkout_gets_returned_connection(factory):
+    pool = make_pool(factory, max_size=1)
+    held = pool.checkout()
+    result = []
+    thread = threading.Thread(target=lambda: result.append(pool.checkout(timeout=2)))
+    thread.start()
+    pool.checkin(held)
+    thread.join()
+    assert result == [held]
+
+
+def test_dead_connection_evicted_on_checkout(factory):
+    pool = make_pool(factory, validation_interval=0)
+    dead = factory.created[0]
+    dead.alive = False
+    connection = pool.checkout()
+    assert connection is not dead
+    assert dead.closed
+    stats = pool.get_stats()
+    assert stats['failed_pings'] == 1
+    assert stats['size'] == 1
+
+
+def test_broken_connection_discarded_on_checkin(factory):
+    pool = make_pool(factory)
+    with pytest.raises(pyodbc.Error):
+        with pool.connection() as connection:
+            connection.alive = False
+            raise pyodbc.Error('08S01', 'Communication link failure')
+    assert connection.closed
+    assert pool.get_stats()['size'] == 0
+
+
+def test_ping_idle_replaces_dead(factory):
+    pool = make_pool(factory, min_size=2, max_size=3)
+    factory.created[0].alive = False
+    assert pool.ping_idle() == 1
+    assert pool.get_stats()['idle'] == 2
+    assert len(factory.created) == 3
+
+
+def test_evict_idle_keeps_min_size(factory):
+    pool = make_pool(factory, min_size=1, max_size=3, idle_timeout=0)
+    first, second = pool.checkout(), pool.checkout()
+    pool.checkin(first)
+    pool.checkin(second)
+    assert pool.get_stats()['size'] == 1
+
+
+def test_recycle_closes_connections_in_use_on_checkin(factory):
+    pool = make_pool(factory)
+    connection = pool.checkout()
+    pool.recycle()
+    pool.checkin(connection)
+    assert connection.closed
+    assert pool.checkout() is not connection
+
+
+def test_configure_shrinks_pool(factory):
+    pool = make_pool(factory, min_size=2, max_size=3)
+    pool.configure(min_size=1, max_size=1)
+    assert pool.get_stats()['size'] == 1
+    with pytest.raises(ValueError):
+        pool.configure(min_size=2, max_size=1)
+
+
+def test_closed_pool_refuses_checkout(factory):
+    pool = make_pool(factory)
+    pool.close()
+    assert factory.created[0].closed
+    with pytest.raises(PoolTimeout):
+        pool.checkout()
+
+
+def test_failed_create_releases_slot(factory):
+    def failing():
+        raise pyodbc.Error('08001', 'Server not found')
+
+    pool = ConnectionPool(failing, min_size=0, max_size=1, checkout_timeout=0.1)
+    with pytest.raises(pyodbc.Error):
+        pool.checkout()
+    assert pool.get_stats()['size'] == 0
@@ -0,0 +1,109 @@
+# test_query_cache.py
+import pytest
+
+import query_cache
+from query_cache import QueryCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(query_cache.time, 'monotonic', clock)
+    return clock
+
+
+def key(n):
+    return QueryCache.make_key(f"SELECT {n}", ())
+
+
+def test_make_key_ignores_whitespace():
+    assert (QueryCache.make_key("SELECT  *\n FROM Products WHERE ID = ?", [1])
+            == QueryCache.make_key("SELECT * FROM Products WHERE ID = ?", (1,)))
+
+
+def test_hit_and_miss(clock):
+    cache = QueryCache()
+    assert cache.get(key(1)) is None
+    cache.put(key(1), [(1,)], ['Products'])
+    assert cache.get(key(1)) == [(1,)]
+    stats = cache.get_stats()
+    assert (stats['hits'], stats['misses'], stats['hit_ratio']) == (1, 1, 0.5)
+
+
+def test_lru_eviction_by_entries(clock):
+    cache = QueryCache(max_entries=2)
+    cache.put(key(1), [(1,)], ['A'])
+    cache.put(key(2), [(2,)], ['A'])
+    cache.get(key(1))  # 2 is now least recently used
+    cache.put(key(3), [(3,)], ['A'])
+    assert cache.get(key(2)) is None
+    assert cache.get(key(1)) == [(1,)]
+    assert cache.get(key(3)) == [(3,)]
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_eviction_by_rows(clock):
+    cache = QueryCache(max_rows=3)
+    cache.put(key(1), [(1,), (2,)], ['A'])
+    cache.put(key(2), [(3,), (4,)], ['A'])
+    assert cache.get(key(1)) is None
+    assert cache.get_stats()['rows'] == 2
+
+
+def test_result_larger_than_limit_not_stored(clock):
+    cache = QueryCache(max_rows=1)
+    cache.put(key(1), [(1,), (2,)], ['A'])
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_ttl_expiry(clock):
+    cache = QueryCache(default_ttl=10)
+    cache.put(key(1), [(1,)], ['A'])
+    cache.put(key(2), [(2,)], ['A'], ttl=60)
+    clock.now += 30
+    assert cache.get(key(1)) is None
+    assert cache.get(key(2)) == [(2,)]
+    assert cache.get_stats()['expirations'] == 1
+
+
+def test_zero_ttl_not_stored(clock):
+    cache = QueryCache()
+    cache.put(key(1), [(1,)], ['A'], ttl=0)
+    assert cache.get(key(1)) is None
+
+
+def test_invalidate_by_tag(clock):
+    cache = QueryCache()
+    cache.put(key(1), [(1,)], ['Products', 'Categories'])
+    cache.put(key(2), [(2,)], ['Orders'])
+    assert cache.invalidate('[categories]') == 1
+    assert cache.get(key(1)) is None
+    assert cache.get(key(2)) == [(2,)]
+    assert cache.invalidate('Categories') == 0
+
+
+def test_read_overlapping_invalidation_not_stored(clock):
+    cache = QueryCache()
+    version = cache.version
+    cache.invalidate('Products')
+    cache.put(key(1), [(1,)], ['Products'], version=version)
+    assert cache.get(key(1)) is None
+    cache.put(key(1), [(1,)], ['Products'], version=cache.version)
+    assert cache.get(key(1)) == [(1,)]
+
+
+def test_configure_shrinks(clock):
+    cache = QueryCache()
+    for n in range(5):
+        cache.put(key(n), [(n,)], ['A'])
+    cache.configure(max_entries=2)
+    assert cache.get_stats()['entries'] == 2
+    assert cache.get(key(4)) == [(4,)]
@@ -0,0 +1,143 @@
+# test_tracing.py
+import pytest
+
+import tracing
+from tracing import (HISTOGRAM_BOUNDS_MS, StatementStats, Tracer, TracingConnection,
+                     normalize_sql, untraced)
+
+
+class FakeCursor:
+    """Stand-in for a pyodbc cursor returning fixed rows"""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.rowcount = -1
+        self.executed = []
+        self.closed = False
+        self.exited = None
+
+    def execute(self, sql, *params):
+        self.executed.append((sql, params))
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self.executed.append((sql, seq_of_params))
+        self.rowcount = len(seq_of_params)
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        self.closed = True
+
+    def __exit__(self, *exc_info):
+        self.exited = exc_info
+        return None
+
+
+class FakeConnection:
+    def __init__(self, rows=()):
+        self.cursors = []
+        self.rows = rows
+
+    def cursor(self):
+        cursor = FakeCursor(self.rows)
+        self.cursors.append(cursor)
+        return cursor
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    return Tracer(slow_threshold_ms=10000, slow_log=str(tmp_path / 'slow.log'))
+
+
+@pytest.mark.parametrize('sql, expected', [
+    ("SELECT * FROM Products WHERE ProductID = 42", "SELECT * FROM Products WHERE ProductID = ?"),
+    ("SELECT * FROM Products WHERE Name = N'it''s'", "SELECT * FROM Products WHERE Name = ?"),
+    ("DELETE FROM Orders WHERE OrderID IN (?, ?,?)", "DELETE FROM Orders WHERE OrderID IN (?, ...)"),
+    ("SELECT\n  Price * 1.5\nFROM   Products", "SELECT Price * ? FROM Products"),
+    ("SELECT Col1 FROM #tmp2 WHERE @p1 = -3", "SELECT Col1 FROM #tmp2 WHERE @p1 = ?"),
+])
+def test_normalize_sql(sql, expected):
+    assert normalize_sql(sql) == expected
+
+
+def stats_with(milliseconds):
+    stats = StatementStats("SELECT ?")
+    for ms in milliseconds:
+        stats.add(tracing.StatementRecord(0, "SELECT ?", 0, ms / 1000, 0.0, 1, None, None))
+    return stats
+
+
+def test_percentile_bucket_bounds():
+    stats = stats_with([0.5] * 98 + [30, 30])
+    assert stats.percentile(0.5) == 1
+    assert stats.percentile(0.99) == 50
+    assert stats.as_dict()['max_ms'] == pytest.approx(30)
+
+
+def test_percentile_past_last_bound():
+    stats = stats_with([HISTOGRAM_BOUNDS_MS[-1] + 1])
+    assert stats.percentile(0.5) is None
+
+
+def test_percentile_empty():
+    assert StatementStats("SELECT ?").percentile(0.5) is None
+
+
+def test_cursor_records_fetch_on_next_statement(tracer):
+    connection = TracingConnection(FakeConnection(rows=[(1,), (2,)]), tracer)
+    cursor = connection.cursor()
+    cursor.execute("SELECT * FROM Products WHERE ProductID > 10")
+    assert cursor.fetchall() == [(1,), (2,)]
+    assert tracer.recent() == []
+    cursor.close()
+    [record] = tracer.recent()
+    assert record.sql == "SELECT * FROM Products WHERE ProductID > ?"
+    assert record.rows == 2
+
+
+def test_cursor_records_action(tracer):
+    connection = TracingConnection(FakeConnection(), tracer)
+    with tracing.action("Produkty: Smazat produkt"):
+        connection.cursor().execute("DELETE FROM Products WHERE ProductID = ?", 1).close()
+    connection.cursor().execute("SELECT 1").close()
+    assert [record.action for record in tracer.recent()] == [None, "Produkty: Smazat produkt"]
+
+
+def test_cursor_context_manager(tracer):
+    raw = FakeConnection()
+    connection = TracingConnection(raw, tracer)
+    with connection.cursor() as cursor:
+        cursor.execute("UPDATE Products SET Price = 1")
+    assert raw.cursors[0].exited == (None, None, None)
+    assert not raw.cursors[0].closed
+    assert len(tracer.recent()) == 1
+
+
+def test_untraced(tracer):
+    raw = FakeConnection()
+    connection = TracingConnection(raw, tracer)
+    assert untraced(connection) is raw
+    assert untraced(raw) is raw
+    untraced(connection).cursor().execute("SELECT 1")
+    assert tracer.recent() == []
+
+
+def test_disabled_tracer_does_not_wrap(tmp_path):
+    tracer = Tracer(enabled=False, slow_log=str(tmp_path / 'slow.log'))
+    raw = FakeConnection()
+    assert tracer.wrap(raw) is raw
+
+
+def test_top_sorted_by_total(tracer):
+    tracer.record("SELECT 1", 0, 0.001, 0.0, 1)
+    tracer.record("SELECT * FROM Products", 0, 0.5, 0.0, 1)
+    tracer.record("SELECT 2", 0, 0.001, 0.0, 1)
+    top = tracer.top(2)
+    assert [item['sql'] for item in top] == ["SELECT * FROM Products", "SELECT ?"]
+    assert top[1]['count'] == 2
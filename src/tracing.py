@@ -0,0 +1,348 @@
+# tracing.py
+import bisect
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+
+# Upper bounds of the latency histogram buckets in milliseconds; the last
+# bucket takes everything slower
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+StatementRecord = namedtuple('StatementRecord', [
+    'started',          # time.time() when execute was called
+    'sql',              # normalized statement text
+    'params',           # number of parameters (rows * columns for executemany)
+    'execute_seconds',
+    'fetch_seconds',
+    'rows',             # rows fetched, or rows affected when nothing was fetched
+    'action',           # UI action that triggered the statement
+    'error'             # error text if execute failed
+])
+
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w@#])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+# UI action that statements of the current thread are attributed to
+_local = threading.local()
+
+
+def current_action():
+    return getattr(_local, 'action', None)
+
+
+@contextmanager
+def action(name):
+    """Attribute statements of this thread inside the block to ``name``"""
+    previous = current_action()
+    _local.action = name
+    try:
+        yield
+    finally:
+        _local.action = previous
+
+
+def normalize_sql(sql):
+    """Statement text with literals replaced by ? and whitespace collapsed.
+
+    Statements that differ only in constants or in the length of an IN
+    list map to the same text, so their timings are aggregated together.
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('?, ...', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class StatementStats:
+    """Aggregated timings of one normalized statement"""
+
+    __slots__ = ('sql', 'count', 'errors', 'total_seconds', 'max_seconds',
+                 'rows', 'buckets', 'last_action')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        self.last_action = None
+
+    def add(self, record):
+        seconds = record.execute_seconds + record.fetch_seconds
+        self.count += 1
+        self.errors += 1 if record.error else 0
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.rows += record.rows or 0
+        self.buckets[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, seconds * 1000)] += 1
+        self.last_action = record.action
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the bucket holding the given percentile, None if past the last bound"""
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return HISTOGRAM_BOUNDS_MS[index] if index < len(HISTOGRAM_BOUNDS_MS) else None
+        return None
+
+    def as_dict(self):
+        return {
+            'sql': self.sql,
+            'count': self.count,
+            'errors': self.errors,
+            'total_ms': self.total_seconds * 1000,
+            'avg_ms': self.total_seconds * 1000 / self.count if self.count else 0.0,
+            'max_ms': self.max_seconds * 1000,
+            'p50_ms': self.percentile(0.5),
+            'p99_ms': self.percentile(0.99),
+            'rows': self.rows,
+            'buckets': list(self.buckets),
+            'last_action': self.last_action
+        }
+
+
+class Tracer:
+    """Collects StatementRecords from tracing cursors.
+
+    Keeps the last ``buffer_size`` records in a ring buffer, aggregates
+    per-statement statistics and writes statements slower than
+    ``slow_threshold_ms`` to a rotating log file. Safe to use from any
+    thread; each record carries the thread's ``current_action()``.
+    """
+
+    def __init__(self, enabled=True, buffer_size=5000, slow_threshold_ms=500,
+                 slow_log='slow_queries.log', slow_log_max_bytes=1048576, slow_log_backups=3):
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=buffer_size)
+        self._stats = {}
+        self._logger = logging.getLogger('eshop.slow_queries')
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._handler = None
+        self.configure(enabled, buffer_size, slow_threshold_ms, slow_log,
+                       slow_log_max_bytes, slow_log_backups)
+
+    def configure(self, enabled=None, buffer_size=None, slow_threshold_ms=None,
+                  slow_log=None, slow_log_max_bytes=None, slow_log_backups=None):
+        """Apply changed settings; the slow log is reopened only if its file changed"""
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if buffer_size is not None and buffer_size != self._records.maxlen:
+                self._records = deque(self._records, maxlen=buffer_size)
+            if slow_threshold_ms is not None:
+                self.slow_threshold = slow_threshold_ms / 1000
+            if slow_log is not None:
+                path = slow_log if os.path.isabs(slow_log) else os.path.join(
+                    os.path.dirname(os.path.abspath(__file__)), slow_log)
+                max_bytes = slow_log_max_bytes or 1048576
+                backups = 3 if slow_log_backups is None else slow_log_backups
+                handler = self._handler
+                if (handler is None or handler.baseFilename != path
+                        or handler.maxBytes != max_bytes or handler.backupCount != backups):
+                    if handler is not None:
+                        self._logger.removeHandler(handler)
+                        handler.close()
+                    # delay: the file is created with the first slow statement
+                    self._handler = RotatingFileHandler(path, maxBytes=max_bytes,
+                                                        backupCount=backups,
+                                                        encoding='utf-8', delay=True)
+                    self._handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+                    self._logger.addHandler(self._handler)
+
+    def record(self, sql, params, execute_seconds, fetch_seconds, rows, error=None,
+               started=None):
+        if not self.enabled:
+            return None
+        if started is None:
+            started = time.time() - execute_seconds - fetch_seconds
+        record = StatementRecord(started, normalize_sql(sql), params, execute_seconds,
+                                 fetch_seconds, rows, current_action(), error)
+        with self._lock:
+            self._records.append(record)
+            stats = self._stats.get(record.sql)
+            if stats is None:
+                stats = self._stats[record.sql] = StatementStats(record.sql)
+            stats.add(record)
+            slow = execute_seconds + fetch_seconds >= self.slow_threshold
+        if slow:
+            self._logger.info(
+                "%.1f ms (execute %.1f, fetch %.1f) rows=%s params=%d action=%s%s | %s",
+                (execute_seconds + fetch_seconds) * 1000, execute_seconds * 1000,
+                fetch_seconds * 1000, rows, params, record.action or '-',
+                f" error={error}" if error else '', record.sql)
+        return record
+
+    def recent(self, limit=None):
+        """Most recent records, newest first"""
+        with self._lock:
+            records = list(self._records)
+        records.reverse()
+        return records[:limit] if limit else records
+
+    def top(self, limit=20, key='total_ms'):
+        """Per-statement statistics sorted by ``key`` (total_ms, avg_ms, max_ms, count)"""
+        with self._lock:
+            stats = [item.as_dict() for item in self._stats.values()]
+        stats.sort(key=lambda item: item[key], reverse=True)
+        return stats[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._records.clear()
+            self._stats.clear()
+
+    def wrap(self, connection):
+        """TracingConnection around ``connection``, or the connection itself when disabled"""
+        return TracingConnection(connection, self) if self.enabled else connection
+
+
+class TracingCursor:
+    """pyodbc cursor proxy that times execute and fetch calls.
+
+    A statement is recorded when the next statement starts or the cursor
+    is closed, so its fetch time and row count are complete.
+    """
+
+    def __init__(self, cursor, tracer):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_tracer', tracer)
+        object.__setattr__(self, '_pending', None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # e.g. fast_executemany belongs to the real cursor
+        setattr(self._cursor, name, value)
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def _flush(self):
+        pending = self._pending
+        if pending is not None:
+            object.__setattr__(self, '_pending', None)
+            rows = pending['rows'] if pending['fetched'] else pending['rowcount']
+            self._tracer.record(pending['sql'], pending['params'], pending['execute'],
+                                pending['fetch'], rows, started=pending['started'])
+
+    def _run(self, method, sql, params, param_count):
+        self._flush()
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            method(sql, *params)
+        except Exception as e:
+            self._tracer.record(sql, param_count, time.perf_counter() - started, 0.0, 0, str(e))
+            raise
+        object.__setattr__(self, '_pending', {
+            'started': started_at,
+            'sql': sql,
+            'params': param_count,
+            'execute': time.perf_counter() - started,
+            'fetch': 0.0,
+            'rows': 0,
+            'fetched': False,
+            'rowcount': max(self._cursor.rowcount, 0)
+        })
+        return self
+
+    def execute(self, sql, *params):
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            count = len(params[0])
+        else:
+            count = len(params)
+        return self._run(self._cursor.execute, sql, params, count)
+
+    def executemany(self, sql, seq_of_params):
+        seq_of_params = list(seq_of_params)
+        count = sum(len(params) for params in seq_of_params)
+        return self._run(self._cursor.executemany, sql, (seq_of_params,), count)
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        pending = self._pending
+        if pending is not None:
+            pending['fetch'] += time.perf_counter() - started
+            pending['fetched'] = True
+            if isinstance(result, list):
+                pending['rows'] += len(result)
+            elif result is not None:
+                pending['rows'] += 1
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+    def fetchval(self):
+        return self._fetch(self._cursor.fetchval)
+
+    def close(self):
+        self._flush()
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        # Like pyodbc: commit unless the block raised (with autocommit off)
+        # and keep the cursor open
+        self._flush()
+        return self._cursor.__exit__(*exc_info)
+
+    def __del__(self):
+        # Cursors dropped without close() still get their last statement recorded
+        try:
+            self._flush()
+        except Exception:
+            pass
+
+
+class TracingConnection:
+    """pyodbc connection proxy whose cursors are TracingCursors"""
+
+    def __init__(self, connection, tracer):
+        object.__setattr__(self, '_connection', connection)
+        object.__setattr__(self, '_tracer', tracer)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._connection, name, value)
+
+    def cursor(self):
+        return TracingCursor(self._connection.cursor(), self._tracer)
+
+    def execute(self, sql, *params):
+        return self.cursor().execute(sql, *params)
+
+
+def untraced(connection):
+    """The connection without tracing, for housekeeping statements such as pings"""
+    if isinstance(connection, TracingConnection):
+        return connection._connection
+    return connection
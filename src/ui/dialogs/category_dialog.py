@@ -2,6 +2,7 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                            QLineEdit, QCheckBox, QPushButton, QMessageBox,
                            QTextEdit)
+from ui.errors import show_write_error
 
 class CategoryDialog(QDialog):
     def __init__(self, db, category=None, parent=None):
@@ -43,13 +44,16 @@ class CategoryDialog(QDialog):
         layout.addLayout(btn_layout)
 
     def load_category_data(self):
-        cursor = self.db.connection.cursor()
-        cursor.execute("""
-            SELECT Name, Description, IsActive 
-            FROM Categories 
-            WHERE CategoryID = ?
-        """, (self.category,))
-        data = cursor.fetchone()
+        def read(connection):
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT Name, Description, IsActive 
+                FROM Categories 
+                WHERE CategoryID = ?
+            """, (self.category,))
+            return cursor.fetchone()
+
+        data = self.db.run_read(read)
         
         if data:
             self.name_edit.setText(data[0])
@@ -64,28 +68,22 @@ class CategoryDialog(QDialog):
             description = self.description_edit.toPlainText()
             is_active = self.active_check.isChecked()
 
-            cursor = self.db.connection.cursor()
-            
-            # Začátek transakce
-            cursor.execute("BEGIN TRANSACTION")
-            
-            if self.category:  # Úprava existující kategorie
-                cursor.execute("""
-                    UPDATE Categories 
-                    SET Name = ?, Description = ?, IsActive = ?
-                    WHERE CategoryID = ?
-                """, (name, description, is_active, self.category))
-            else:  # Nová kategorie
-                cursor.execute("""
-                    INSERT INTO Categories (Name, Description, IsActive)
-                    VALUES (?, ?, ?)
-                """, (name, description, is_active))
-            
-            # Potvrzení transakce
-            self.db.connection.commit()
+            def write(cursor):
+                if self.category:  # Úprava existující kategorie
+                    cursor.execute("""
+                        UPDATE Categories 
+                        SET Name = ?, Description = ?, IsActive = ?
+                        WHERE CategoryID = ?
+                    """, (name, description, is_active, self.category))
+                else:  # Nová kategorie
+                    cursor.execute("""
+                        INSERT INTO Categories (Name, Description, IsActive)
+                        VALUES (?, ?, ?)
+                    """, (name, description, is_active))
+
+            self.db.run_in_transaction('save_category', write, profile='catalog_write',
+                                       tables=('Categories',))
             self.accept()
             
         except Exception as e:
-            # Rollback v případě chyby
-            self.db.connection.rollback()
-            QMessageBox.critical(self, "Chyba", f"Nelze uložit kategorii: {str(e)}")
\ No newline at end of file
+            show_write_error(self, "Nelze uložit kategorii", e)
\ No newline at end of file
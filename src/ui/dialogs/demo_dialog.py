@@ -28,4 +28,50 @@ class DemoDialog(QDialog):
         layout.addWidget(close_btn)
 
     def add_log(self, message):
-        self.log.append(message)
\ No newline at end of file
+        self.log.append(message)
+
+    def show_result(self, result, explanation):
+        """Vypíše časovou osu běhu z anomaly_runner a vyhodnocení"""
+        self.isolation_label.setText(
+            f"Izolační úroveň session A: {result['level']} (session B zapisuje s výchozí úrovní)")
+        self.add_log("Časová osa:")
+        for event in result['events']:
+            self.add_log(f"{event.at * 1000:8.1f} ms  [{event.session}]  {self.describe(event)}")
+
+        self.add_log("")
+        self.add_log(f"První čtení:  {result['first'][0]}, množství {result['first'][1]}")
+        self.add_log(f"Druhé čtení:  {result['second'][0]}, množství {result['second'][1]}")
+        if result['writer_wait'] is not None:
+            self.add_log(f"Zápis session B trval {result['writer_wait'] * 1000:.0f} ms"
+                         + (" (čekal na zámek)" if result['writer_blocked'] else ""))
+        self.add_log("-" * 30)
+        self.add_log('❌ Došlo k Non-repeatable read!' if result['anomaly']
+                     else '✅ Data zůstala konzistentní')
+        self.add_log("")
+        self.add_log(" ".join(explanation.split()))
+
+    @staticmethod
+    def describe(event):
+        """Text jednoho kroku časové osy"""
+        if event.kind == 'read':
+            return f"čtení: množství {event.value}"
+        if event.kind == 'write_start':
+            return f"UPDATE StockQuantity + {event.value} odeslán"
+        if event.kind == 'write_done':
+            return f"UPDATE dokončen za {event.detail * 1000:.0f} ms"
+        if event.kind == 'blocked':
+            if event.detail is None:
+                return "UPDATE čeká (stav čekání nelze zjistit bez VIEW SERVER STATE)"
+            wait_type, blocking = event.detail
+            return f"UPDATE čeká {event.value} ms na zámek ({wait_type}), blokuje session {blocking}"
+        if event.kind == 'write_timeout':
+            return "UPDATE vypršel časový limit zámku (1222)"
+        if event.kind == 'write_error':
+            return f"UPDATE selhal: {event.detail}"
+        if event.kind == 'commit':
+            return "COMMIT"
+        if event.kind == 'rollback':
+            return "ROLLBACK"
+        if event.kind == 'restore':
+            return f"vrácení množství ({event.value:+d}) a COMMIT"
+        return event.kind
\ No newline at end of file
@@ -3,6 +3,8 @@ from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
                            QComboBox, QPushButton, QMessageBox, QTableWidget,
                            QTableWidgetItem, QSpinBox)
 from PyQt6.QtCore import Qt
+from order_store import save_order
+from ui.errors import show_write_error
 
 class OrderDialog(QDialog):
     def __init__(self, db, order=None, parent=None):
@@ -66,12 +68,10 @@ class OrderDialog(QDialog):
 
     def load_customers(self):
         try:
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
+            customers = self.db.fetch_cached("""
                 SELECT CustomerID, FirstName + ' ' + LastName as FullName 
                 FROM Customers
-            """)
-            customers = cursor.fetchall()
+            """, tables=['Customers'])
             self.customer_combo.clear()
             self.customers = {name: id for id, name in customers}
             self.customer_combo.addItems(self.customers.keys())
@@ -140,60 +140,28 @@ class OrderDialog(QDialog):
             status = self.status_combo.currentText()
             total = float(self.total_label.text().split(":")[1].replace(" Kč", "").strip())
 
-            cursor = self.db.connection.cursor()
-            
-            # Začátek transakce
-            cursor.execute("BEGIN TRANSACTION")
-
-            try:
-                if self.order:  # Úprava existující objednávky
-                    # Update hlavičky objednávky
-                    cursor.execute("""
-                        UPDATE Orders 
-                        SET CustomerID = ?, Status = ?, TotalAmount = ?
-                        WHERE OrderID = ?
-                    """, (customer_id, status, total, self.order))
-                    
-                    # Smazání starých položek
-                    cursor.execute("DELETE FROM OrderItems WHERE OrderID = ?", (self.order,))
-                else:  # Nová objednávka
-                    # Vložení hlavičky objednávky
-                    cursor.execute("""
-                        INSERT INTO Orders (CustomerID, Status, TotalAmount)
-                        VALUES (?, ?, ?)
-                    """, (customer_id, status, total))
-                    self.order = cursor.execute("SELECT @@IDENTITY").fetchone()[0]
-
-                # Vložení nových položek
-                for row in range(self.items_table.rowCount()):
-                    product_id = int(self.items_table.item(row, 0).text())
-                    quantity = self.items_table.cellWidget(row, 3).value()
-                    price = float(self.items_table.item(row, 2).text().replace(" Kč", ""))
-                    
-                    # Aktualizace množství produktu na skladě
-                    cursor.execute("""
-                        UPDATE Products 
-                        SET StockQuantity = StockQuantity - ?
-                        WHERE ProductID = ?
-                    """, (quantity, product_id))
-                    
-                    # Vložení položky objednávky
-                    cursor.execute("""
-                        INSERT INTO OrderItems (OrderID, ProductID, Quantity, UnitPrice)
-                        VALUES (?, ?, ?, ?)
-                    """, (self.order, product_id, quantity, price))
-
-                # Potvrzení transakce
-                self.db.connection.commit()
-                self.accept()
-                
-            except Exception as e:
-                # Rollback v případě jakékoliv chyby při zpracování
-                self.db.connection.rollback()
-                raise e  # Propagujeme chybu do vnějšího try-except bloku
+            # Položky se posílají najednou, server je zpracuje množinově
+            lines = []
+            for row in range(self.items_table.rowCount()):
+                product_id = int(self.items_table.item(row, 0).text())
+                quantity = self.items_table.cellWidget(row, 3).value()
+                price = float(self.items_table.item(row, 2).text().replace(" Kč", ""))
+                lines.append((product_id, quantity, price))
+            use_procedure = self.db.config.get_order_settings()['save_mode'] == 'procedure'
+
+            # Hlavička, odečtení skladu a vložení položek v jednom volání a jedné
+            # transakci; při deadlocku se celá transakce zopakuje
+            order_id = self.db.run_in_transaction(
+                'save_order',
+                lambda cursor: save_order(cursor, self.order, customer_id, status, total,
+                                          lines, use_procedure=use_procedure),
+                profile='order_write', tables=('Orders', 'OrderItems', 'Products'))
+
+            self.order = order_id
+            self.accept()
                 
         except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Nelze uložit objednávku: {str(e)}")
+            show_write_error(self, "Nelze uložit objednávku", e)
 
 class OrderItemDialog(QDialog):
     def __init__(self, db, parent=None):
@@ -224,13 +192,11 @@ class OrderItemDialog(QDialog):
 
     def load_products(self):
         try:
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
+            self.products = self.db.fetch_cached("""
                 SELECT ProductID, Name, Price 
                 FROM Products 
                 WHERE Status = 'available' AND StockQuantity > 0
-            """)
-            self.products = cursor.fetchall()
+            """, tables=['Products'])
             self.product_combo.clear()
             self.product_combo.addItems([f"{p[1]} ({p[2]:.2f} Kč)" for p in self.products])
         except Exception as e:
@@ -2,6 +2,7 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                            QLineEdit, QComboBox, QPushButton, QMessageBox,
                            QSpinBox, QDoubleSpinBox)
+from ui.errors import show_write_error
 
 class ProductDialog(QDialog):
     def __init__(self, db, product=None, parent=None):
@@ -60,9 +61,9 @@ class ProductDialog(QDialog):
 
     def load_categories(self):
         try:
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT CategoryID, Name FROM Categories WHERE IsActive = 1")
-            categories = cursor.fetchall()
+            categories = self.db.fetch_cached(
+                "SELECT CategoryID, Name FROM Categories WHERE IsActive = 1",
+                tables=['Categories'])
             self.category_combo.clear()
             self.categories = {name: id for id, name in categories}
             self.category_combo.addItems(self.categories.keys())
@@ -70,14 +71,17 @@ class ProductDialog(QDialog):
             QMessageBox.critical(self, "Chyba", f"Nelze načíst kategorie: {str(e)}")
 
     def load_product_data(self):
-        cursor = self.db.connection.cursor()
-        cursor.execute("""
-            SELECT p.Name, c.Name, p.Price, p.StockQuantity, p.Status
-            FROM Products p
-            JOIN Categories c ON p.CategoryID = c.CategoryID
-            WHERE p.ProductID = ?
-        """, (self.product,))
-        data = cursor.fetchone()
+        def read(connection):
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT p.Name, c.Name, p.Price, p.StockQuantity, p.Status
+                FROM Products p
+                JOIN Categories c ON p.CategoryID = c.CategoryID
+                WHERE p.ProductID = ?
+            """, (self.product,))
+            return cursor.fetchone()
+
+        data = self.db.run_read(read)
         
         if data:
             self.name_edit.setText(data[0])
@@ -96,29 +100,24 @@ class ProductDialog(QDialog):
             quantity = self.quantity_spin.value()
             status = self.status_combo.currentText()
 
-            cursor = self.db.connection.cursor()
-            
-            # Začátek transakce
-            cursor.execute("BEGIN TRANSACTION")
-            
-            if self.product:  # Úprava existujícího produktu
-                cursor.execute("""
-                    UPDATE Products 
-                    SET Name = ?, CategoryID = ?, Price = ?, 
-                        StockQuantity = ?, Status = ?, LastUpdated = GETDATE()
-                    WHERE ProductID = ?
-                """, (name, category_id, price, quantity, status, self.product))
-            else:  # Nový produkt
-                cursor.execute("""
-                    INSERT INTO Products (Name, CategoryID, Price, StockQuantity, Status)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (name, category_id, price, quantity, status))
-            
-            # Potvrzení transakce
-            self.db.connection.commit()
+            def write(cursor):
+                if self.product:  # Úprava existujícího produktu
+                    cursor.execute("""
+                        UPDATE Products 
+                        SET Name = ?, CategoryID = ?, Price = ?, 
+                            StockQuantity = ?, Status = ?, LastUpdated = GETDATE()
+                        WHERE ProductID = ?
+                    """, (name, category_id, price, quantity, status, self.product))
+                else:  # Nový produkt
+                    cursor.execute("""
+                        INSERT INTO Products (Name, CategoryID, Price, StockQuantity, Status)
+                        VALUES (?, ?, ?, ?, ?)
+                    """, (name, category_id, price, quantity, status))
+
+            # Mění stav skladu - profil inventory_adjust, při deadlocku se opakuje
+            self.db.run_in_transaction('save_product', write, profile='inventory_adjust',
+                                       tables=('Products',))
             self.accept()
             
         except Exception as e:
-            # Rollback v případě chyby
-            self.db.connection.rollback()
-            QMessageBox.critical(self, "Chyba", f"Nelze uložit produkt: {str(e)}")
\ No newline at end of file
+            show_write_error(self, "Nelze uložit produkt", e)
\ No newline at end of file
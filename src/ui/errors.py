@@ -0,0 +1,23 @@
+# ui/errors.py
+from PyQt6.QtWidgets import QMessageBox
+from database import RetryableConnectionError, is_connection_error, is_snapshot_conflict
+
+SNAPSHOT_CONFLICT_TEXT = (
+    "Záznam mezitím změnila jiná transakce (konflikt SNAPSHOT izolace).\n\n"
+    "Vaše změny byly vráceny zpět. Načtěte aktuální data a operaci opakujte."
+)
+
+CONNECTION_LOST_TEXT = (
+    "Spojení s databází bylo přerušeno a transakce nebyla potvrzena.\n\n"
+    "Po obnovení spojení operaci opakujte."
+)
+
+
+def show_write_error(parent, message, error):
+    """Zobrazí chybu zápisu; konflikt snapshotu a výpadek spojení jako varování s návodem"""
+    if is_snapshot_conflict(error):
+        QMessageBox.warning(parent, "Konflikt při zápisu", f"{message}\n\n{SNAPSHOT_CONFLICT_TEXT}")
+    elif isinstance(error, RetryableConnectionError) or is_connection_error(error):
+        QMessageBox.warning(parent, "Výpadek spojení", f"{message}\n\n{CONNECTION_LOST_TEXT}")
+    else:
+        QMessageBox.critical(parent, "Chyba", f"{message}: {str(error)}")
@@ -1,33 +1,141 @@
 # ui/main_window.py
 
+import time
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QTabWidget, 
                            QVBoxLayout, QStatusBar, QMessageBox,
-                           QPushButton)
+                           QPushButton, QLabel, QApplication)
+from PyQt6.QtCore import QThreadPool, QTimer
+import tracing
+from .workers import WorkerSignals, run_in_background
 from .tabs.products_tab import ProductsTab
 from .tabs.categories_tab import CategoriesTab
 from .tabs.orders_tab import OrdersTab
 from .tabs.settings_tab import SettingsTab
+from .tabs.monitor_tab import MonitorTab
+from .tabs.tracing_tab import TracingTab, ActionTracker
+from .watchdog import StallWatchdog
 from .styles.styles import Styles
 
 class MainWindow(QMainWindow):
     def __init__(self, db):
         super().__init__()
         self.db = db
+        self.pending_loads = set()
+        self.load_started = None
+
+        # Dotazy čekají hlavně na síť, vláken může být víc než jader CPU
+        # (pool ještě neexistuje, velikost bereme z konfigurace)
+        pool_size = self.db.config.get_pool_settings()['max_size']
+        thread_pool = QThreadPool.globalInstance()
+        thread_pool.setMaxThreadCount(max(thread_pool.maxThreadCount(), pool_size))
         
         # Nejdřív vytvoříme status bar
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Připraven")
+        # Trvalý ukazatel stavu spojení (keepalive běží v Database na pozadí)
+        self.connection_label = QLabel()
+        self.status_bar.addPermanentWidget(self.connection_label)
+        # Počet a nejdelší zaseknutí GUI vlákna (watchdog)
+        self.stall_label = QLabel()
+        self.status_bar.addPermanentWidget(self.stall_label)
         
         # Pak aplikujeme styly
         self.apply_styles()
         
         # Nakonec inicializujeme UI
         self.init_ui()
+
+        # Kliknutí na tlačítko určí akci, ke které se připíšou následné SQL příkazy
+        self.action_tracker = ActionTracker(self.tabs)
+        QApplication.instance().installEventFilter(self.action_tracker)
+        
+        # Změny config.conf se projeví bez restartu (pool, connection string)
+        self.config_timer = QTimer(self)
+        self.config_timer.timeout.connect(self.db.config.store.check_for_changes)
+        self.config_timer.start(2000)
+
+        # Jen čte stav zjištěný keepalivem, na databázi nesahá
+        self.health_timer = QTimer(self)
+        self.health_timer.timeout.connect(self.update_connection_label)
+        self.health_timer.start(2000)
+
+        # Hlídá, kdy GUI vlákno nezpracovává události ("Neodpovídá")
+        self.watchdog_settings = self.db.config.get_watchdog_settings()
+        self.watchdog = StallWatchdog(self.watchdog_settings['heartbeat_ms'],
+                                      self.watchdog_settings['threshold_ms'], self)
+        self.watchdog.stall_detected.connect(self.on_stall)
+        if self.watchdog_settings['enabled']:
+            self.watchdog.start()
         
-        # Teprve po inicializaci UI můžeme načíst data
+        # Okno se zobrazí hned, připojení běží na pozadí a data se načtou
+        # až po navázání prvního spojení
+        self.connect_database()
+
+    def connect_database(self):
+        """Naváže spojení s databází mimo GUI vlákno"""
+        self.tabs.setEnabled(False)
+        self.status_bar.showMessage("Připojování k databázi...")
+        # Signály drží okno, aby žily po celou dobu připojování
+        self.connect_signals = WorkerSignals()
+        self.connect_signals.progress.connect(self.on_connect_attempt)
+        report = self.connect_signals.progress.emit
+        run_in_background(
+            None,
+            lambda: self.db.connect(on_attempt=lambda *args: report(args)),
+            self.on_connected,
+            self.on_connect_failed
+        )
+
+    def on_connect_attempt(self, attempt_info):
+        """Zobrazí neúspěšný pokus o připojení (volá se v GUI vlákně)"""
+        attempt, retries, error, delay = attempt_info
+        self.status_bar.showMessage(
+            f"Pokus o připojení {attempt}/{retries} selhal, "
+            f"další za {delay:.1f} s...")
+
+    def update_connection_label(self):
+        """Zobrazí stav spojení podle posledního keepalivu nebo dotazu"""
+        health = self.db.get_health()
+        if health['last_check'] is None:
+            self.connection_label.setText("DB: připojování")
+        elif health['connected']:
+            self.connection_label.setText("DB: připojeno")
+            self.connection_label.setToolTip("")
+        else:
+            self.connection_label.setText("DB: spojení přerušeno")
+            self.connection_label.setToolTip(health['last_error'] or "")
+
+    def on_stall(self, stall):
+        """Zobrazí souhrn zaseknutí GUI; tooltip ukáže nejhorší místa volání"""
+        summary = self.watchdog.summary()
+        self.stall_label.setText(
+            f"GUI zaseknuto: {summary['stalls']}× (max {summary['max_ms']:.0f} ms)")
+        self.stall_label.setToolTip("\n".join(
+            f"{entry['site']}: {entry['count']}×, celkem {entry['total_ms']:.0f} ms, "
+            f"max {entry['max_ms']:.0f} ms" for entry in summary['sites'][:10]))
+
+    def on_connected(self, connected):
+        """Po navázání spojení povolí záložky a spustí načítání dat"""
+        if not connected:
+            self.on_connect_failed("Nepodařilo se připojit k databázi")
+            return
+        self.tabs.setEnabled(True)
         self.load_all_data()
 
+    def on_connect_failed(self, message):
+        """Nabídne opakování připojení nebo ukončení aplikace"""
+        self.status_bar.showMessage("Nepřipojeno k databázi")
+        answer = QMessageBox.critical(
+            self, "Chyba",
+            f"{message}\n\nZkusit se připojit znovu?",
+            QMessageBox.StandardButton.Retry | QMessageBox.StandardButton.Close
+        )
+        if answer == QMessageBox.StandardButton.Retry:
+            self.connect_database()
+        else:
+            self.close()
+
     def apply_styles(self):
         """Aplikuje styly na hlavní okno"""
         self.setStyleSheet(Styles.get_main_window_style())
@@ -51,9 +159,12 @@ class MainWindow(QMainWindow):
         self.categories_tab = CategoriesTab(self.db, self)  
         self.orders_tab = OrdersTab(self.db, self)
         self.settings_tab = SettingsTab(self.db, self)
+        self.monitor_tab = MonitorTab(self.db, self)
+        self.tracing_tab = TracingTab(self.db, self)
         
         # Aplikace stylů na tabulky a tlačítka
-        for tab in [self.products_tab, self.categories_tab, self.orders_tab]:
+        for tab in [self.products_tab, self.categories_tab, self.orders_tab, self.monitor_tab,
+                    self.tracing_tab]:
             if hasattr(tab, 'table'):
                 tab.table.setStyleSheet(Styles.get_table_style())
             for button in tab.findChildren(QPushButton):
@@ -64,21 +175,40 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.categories_tab, "Kategorie")
         self.tabs.addTab(self.orders_tab, "Objednávky")
         self.tabs.addTab(self.settings_tab, "Nastavení")
+        self.tabs.addTab(self.monitor_tab, "Monitor zámků")
+        self.tabs.addTab(self.tracing_tab, "Trasování")
         
         # Přidání TabWidget do hlavního layoutu
         layout.addWidget(self.tabs)
 
     def load_all_data(self):
-        """Načte data do všech tabulek"""
-        try:
-            if self.products_tab.load_data():
-                self.status_bar.showMessage("Produkty načteny")
-            if self.categories_tab.load_data():
-                self.status_bar.showMessage("Kategorie načteny")
-            if self.orders_tab.load_data():
-                self.status_bar.showMessage("Objednávky načteny")
-        except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Chyba při načítání dat: {str(e)}")
+        """Načte data do všech tabulek paralelně na pozadí"""
+        self.load_started = time.monotonic()
+        self.status_bar.showMessage("Načítání dat...")
+        # Workery převezmou akci platnou v okamžiku svého vytvoření
+        with tracing.action("Načtení dat"):
+            for tab in [self.products_tab, self.categories_tab, self.orders_tab]:
+                self.pending_loads.add(tab)
+                tab.load_data_async()
+
+    def tab_load_finished(self, tab, success):
+        """Zavolá záložka po dokončení načítání na pozadí"""
+        if tab not in self.pending_loads:
+            # Samostatné obnovení záložky po úpravě - zprávu nastavil ten, kdo ho spustil
+            return
+        messages = {
+            self.products_tab: "Produkty načteny",
+            self.categories_tab: "Kategorie načteny",
+            self.orders_tab: "Objednávky načteny"
+        }
+        if success:
+            self.status_bar.showMessage(messages[tab])
+
+        self.pending_loads.discard(tab)
+        if not self.pending_loads and self.load_started is not None:
+            elapsed = time.monotonic() - self.load_started
+            self.load_started = None
+            self.status_bar.showMessage(f"Data načtena za {elapsed:.2f} s")
 
     def refresh_data(self):
         """Obnoví data ve všech tabulkách"""
@@ -87,9 +217,15 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Handler pro zavření aplikace"""
         try:
-            if self.db.connection:
-                self.db.connection.close()
-                self.status_bar.showMessage("Databázové spojení ukončeno")
+            self.health_timer.stop()
+            self.monitor_tab.stop()
+            self.tracing_tab.timer.stop()
+            if self.watchdog_settings['enabled']:
+                self.watchdog.stop()
+                self.watchdog.write_report(self.watchdog_settings['report'])
+            # Zastaví keepalive a zavře pool
+            self.db.disconnect()
+            self.status_bar.showMessage("Databázové spojení ukončeno")
         except Exception as e:
             QMessageBox.warning(self, "Varování", 
                               f"Problém při ukončování databázového spojení: {str(e)}")
@@ -0,0 +1,157 @@
+# ui/models/products_model.py
+import bisect
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class ProductsTableModel(QAbstractTableModel):
+    """Model produktů načítaných po stránkách podle ProductID.
+
+    Řádky se dočítají po dávkách přes ``fetchMore`` až ve chvíli, kdy je
+    pohled potřebuje (scrollování), takže paměť roste jen s tím, co uživatel
+    skutečně viděl. Každou dávku načte ``request_more(after_id)`` jako
+    samostatný keyset dotaz (typicky na pozadí) a výsledek předá do
+    ``append_page`` - mezi dávkami model nedrží spojení ani kurzor.
+    """
+
+    HEADERS = ['ID', 'Kategorie', 'Název', 'Cena', 'Množství', 'Status']
+    PRICE_COLUMN = 3
+
+    def __init__(self, chunk_size=500, request_more=None, parent=None):
+        super().__init__(parent)
+        self.chunk_size = chunk_size
+        self.request_more = request_more
+        self._rows = []
+        self._index = {}  # ProductID -> číslo řádku
+        self._page_key = None  # ProductID posledního řádku poslední dávky
+        self._has_more = False
+        self._fetching = False
+
+    def set_first_page(self, rows):
+        """Nastaví první dávku řádků seřazených podle ProductID"""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self._rebuild_index()
+        self._page_key = rows[-1][0] if rows else None
+        self._has_more = len(rows) >= self.chunk_size
+        # Odpověď na dřívější fetchMore se zahodí (viz append_page)
+        self._fetching = False
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._has_more and not self._fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self.canFetchMore() or self.request_more is None:
+            return
+        self._fetching = True
+        self.request_more(self._page_key)
+
+    def append_page(self, page):
+        """Přidá dávku ``(after_id, rows)`` načtenou pro ``request_more(after_id)``"""
+        after_id, rows = page
+        if not self._fetching or after_id != self._page_key:
+            # Mezitím se model znovu načetl
+            return
+        self._fetching = False
+        self._has_more = len(rows) >= self.chunk_size
+        if rows:
+            self._page_key = rows[-1][0]
+
+        # Řádky, které už přidala přírůstková obnova, nepřidáváme podruhé
+        rows = [row for row in rows if row[0] not in self._index]
+        if not rows:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for offset, row in enumerate(rows):
+            self._index[row[0]] = first + offset
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def fetch_failed(self):
+        """Dávku se nepodařilo načíst; další pokus až při příštím scrollování"""
+        self._fetching = False
+
+    def _rebuild_index(self):
+        self._index = {row[0]: number for number, row in enumerate(self._rows)}
+
+    def apply_changes(self, changed_rows, deleted_ids):
+        """Zapracuje změněné a smazané produkty podle ProductID.
+
+        Nové řádky se vkládají na místo podle ProductID, aby seznam zůstal
+        seřazený jako dávky. Řádky za poslední načtenou dávkou se přeskočí,
+        přinese je až další dávka.
+
+        Vrací dvojici (počet změněných/přidaných, počet odebraných) řádků.
+        """
+        changed = 0
+        last_column = self.columnCount() - 1
+        new_rows = []
+        for row in changed_rows:
+            number = self._index.get(row[0])
+            if number is not None:
+                self._rows[number] = row
+                self.dataChanged.emit(self.index(number, 0), self.index(number, last_column))
+                changed += 1
+            elif not self._has_more or (self._page_key is not None and row[0] < self._page_key):
+                new_rows.append(row)
+
+        removed = 0
+        for number in sorted((self._index[product_id] for product_id in deleted_ids
+                              if product_id in self._index), reverse=True):
+            self.beginRemoveRows(QModelIndex(), number, number)
+            del self._rows[number]
+            self.endRemoveRows()
+            removed += 1
+
+        ids = [row[0] for row in self._rows]
+        for row in sorted(new_rows):
+            number = bisect.bisect_left(ids, row[0])
+            self.beginInsertRows(QModelIndex(), number, number)
+            self._rows.insert(number, row)
+            ids.insert(number, row[0])
+            self.endInsertRows()
+            changed += 1
+
+        if removed or new_rows:
+            self._rebuild_index()
+        return changed, removed
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            value = self._rows[index.row()][index.column()]
+            if index.column() == self.PRICE_COLUMN:  # cena
+                return f"{value:.2f} Kč"
+            return str(value)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+    def product_id(self, row):
+        """Vrátí ProductID na daném řádku"""
+        return self._rows[row][0]
+
+    def sample_texts(self, column, limit=100):
+        """Vrátí zobrazované texty prvních řádků sloupce (pro odhad šířky)"""
+        index = self.index
+        return [self.data(index(row, column)) for row in range(min(limit, len(self._rows)))]
@@ -86,7 +86,7 @@ class Styles:
     @staticmethod
     def get_table_style():
         return """
-        QTableWidget {
+        QTableView {
             background-color: white;
             alternate-background-color: #f5f5f5;
             border: 1px solid #e0e0e0;
@@ -94,11 +94,11 @@ class Styles:
             gridline-color: #e0e0e0;
         }
 
-        QTableWidget::item {
+        QTableView::item {
             padding: 5px;
         }
 
-        QTableWidget::item:selected {
+        QTableView::item:selected {
             background-color: #bbdefb;
             color: #212121;
         }
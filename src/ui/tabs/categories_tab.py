@@ -4,8 +4,12 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                            QMessageBox, QDialog)
 from PyQt6.QtCore import Qt
 from ui.dialogs.category_dialog import CategoryDialog
+from ui.workers import AsyncLoadMixin, run_in_background
+from ui.errors import show_write_error
+
+class CategoriesTab(QWidget, AsyncLoadMixin):
+    load_error_message = "Nepodařilo se načíst kategorie"
 
-class CategoriesTab(QWidget):
     def __init__(self, db, main_window):  # Přidáme main_window parametr
         super().__init__()
         self.db = db
@@ -33,6 +37,8 @@ class CategoriesTab(QWidget):
         
         layout.addLayout(button_layout)
         
+        layout.addWidget(self.create_loading_label())
+
         # Tabulka kategorií
         self.table = QTableWidget()
         self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
@@ -42,7 +48,7 @@ class CategoriesTab(QWidget):
     def add_category(self):
         dialog = CategoryDialog(self.db, parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_data()
+            self.load_data_async()
             self.main_window.status_bar.showMessage("Kategorie byla přidána")
 
     def edit_category(self):
@@ -54,7 +60,9 @@ class CategoriesTab(QWidget):
         category_id = int(self.table.item(selected[0].row(), 0).text())
         dialog = CategoryDialog(self.db, category_id, parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_data()
+            self.load_data_async()
+            # Produkty zobrazují název kategorie
+            self.main_window.products_tab.refresh_data()
             self.main_window.status_bar.showMessage("Kategorie byla upravena")
 
     def delete_category(self):
@@ -65,13 +73,23 @@ class CategoriesTab(QWidget):
             return
                 
         category_id = int(self.table.item(selected[0].row(), 0).text())
-        
+
+        # Kontrola, zda kategorie neobsahuje produkty; běží ve workeru
+        run_in_background(
+            self.db,
+            lambda connection: (category_id, connection.execute(
+                "SELECT COUNT(*) FROM Products WHERE CategoryID = ?",
+                (category_id,)).fetchone()[0] > 0),
+            self.confirm_delete_category, self.on_delete_check_failed)
+
+    def on_delete_check_failed(self, message):
+        QMessageBox.critical(self, "Chyba", f"Nelze ověřit, zda kategorie obsahuje produkty: {message}")
+
+    def confirm_delete_category(self, result):
+        """Po kontrole produktů se zeptá na potvrzení a kategorii smaže"""
+        category_id, has_products = result
         try:
-            cursor = self.db.connection.cursor()
-            
-            # Kontrola, zda kategorie neobsahuje produkty
-            cursor.execute("SELECT COUNT(*) FROM Products WHERE CategoryID = ?", (category_id,))
-            if cursor.fetchone()[0] > 0:
+            if has_products:
                 QMessageBox.warning(self, "Varování", 
                                 "Nelze smazat kategorii, která obsahuje produkty. " +
                                 "Nejprve přesuňte nebo smažte všechny produkty v této kategorii.")
@@ -83,51 +101,39 @@ class CategoriesTab(QWidget):
                                     QMessageBox.StandardButton.No)
                                     
             if reply == QMessageBox.StandardButton.Yes:
-                # Začátek transakce
-                cursor.execute("BEGIN TRANSACTION")
-                try:
-                    # Smazání kategorie
-                    cursor.execute("DELETE FROM Categories WHERE CategoryID = ?", 
-                                (category_id,))
-                    
-                    # Potvrzení transakce
-                    self.db.connection.commit()
-                    
-                    # Aktualizace UI
-                    self.load_data()
-                    self.main_window.status_bar.showMessage("Kategorie byla smazána")
-                    
-                except Exception as e:
-                    # Rollback v případě chyby
-                    self.db.connection.rollback()
-                    raise e
+                # Smazání kategorie v transakci, při deadlocku se opakuje
+                self.db.run_in_transaction(
+                    'delete_category',
+                    lambda cursor: cursor.execute("DELETE FROM Categories WHERE CategoryID = ?",
+                                                  (category_id,)),
+                    profile='catalog_write', tables=('Categories',))
+                
+                # Aktualizace UI
+                self.load_data_async()
+                self.main_window.status_bar.showMessage("Kategorie byla smazána")
                     
         except Exception as e:
-            QMessageBox.critical(self, "Chyba", 
-                            f"Nelze smazat kategorii: {str(e)}")
-    def load_data(self):
-        try:
-            headers = ['ID', 'Název', 'Popis', 'Aktivní']
-            self.table.setColumnCount(len(headers))
-            self.table.setHorizontalHeaderLabels(headers)
+            show_write_error(self, "Nelze smazat kategorii", e)
 
-            cursor = self.db.connection.cursor()
-            cursor.execute("SELECT CategoryID, Name, Description, IsActive FROM Categories")
-            
-            data = cursor.fetchall()
-            self.table.setRowCount(len(data))
-            
-            for row, item in enumerate(data):
-                for col, value in enumerate(item):
-                    if col == 3:  # IsActive
-                        value = "Ano" if value else "Ne"
-                    table_item = QTableWidgetItem(str(value))
-                    table_item.setFlags(table_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.table.setItem(row, col, table_item)
+    def fetch_data(self, connection):
+        """Načte kategorie z databáze (běží ve workeru)"""
+        cursor = connection.cursor()
+        cursor.execute("SELECT CategoryID, Name, Description, IsActive FROM Categories")
+        return cursor.fetchall()
 
-            self.table.resizeColumnsToContents()
-            return True
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Nepodařilo se načíst kategorie: {str(e)}")
-            return False
\ No newline at end of file
+    def populate(self, data):
+        """Naplní tabulku načtenými kategoriemi"""
+        headers = ['ID', 'Název', 'Popis', 'Aktivní']
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setRowCount(len(data))
+        
+        for row, item in enumerate(data):
+            for col, value in enumerate(item):
+                if col == 3:  # IsActive
+                    value = "Ano" if value else "Ne"
+                table_item = QTableWidgetItem(str(value))
+                table_item.setFlags(table_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                self.table.setItem(row, col, table_item)
+
+        self.table.resizeColumnsToContents()
@@ -0,0 +1,229 @@
+# ui/tabs/monitor_tab.py
+from datetime import datetime
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
+                           QPushButton, QLabel, QCheckBox, QDoubleSpinBox,
+                           QTableWidget, QTableWidgetItem, QTreeWidget,
+                           QTreeWidgetItem, QTextEdit, QSplitter, QGroupBox)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QBrush, QColor
+from lock_monitor import LockMonitor
+from ui.workers import run_in_background
+
+
+def _item(value):
+    table_item = QTableWidgetItem("" if value is None else str(value))
+    table_item.setFlags(table_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+    return table_item
+
+
+def _fill_table(table, headers, rows):
+    table.setColumnCount(len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.setRowCount(len(rows))
+    for row, values in enumerate(rows):
+        for col, value in enumerate(values):
+            table.setItem(row, col, _item(value))
+    table.resizeColumnsToContents()
+
+
+class MonitorTab(QWidget):
+    """Živý přehled zámků, blokování a deadlocků.
+
+    Dotazy na DMV běží ve workeru na vlastním spojení mimo pool
+    (``LockMonitor``), další dotaz se spustí až po dokončení předchozího.
+    """
+
+    def __init__(self, db, main_window):
+        super().__init__()
+        self.db = db
+        self.main_window = main_window
+        self.monitor = LockMonitor(db.config)
+        self.polling = False
+        self.deadlocks = []
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        settings = self.db.config.get_monitor_settings()
+
+        # Ovládání sledování
+        control_layout = QHBoxLayout()
+        self.toggle_btn = QPushButton("Spustit sledování")
+        self.toggle_btn.clicked.connect(self.toggle)
+        self.interval_spin = QDoubleSpinBox()
+        self.interval_spin.setRange(0.5, 60)
+        self.interval_spin.setSingleStep(0.5)
+        self.interval_spin.setSuffix(" s")
+        self.interval_spin.setValue(settings['poll_interval'])
+        self.interval_spin.valueChanged.connect(self.change_interval)
+        self.deadlock_check = QCheckBox("Zachytávat deadlocky (system_health)")
+        self.deadlock_check.setChecked(settings['capture_deadlocks'])
+        self.status_label = QLabel("Sledování neběží")
+
+        control_layout.addWidget(self.toggle_btn)
+        control_layout.addWidget(QLabel("Interval:"))
+        control_layout.addWidget(self.interval_spin)
+        control_layout.addWidget(self.deadlock_check)
+        control_layout.addStretch()
+        control_layout.addWidget(self.status_label)
+        layout.addLayout(control_layout)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+
+        # Řetězce blokování - hlavní blokující session nahoře, čekající pod ní
+        chains_group = QGroupBox("Řetězce blokování")
+        chains_layout = QVBoxLayout(chains_group)
+        self.chains_tree = QTreeWidget()
+        self.chains_tree.setHeaderLabels(
+            ["Session", "Stav", "Typ čekání", "Čeká (ms)", "Prostředek", "Otevřené transakce", "SQL"])
+        chains_layout.addWidget(self.chains_tree)
+        splitter.addWidget(chains_group)
+
+        # Zámky na sledovaných tabulkách
+        locks_group = QGroupBox("Zámky podle objektu")
+        locks_layout = QVBoxLayout(locks_group)
+        self.locks_table = QTableWidget()
+        locks_layout.addWidget(self.locks_table)
+        splitter.addWidget(locks_group)
+
+        # Běžící požadavky a na co čekají
+        requests_group = QGroupBox("Aktivní požadavky")
+        requests_layout = QVBoxLayout(requests_group)
+        self.requests_table = QTableWidget()
+        requests_layout.addWidget(self.requests_table)
+        splitter.addWidget(requests_group)
+
+        # Deadlocky ze session system_health
+        deadlocks_group = QGroupBox("Deadlocky")
+        deadlocks_layout = QHBoxLayout(deadlocks_group)
+        self.deadlocks_table = QTableWidget()
+        self.deadlocks_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.deadlocks_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.deadlocks_table.itemSelectionChanged.connect(self.show_deadlock)
+        self.deadlock_text = QTextEdit()
+        self.deadlock_text.setReadOnly(True)
+        deadlocks_layout.addWidget(self.deadlocks_table)
+        deadlocks_layout.addWidget(self.deadlock_text)
+        splitter.addWidget(deadlocks_group)
+
+        layout.addWidget(splitter)
+
+    def toggle(self):
+        """Spustí nebo zastaví pravidelné dotazování"""
+        if self.timer.isActive():
+            self.stop()
+        else:
+            self.timer.start(int(self.interval_spin.value() * 1000))
+            self.toggle_btn.setText("Zastavit sledování")
+            self.status_label.setText("Sledování běží")
+            self.poll()
+
+    def stop(self):
+        """Zastaví dotazování a zavře spojení monitoru"""
+        self.timer.stop()
+        self.toggle_btn.setText("Spustit sledování")
+        self.status_label.setText("Sledování neběží")
+        if not self.polling:
+            self.monitor.close()
+
+    def change_interval(self, seconds):
+        if self.timer.isActive():
+            self.timer.setInterval(int(seconds * 1000))
+
+    def poll(self):
+        """Spustí jeden dotaz na pozadí; pomalý server nezpůsobí hromadění dotazů"""
+        if self.polling:
+            return
+        self.polling = True
+        capture = self.deadlock_check.isChecked()
+        run_in_background(None, lambda: self.monitor.snapshot(capture_deadlocks=capture),
+                          self.on_snapshot, self.on_poll_failed)
+
+    def on_snapshot(self, snapshot):
+        self.polling = False
+        if not self.timer.isActive():
+            self.monitor.close()
+        self.populate_chains(snapshot)
+        _fill_table(self.locks_table,
+                    ["Objekt", "Session", "Typ zdroje", "Režim", "Stav", "Počet"],
+                    snapshot['locks'])
+        self.highlight_waiting_locks()
+        _fill_table(self.requests_table,
+                    ["Session", "Blokuje ji", "Stav", "Příkaz", "Typ čekání", "Čeká (ms)",
+                     "Prostředek", "Otevřené transakce", "SQL"],
+                    [(r[0], r[1] or "", r[2], r[3], r[4], r[5], r[6], r[7], r[8])
+                     for r in snapshot['requests']])
+        if snapshot['deadlocks'] is not None:
+            self.populate_deadlocks(snapshot['deadlocks'])
+
+        blocked = sum(1 for depth, _, _ in snapshot['chains'] if depth > 0)
+        time_text = datetime.fromtimestamp(snapshot['taken_at']).strftime('%H:%M:%S')
+        self.status_label.setText(
+            f"{time_text}: blokovaných session {blocked}, "
+            f"hlavních blokujících {len(snapshot['head_blockers'])} "
+            f"({snapshot['seconds'] * 1000:.0f} ms)")
+
+    def on_poll_failed(self, message):
+        self.polling = False
+        self.status_label.setText(f"Chyba monitoru: {message}")
+        if "VIEW SERVER STATE" in message:
+            # Bez oprávnění nemá smysl dotazovat dál
+            self.stop()
+
+    def populate_chains(self, snapshot):
+        """Strom blokování: hlavní blokující session a pod ní čekající"""
+        self.chains_tree.clear()
+        parents = []
+        for depth, session_id, edge in snapshot['chains']:
+            session = snapshot['sessions'].get(session_id)
+            if edge is None:
+                # Hlavní blokující session - většinou nečinná s otevřenou transakcí
+                values = [str(session_id), session[1] if session else "", "", "", "",
+                          str(session[5]) if session else "", session[6] if session else ""]
+            else:
+                _, _, wait_type, wait_ms, resource = edge
+                values = [str(session_id), session[1] if session else "", wait_type or "",
+                          str(wait_ms or 0), resource or "",
+                          str(session[5]) if session else "", session[6] if session else ""]
+            item = QTreeWidgetItem([value or "" for value in values])
+            if depth == 0:
+                item.setForeground(0, QBrush(QColor("red")))
+                self.chains_tree.addTopLevelItem(item)
+            else:
+                parents[depth - 1].addChild(item)
+            del parents[depth:]
+            parents.append(item)
+        self.chains_tree.expandAll()
+        for column in range(self.chains_tree.columnCount()):
+            self.chains_tree.resizeColumnToContents(column)
+
+    def highlight_waiting_locks(self):
+        """Zvýrazní zámky, které čekají na přidělení"""
+        for row in range(self.locks_table.rowCount()):
+            status = self.locks_table.item(row, 4)
+            if status is not None and status.text() == "WAIT":
+                for col in range(self.locks_table.columnCount()):
+                    self.locks_table.item(row, col).setBackground(QBrush(QColor("#ffe0e0")))
+
+    def populate_deadlocks(self, deadlocks):
+        self.deadlocks = deadlocks
+        _fill_table(self.deadlocks_table,
+                    ["Čas", "Oběť", "Session", "Objekty"],
+                    [(d['timestamp'], ", ".join(d['victims']),
+                      ", ".join(p[0] or "" for p in d['processes']),
+                      ", ".join(d['objects'])) for d in deadlocks])
+
+    def show_deadlock(self):
+        """Zobrazí procesy a XML graf vybraného deadlocku"""
+        rows = self.deadlocks_table.selectionModel().selectedRows()
+        if not rows or rows[0].row() >= len(self.deadlocks):
+            return
+        deadlock = self.deadlocks[rows[0].row()]
+        lines = []
+        for spid, wait_resource, inputbuf in deadlock['processes']:
+            victim = " (oběť)" if spid in deadlock['victims'] else ""
+            lines.append(f"Session {spid}{victim} čeká na {wait_resource}:\n    {inputbuf}")
+        self.deadlock_text.setPlainText("\n".join(lines) + "\n\n" + deadlock['xml'])
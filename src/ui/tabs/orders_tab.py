@@ -1,15 +1,33 @@
 # ui/tabs/orders_tab.py
+from datetime import datetime, timedelta
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
                            QPushButton, QTableWidget, QTableWidgetItem,
-                           QMessageBox, QDialog)
-from PyQt6.QtCore import Qt
+                           QMessageBox, QDialog, QComboBox, QLabel,
+                           QDateEdit, QCheckBox)
+from PyQt6.QtCore import Qt, QDate
+from archive import ArchiveError, archive_orders, count_archivable
+from order_store import BulkDeleteError, delete_orders
+from ui.errors import show_write_error
 from ui.dialogs.order_dialog import OrderDialog
+from ui.workers import AsyncLoadMixin, WorkerSignals, run_in_background
+
+ORDER_STATUSES = ['pending', 'processing', 'shipped', 'delivered', 'cancelled']
+
+class OrdersTab(QWidget, AsyncLoadMixin):
+    load_error_message = "Nepodařilo se načíst objednávky"
+    page_size = 100
 
-class OrdersTab(QWidget):
     def __init__(self, db, main_window):  # Přidáme main_window parametr
         super().__init__()
         self.db = db
         self.main_window = main_window  # Uložíme referenci na hlavní okno
+        self.customers_loaded = False
+        # Stránkování podle klíče (OrderDate, OrderID) místo OFFSET
+        self.page_number = 1
+        self.first_key = None
+        self.last_key = None
+        self.has_next = False
+        self.page_request = self.make_page_request('first')
         self.init_ui()
 
     def init_ui(self):
@@ -21,28 +39,89 @@ class OrdersTab(QWidget):
         self.new_order_btn = QPushButton("Nová objednávka")
         self.view_order_btn = QPushButton("Zobrazit detail")
         self.delete_order_btn = QPushButton("Smazat objednávku")
+        self.delete_filtered_btn = QPushButton("Smazat vše dle filtru")
+        self.archive_btn = QPushButton("Archivovat staré")
         
         self.new_order_btn.clicked.connect(self.add_order)
         self.view_order_btn.clicked.connect(self.view_order)
         self.delete_order_btn.clicked.connect(self.delete_order)
+        self.delete_filtered_btn.clicked.connect(self.delete_filtered_orders)
+        self.archive_btn.clicked.connect(self.archive_old_orders)
         
         button_layout.addWidget(self.new_order_btn)
         button_layout.addWidget(self.view_order_btn)
         button_layout.addWidget(self.delete_order_btn)
+        button_layout.addWidget(self.delete_filtered_btn)
+        button_layout.addWidget(self.archive_btn)
         button_layout.addStretch()
         
         layout.addLayout(button_layout)
+
+        # Filtry vyhodnocované na serveru
+        filter_layout = QHBoxLayout()
+
+        filter_layout.addWidget(QLabel("Status:"))
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("Vše", None)
+        for status in ORDER_STATUSES:
+            self.status_filter.addItem(status, status)
+        filter_layout.addWidget(self.status_filter)
+
+        filter_layout.addWidget(QLabel("Zákazník:"))
+        self.customer_filter = QComboBox()
+        self.customer_filter.addItem("Všichni", None)
+        filter_layout.addWidget(self.customer_filter)
+
+        self.date_filter_check = QCheckBox("Datum od:")
+        self.date_from = QDateEdit(QDate.currentDate().addMonths(-1))
+        self.date_from.setCalendarPopup(True)
+        self.date_to = QDateEdit(QDate.currentDate())
+        self.date_to.setCalendarPopup(True)
+        filter_layout.addWidget(self.date_filter_check)
+        filter_layout.addWidget(self.date_from)
+        filter_layout.addWidget(QLabel("do:"))
+        filter_layout.addWidget(self.date_to)
+
+        # Archiv se čte jen na vyžádání, běžně jen horká tabulka Orders
+        self.include_archive_check = QCheckBox("Včetně archivu")
+        filter_layout.addWidget(self.include_archive_check)
+
+        apply_filter_btn = QPushButton("Filtrovat")
+        apply_filter_btn.clicked.connect(self.apply_filters)
+        filter_layout.addWidget(apply_filter_btn)
+        filter_layout.addStretch()
+
+        layout.addLayout(filter_layout)
         
+        layout.addWidget(self.create_loading_label())
+
         # Tabulka objednávek
         self.table = QTableWidget()
         self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
         layout.addWidget(self.table)
 
+        # Navigace mezi stránkami
+        page_layout = QHBoxLayout()
+        self.prev_page_btn = QPushButton("< Předchozí")
+        self.next_page_btn = QPushButton("Další >")
+        self.page_label = QLabel()
+        self.prev_page_btn.clicked.connect(self.previous_page)
+        self.next_page_btn.clicked.connect(self.next_page)
+        self.prev_page_btn.setEnabled(False)
+        self.next_page_btn.setEnabled(False)
+
+        page_layout.addStretch()
+        page_layout.addWidget(self.prev_page_btn)
+        page_layout.addWidget(self.page_label)
+        page_layout.addWidget(self.next_page_btn)
+        page_layout.addStretch()
+        layout.addLayout(page_layout)
+
     def add_order(self):
         dialog = OrderDialog(self.db, parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_data()
+            self.load_data_async()
             self.main_window.status_bar.showMessage("Objednávka byla vytvořena")
 
     def view_order(self):
@@ -54,112 +133,374 @@ class OrdersTab(QWidget):
         order_id = int(self.table.item(selected[0].row(), 0).text())
         dialog = OrderDialog(self.db, order_id, parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_data()
+            self.load_data_async()
             self.main_window.status_bar.showMessage("Objednávka byla upravena")
 
+    def selected_order_ids(self):
+        """ID všech vybraných objednávek"""
+        rows = {index.row() for index in self.table.selectionModel().selectedRows()}
+        return [int(self.table.item(row, 0).text()) for row in sorted(rows)]
+
     def delete_order(self):
-        """Smaže objednávku a její položky s použitím transakce"""
-        selected = self.table.selectedItems()
-        if not selected:
+        """Smaže vybrané objednávky a vrátí jejich položky na sklad"""
+        order_ids = self.selected_order_ids()
+        if not order_ids:
             QMessageBox.warning(self, "Varování", "Vyberte objednávku ke smazání")
             return
-                
-        order_id = int(self.table.item(selected[0].row(), 0).text())
-        
-        try:
-            cursor = self.db.connection.cursor()
-            
-            # Nejprve získáme informace o položkách objednávky pro případné vrácení na sklad
-            cursor.execute("""
-                SELECT ProductID, Quantity 
-                FROM OrderItems 
-                WHERE OrderID = ?
-            """, (order_id,))
-            order_items = cursor.fetchall()
-            
-            reply = QMessageBox.question(
-                self, 
-                "Potvrdit smazání",
-                "Opravdu chcete smazat tuto objednávku? \n\n"
-                "Budou smazány všechny položky objednávky a množství produktů "
-                "bude vráceno na sklad.",
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+
+        question = ("Opravdu chcete smazat tuto objednávku?" if len(order_ids) == 1
+                    else f"Opravdu chcete smazat {len(order_ids)} vybraných objednávek?")
+        self.confirm_and_delete(order_ids, question)
+
+    def delete_filtered_orders(self):
+        """Smaže všechny objednávky odpovídající použitému filtru, ne jen aktuální stránku"""
+        filters = self.page_request['filters']
+        conditions, params = self.filter_conditions(filters)
+        # Archivované objednávky se nemažou
+        where = ' AND '.join(conditions + ["o.IsDeleted = 0"])
+        # Výběr objednávek běží ve workeru, potvrzení až v on_filtered_orders_loaded
+        self.set_bulk_running(True)
+        run_in_background(
+            self.db,
+            lambda connection: (bool(conditions), [row[0] for row in connection.execute(
+                f"SELECT o.OrderID FROM Orders o WHERE {where}", params).fetchall()]),
+            self.on_filtered_orders_loaded, self.on_filtered_orders_failed)
+
+    def on_filtered_orders_loaded(self, result):
+        filtered, order_ids = result
+        self.set_bulk_running(False)
+        if not order_ids:
+            QMessageBox.information(self, "Informace", "Filtru neodpovídá žádná objednávka")
+            return
+        if not filtered:
+            question = f"Filtr není nastaven. Opravdu chcete smazat všech {len(order_ids)} objednávek?"
+        else:
+            question = f"Opravdu chcete smazat {len(order_ids)} objednávek odpovídajících filtru?"
+        self.confirm_and_delete(order_ids, question)
+
+    def on_filtered_orders_failed(self, message):
+        self.set_bulk_running(False)
+        QMessageBox.critical(self, "Chyba", f"Nelze načíst objednávky: {message}")
+
+    def confirm_and_delete(self, order_ids, question):
+        reply = QMessageBox.question(
+            self, 
+            "Potvrdit smazání",
+            f"{question} \n\n"
+            "Budou smazány všechny položky objednávek a množství produktů "
+            "bude vráceno na sklad.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        settings = self.db.config.get_order_settings()
+        # Mazání běží ve workeru (včetně čekání mezi opakováními po deadlocku),
+        # průběh chodí signálem do GUI vlákna
+        self.set_bulk_running(True)
+        self.bulk_signals = WorkerSignals()
+        self.bulk_signals.progress.connect(self.on_delete_progress)
+        report = self.bulk_signals.progress.emit
+
+        def run():
+            try:
+                # Po blocích podle klíče, každý blok ve vlastní transakci;
+                # blok ukončený deadlockem se zopakuje
+                with self.db.connection_for('order_write') as connection:
+                    return delete_orders(
+                        connection, order_ids, settings['delete_chunk_size'],
+                        lambda done, total: report((done, total)),
+                        soft=settings['soft_delete'],
+                        retry=lambda fn: self.db.retrying('delete_orders', fn)), None
+            except Exception as e:
+                # Výjimku předáme celou, show_write_error podle ní volí text
+                return None, e
+            finally:
+                # I částečné smazání mohlo změnit tabulky
+                self.db.invalidate('Orders', 'OrderItems', 'Products')
+
+        run_in_background(None, run, self.on_orders_deleted)
+
+    def on_delete_progress(self, progress):
+        done, total = progress
+        self.main_window.status_bar.showMessage(f"Smazáno {done} z {total} objednávek...")
+
+    def on_orders_deleted(self, result):
+        deleted, error = result
+        self.set_bulk_running(False)
+        if isinstance(error, BulkDeleteError):
+            show_write_error(
+                self,
+                f"Nelze smazat objednávky. Smazáno bylo {error.orders_deleted} objednávek, "
+                "změny v nedokončeném bloku byly vráceny zpět",
+                error
             )
-                                
-            if reply == QMessageBox.StandardButton.Yes:
-                # Začátek transakce
-                cursor.execute("BEGIN TRANSACTION")
-                try:
-                    # Vrátíme množství produktů na sklad
-                    for product_id, quantity in order_items:
-                        cursor.execute("""
-                            UPDATE Products 
-                            SET StockQuantity = StockQuantity + ?
-                            WHERE ProductID = ?
-                        """, (quantity, product_id))
-                    
-                    # Nejprve smažeme položky objednávky (kvůli cizímu klíči)
-                    cursor.execute("DELETE FROM OrderItems WHERE OrderID = ?", (order_id,))
-                    
-                    # Potom smažeme samotnou objednávku
-                    cursor.execute("DELETE FROM Orders WHERE OrderID = ?", (order_id,))
-                    
-                    # Potvrzení transakce
-                    self.db.connection.commit()
-                    
-                    # Aktualizace UI
-                    self.load_data()
-                    self.main_window.status_bar.showMessage(
-                        f"Objednávka byla smazána a množství produktů bylo vráceno na sklad"
-                    )
-                    
-                except Exception as e:
-                    # Rollback v případě chyby
-                    self.db.connection.rollback()
-                    raise e
-                    
-        except Exception as e:
+            self.load_data_async()
+            return
+        if error is not None:
+            show_write_error(self, "Nelze smazat objednávky, všechny změny byly vráceny zpět", error)
+            return
+
+        self.load_data_async()
+        self.main_window.status_bar.showMessage(
+            f"Smazáno {deleted} objednávek a množství produktů bylo vráceno na sklad"
+        )
+
+    def set_bulk_running(self, running):
+        """Během hromadného mazání nebo archivace nejde spustit další"""
+        for button in (self.delete_order_btn, self.delete_filtered_btn, self.archive_btn):
+            button.setEnabled(not running)
+
+    def current_filters(self):
+        """Vrátí aktuální hodnoty filtrů (čte widgety, volat v GUI vlákně)"""
+        filters = {
+            'status': self.status_filter.currentData(),
+            'customer_id': self.customer_filter.currentData(),
+            'date_from': None,
+            'date_to': None,
+            'include_archive': self.include_archive_check.isChecked()
+        }
+        if self.date_filter_check.isChecked():
+            date_from = self.date_from.date().toPyDate()
+            date_to = self.date_to.date().toPyDate()
+            filters['date_from'] = datetime(date_from.year, date_from.month, date_from.day)
+            # Horní mez je exkluzivní - celý den "do"
+            filters['date_to'] = datetime(date_to.year, date_to.month, date_to.day) + timedelta(days=1)
+        return filters
+
+    def make_page_request(self, direction, key=None, page=1, filters=None):
+        """Popis stránky, kterou má worker načíst"""
+        return {
+            'direction': direction,  # 'first', 'next' nebo 'prev'
+            'key': key,              # (OrderDate, OrderID) hranice stránky
+            'page': page,
+            'filters': filters or {}
+        }
+
+    def apply_filters(self):
+        """Načte první stránku s novými filtry"""
+        self.page_request = self.make_page_request('first', filters=self.current_filters())
+        self.load_data_async()
+
+    def next_page(self):
+        if not self.has_next or self.last_key is None:
+            return
+        self.page_request = self.make_page_request(
+            'next', self.last_key, self.page_number + 1, self.page_request['filters'])
+        self.load_data_async()
+
+    def previous_page(self):
+        if self.page_number <= 1 or self.first_key is None:
+            return
+        self.page_request = self.make_page_request(
+            'prev', self.first_key, self.page_number - 1, self.page_request['filters'])
+        self.load_data_async()
+
+    def filter_conditions(self, filters):
+        """Podmínky WHERE a jejich parametry pro zadané filtry"""
+        conditions = []
+        params = []
+
+        if filters.get('status'):
+            conditions.append("o.Status = ?")
+            params.append(filters['status'])
+        if filters.get('customer_id') is not None:
+            conditions.append("o.CustomerID = ?")
+            params.append(filters['customer_id'])
+        if filters.get('date_from'):
+            conditions.append("o.OrderDate >= ?")
+            params.append(filters['date_from'])
+        if filters.get('date_to'):
+            conditions.append("o.OrderDate < ?")
+            params.append(filters['date_to'])
+        return conditions, params
+
+    def order_source(self, filters):
+        """Tabulka objednávek pro dotaz - jen horká data, nebo i archiv"""
+        if not filters.get('include_archive'):
+            return "Orders"
+        columns = "OrderID, CustomerID, OrderDate, TotalAmount, Status, IsDeleted"
+        return f"(SELECT {columns} FROM Orders UNION ALL SELECT {columns} FROM OrdersArchive)"
+
+    def archive_old_orders(self):
+        """Přesune staré a uzavřené objednávky do archivních tabulek"""
+        settings = self.db.config.get_archive_settings()
+        # Počet archivovatelných objednávek se zjistí ve workeru
+        self.set_bulk_running(True)
+        run_in_background(
+            self.db,
+            lambda connection: (settings, count_archivable(
+                connection, settings['max_age_days'], settings['statuses'])),
+            self.on_archivable_counted, self.on_archivable_count_failed)
+
+    def on_archivable_counted(self, result):
+        settings, count = result
+        self.set_bulk_running(False)
+        if not count:
+            QMessageBox.information(self, "Informace", "Žádné objednávky k archivaci")
+            return
+        reply = QMessageBox.question(
+            self,
+            "Archivace objednávek",
+            f"Přesunout {count} objednávek do archivu? \n\n"
+            f"Archivují se objednávky starší než {settings['max_age_days']} dní, "
+            f"objednávky ve stavu {', '.join(settings['statuses'])} a smazané objednávky.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+
+        # Archivace běží ve workeru, průběh chodí signálem do GUI vlákna
+        self.set_bulk_running(True)
+        self.archive_count = count
+        self.bulk_signals = WorkerSignals()
+        self.bulk_signals.progress.connect(self.on_archive_progress)
+        report = self.bulk_signals.progress.emit
+
+        def run():
+            try:
+                with self.db.connection_for('order_write') as connection:
+                    return archive_orders(
+                        connection, settings['max_age_days'], settings['statuses'],
+                        settings['batch_size'], lambda done, elapsed: report(done),
+                        retry=lambda fn: self.db.retrying('archive_orders', fn)), None
+            except Exception as e:
+                return None, e
+            finally:
+                self.db.invalidate('Orders', 'OrderItems', 'OrdersArchive', 'OrderItemsArchive')
+
+        run_in_background(None, run, self.on_orders_archived)
+
+    def on_archivable_count_failed(self, message):
+        self.set_bulk_running(False)
+        QMessageBox.critical(self, "Chyba", f"Nelze zjistit počet objednávek: {message}")
+
+    def on_archive_progress(self, done):
+        self.main_window.status_bar.showMessage(
+            f"Archivováno {done} z {self.archive_count} objednávek...")
+
+    def on_orders_archived(self, result):
+        stats, error = result
+        self.set_bulk_running(False)
+        if isinstance(error, ArchiveError):
             QMessageBox.critical(
-                self, 
-                "Chyba", 
-                f"Nelze smazat objednávku: {str(e)}\n\n"
-                "Všechny změny byly vráceny zpět."
+                self,
+                "Chyba",
+                f"Archivace selhala: {str(error)}\n\n"
+                f"Archivováno bylo {error.orders_archived} objednávek."
             )
+            self.load_data_async()
+            return
+        if error is not None:
+            QMessageBox.critical(self, "Chyba", f"Archivace selhala: {str(error)}")
+            return
+
+        self.load_data_async()
+        self.main_window.status_bar.showMessage(
+            f"Archivováno {stats['orders']} objednávek za {stats['seconds']:.2f} s"
+        )
+
+    def build_page_query(self, request):
+        """Sestaví dotaz na jednu stránku objednávek.
+
+        Řazení (OrderDate DESC, OrderID DESC) odpovídá indexům
+        ix_orders_*_orderdate, takže server čte jen page_size + 1 řádků.
+        """
+        conditions, params = self.filter_conditions(request['filters'])
+        conditions.append("o.IsDeleted = 0")
+
+        if request['direction'] == 'next':
+            conditions.append("(o.OrderDate < ? OR (o.OrderDate = ? AND o.OrderID < ?))")
+            order_date, order_id = request['key']
+            params.extend([order_date, order_date, order_id])
+            order = "o.OrderDate DESC, o.OrderID DESC"
+        elif request['direction'] == 'prev':
+            conditions.append("(o.OrderDate > ? OR (o.OrderDate = ? AND o.OrderID > ?))")
+            order_date, order_id = request['key']
+            params.extend([order_date, order_date, order_id])
+            order = "o.OrderDate ASC, o.OrderID ASC"
+        else:
+            order = "o.OrderDate DESC, o.OrderID DESC"
 
-    def load_data(self):
-        try:
-            headers = ['ID', 'Zákazník', 'Datum', 'Celková částka', 'Status']
-            self.table.setColumnCount(len(headers))
-            self.table.setHorizontalHeaderLabels(headers)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"""
+            SELECT TOP ({self.page_size + 1})
+                   o.OrderID, 
+                   CONCAT(c.FirstName, ' ', c.LastName) as CustomerName,
+                   o.OrderDate, 
+                   o.TotalAmount,
+                   o.Status
+            FROM {self.order_source(request['filters'])} o
+            JOIN Customers c ON o.CustomerID = c.CustomerID
+            {where}
+            ORDER BY {order}
+        """
+        return sql, params
 
-            cursor = self.db.connection.cursor()
+    def fetch_data(self, connection):
+        """Načte jednu stránku objednávek z databáze (běží ve workeru)"""
+        request = self.page_request
+        cursor = connection.cursor()
+
+        customers = None
+        if not self.customers_loaded:
             cursor.execute("""
-                SELECT o.OrderID, 
-                       CONCAT(c.FirstName, ' ', c.LastName) as CustomerName,
-                       o.OrderDate, 
-                       o.TotalAmount,
-                       o.Status
-                FROM Orders o
-                JOIN Customers c ON o.CustomerID = c.CustomerID
-                ORDER BY o.OrderDate DESC
+                SELECT CustomerID, CONCAT(FirstName, ' ', LastName)
+                FROM Customers
+                ORDER BY LastName, FirstName
             """)
-            
-            data = cursor.fetchall()
-            self.table.setRowCount(len(data))
-            
-            for row, item in enumerate(data):
-                for col, value in enumerate(item):
-                    if col == 3:  # částka
-                        value = f"{value:.2f} Kč"
-                    elif col == 2:  # datum
-                        value = value.strftime("%d.%m.%Y %H:%M")
-                    table_item = QTableWidgetItem(str(value))
-                    table_item.setFlags(table_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.table.setItem(row, col, table_item)
-
-            self.table.resizeColumnsToContents()
-            return True
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Nepodařilo se načíst objednávky: {str(e)}")
-            return False
\ No newline at end of file
+            customers = cursor.fetchall()
+
+        sql, params = self.build_page_query(request)
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        has_more = len(rows) > self.page_size
+
+        if request['direction'] == 'prev' and not has_more:
+            # Došli jsme na začátek - místo zbytku načteme plnou první stránku
+            request = self.make_page_request('first', filters=request['filters'])
+            sql, params = self.build_page_query(request)
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+            has_more = len(rows) > self.page_size
+
+        rows = rows[:self.page_size]
+        if request['direction'] == 'prev':
+            rows.reverse()
+        return request, rows, has_more, customers
+
+    def populate(self, data):
+        """Naplní tabulku načtenou stránkou objednávek"""
+        request, rows, has_more, customers = data
+
+        if customers is not None and not self.customers_loaded:
+            self.customers_loaded = True
+            for customer_id, name in customers:
+                self.customer_filter.addItem(name, customer_id)
+
+        self.page_request = request
+        self.page_number = request['page']
+        self.has_next = has_more or request['direction'] == 'prev'
+        self.first_key = (rows[0][2], rows[0][0]) if rows else None
+        self.last_key = (rows[-1][2], rows[-1][0]) if rows else None
+
+        self.prev_page_btn.setEnabled(self.page_number > 1)
+        self.next_page_btn.setEnabled(self.has_next)
+        self.page_label.setText(f"Strana {self.page_number}")
+
+        headers = ['ID', 'Zákazník', 'Datum', 'Celková částka', 'Status']
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setRowCount(len(rows))
+        
+        for row, item in enumerate(rows):
+            for col, value in enumerate(item):
+                if col == 3:  # částka
+                    value = f"{value:.2f} Kč"
+                elif col == 2:  # datum
+                    value = value.strftime("%d.%m.%Y %H:%M")
+                table_item = QTableWidgetItem(str(value))
+                table_item.setFlags(table_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                self.table.setItem(row, col, table_item)
+
+        self.table.resizeColumnsToContents()
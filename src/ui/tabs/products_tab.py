@@ -1,16 +1,29 @@
 # ui/tabs/products_tab.py
+from datetime import timedelta
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
-                           QPushButton, QTableWidget, QTableWidgetItem,
-                           QMessageBox, QDialog, QComboBox, QLabel)
-from PyQt6.QtCore import Qt
+                           QPushButton, QTableView, QMessageBox,
+                           QDialog, QComboBox, QLabel)
+from anomaly_runner import run_non_repeatable_read
+from database import ISOLATION_LEVELS
 from ui.dialogs.product_dialog import ProductDialog
 from ui.dialogs.demo_dialog import DemoDialog
+from ui.models.products_model import ProductsTableModel
+from ui.workers import AsyncLoadMixin, run_in_background
+from ui.errors import show_write_error
+
+class ProductsTab(QWidget, AsyncLoadMixin):
+    load_error_message = "Nepodařilo se načíst produkty"
+    refresh_overlap_seconds = 5
 
-class ProductsTab(QWidget):
     def __init__(self, db, main_window):
         super().__init__()
         self.db = db
         self.main_window = main_window
+        # Nejvyšší viděné LastUpdated / DeletedAt pro přírůstkovou obnovu
+        self.product_watermark = None
+        self.tombstone_watermark = None
+        # Kontrolní součet názvů kategorií - Categories nemá LastUpdated
+        self.category_checksum = None
         self.init_ui()
 
     def init_ui(self):
@@ -43,96 +56,201 @@ class ProductsTab(QWidget):
         # Výběr izolační úrovně
         isolation_label = QLabel("Izolační úroveň:")
         self.isolation_combo = QComboBox()
-        self.isolation_combo.addItems([
-            "READ UNCOMMITTED",
-            "READ COMMITTED",
-            "REPEATABLE READ",
-            "SERIALIZABLE"
-        ])
+        self.isolation_combo.addItems(ISOLATION_LEVELS)
         self.isolation_combo.setCurrentText("READ COMMITTED")
         self.isolation_combo.currentTextChanged.connect(self.change_isolation_level)
         
-        demo_btn = QPushButton("Demonstrace Non-repeatable reads")
-        demo_btn.clicked.connect(self.demonstrate_non_repeatable_reads)
+        self.demo_btn = QPushButton("Demonstrace Non-repeatable reads")
+        self.demo_btn.clicked.connect(self.demonstrate_non_repeatable_reads)
         
         demo_layout.addWidget(isolation_label)
         demo_layout.addWidget(self.isolation_combo)
-        demo_layout.addWidget(demo_btn)
+        demo_layout.addWidget(self.demo_btn)
         demo_layout.addStretch()
         
         layout.addLayout(demo_layout)
         
-        # Tabulka produktů
-        self.table = QTableWidget()
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        layout.addWidget(self.create_loading_label())
+
+        # Tabulka produktů - řádky se dočítají při scrollování
+        self.model = ProductsTableModel(request_more=self.fetch_more, parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.table.verticalHeader().setDefaultSectionSize(
+            self.table.fontMetrics().height() + 10)
         layout.addWidget(self.table)
 
-    def load_data(self):
-        try:
-            headers = ['ID', 'Kategorie', 'Název', 'Cena', 'Množství', 'Status']
-            self.table.setColumnCount(len(headers))
-            self.table.setHorizontalHeaderLabels(headers)
-
-            cursor = self.db.connection.cursor()
-            cursor.execute("""
-                SELECT p.ProductID, c.Name as CategoryName, p.Name, 
-                       p.Price, p.StockQuantity, p.Status
-                FROM Products p
-                JOIN Categories c ON p.CategoryID = c.CategoryID
-            """)
-            
-            data = cursor.fetchall()
-            self.table.setRowCount(len(data))
-            
-            for row, item in enumerate(data):
-                for col, value in enumerate(item):
-                    if col == 3:  # cena
-                        value = f"{value:.2f} Kč"
-                    table_item = QTableWidgetItem(str(value))
-                    table_item.setFlags(table_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    self.table.setItem(row, col, table_item)
-
-            self.table.resizeColumnsToContents()
-            return True
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Nepodařilo se načíst produkty: {str(e)}")
-            return False
+    # Přejmenování kategorie změní řádky produktů, aniž by se změnilo jejich LastUpdated
+    CATEGORY_CHECKSUM_QUERY = """
+        SELECT CHECKSUM_AGG(BINARY_CHECKSUM(CategoryID, Name)) FROM Categories
+    """
+
+    PAGE_QUERY = """
+        SELECT p.ProductID, c.Name as CategoryName, p.Name, 
+               p.Price, p.StockQuantity, p.Status, p.LastUpdated
+        FROM Products p
+        JOIN Categories c ON p.CategoryID = c.CategoryID
+        WHERE p.ProductID > ?
+        ORDER BY p.ProductID
+        OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY
+    """
+
+    def fetch_data(self, connection):
+        """Načte watermarky a první dávku produktů (běží ve workeru)"""
+        cursor = connection.cursor()
+        # Watermarky zjistíme před čtením dávky, aby se žádná změna neztratila
+        cursor.execute(f"""
+            SELECT (SELECT MAX(LastUpdated) FROM Products),
+                   (SELECT MAX(DeletedAt) FROM ProductTombstones),
+                   GETDATE(),
+                   ({self.CATEGORY_CHECKSUM_QUERY})
+        """)
+        product_watermark, tombstone_watermark, now, category_checksum = cursor.fetchone()
+        rows = self.fetch_page(connection, 0)
+        watermarks = (product_watermark or now, tombstone_watermark or now, category_checksum)
+        return rows, watermarks
+
+    def fetch_page(self, connection, after_id):
+        """Načte dávku produktů s ProductID větším než ``after_id`` (seek v PK)"""
+        cursor = connection.cursor()
+        cursor.execute(self.PAGE_QUERY, (after_id, self.model.chunk_size))
+        return cursor.fetchall()
+
+    def populate(self, data):
+        """Předá první dávku modelu tabulky"""
+        rows, watermarks = data
+        self.product_watermark, self.tombstone_watermark, self.category_checksum = watermarks
+        self.model.set_first_page(rows)
+        self.estimate_column_widths()
+
+    def fetch_more(self, after_id):
+        """Dočte další dávku na pozadí; volá ji model z fetchMore"""
+        run_in_background(self.db,
+                          lambda connection: (after_id, self.fetch_page(connection, after_id)),
+                          self.model.append_page, self.on_fetch_more_failed, self.load_profile)
+
+    def on_fetch_more_failed(self, message):
+        self.model.fetch_failed()
+        self.main_window.status_bar.showMessage(f"Nepodařilo se načíst další produkty: {message}")
+
+    def fetch_changes(self, connection):
+        """Načte produkty změněné a smazané od posledních watermarků (běží ve workeru).
+
+        Obě čtení jdou jednou dávkou a jsou to seeky v indexech nad
+        LastUpdated a DeletedAt. Okno překryvu zachytí transakce, které
+        nastavily LastUpdated dříve, ale commitly až po minulé obnově;
+        opakované zapracování stejného řádku nevadí. Pokud se změnily
+        kategorie, načtou se produkty znovu celé.
+        """
+        overlap = timedelta(seconds=self.refresh_overlap_seconds)
+        product_since = self.product_watermark - overlap
+        tombstone_since = self.tombstone_watermark - overlap
+
+        cursor = connection.cursor()
+        cursor.execute(f"""
+            {self.CATEGORY_CHECKSUM_QUERY};
+
+            SELECT p.ProductID, c.Name as CategoryName, p.Name, 
+                   p.Price, p.StockQuantity, p.Status, p.LastUpdated
+            FROM Products p
+            JOIN Categories c ON p.CategoryID = c.CategoryID
+            WHERE p.LastUpdated > ?;
+
+            SELECT ProductID, DeletedAt
+            FROM ProductTombstones
+            WHERE DeletedAt > ?;
+        """, (product_since, tombstone_since))
+        category_checksum = cursor.fetchone()[0]
+        if category_checksum != self.category_checksum:
+            cursor.close()
+            return 'reload', self.fetch_data(connection)
+        cursor.nextset()
+        changed_rows = cursor.fetchall()
+        cursor.nextset()
+        deleted = cursor.fetchall()
+
+        product_watermark = max([row[6] for row in changed_rows] + [self.product_watermark])
+        tombstone_watermark = max([row[1] for row in deleted] + [self.tombstone_watermark])
+        return 'changes', (changed_rows, [row[0] for row in deleted],
+                           (product_watermark, tombstone_watermark, category_checksum))
+
+    def apply_changes(self, data):
+        """Zapracuje přírůstkové změny do modelu, případně celé nové načtení"""
+        kind, data = data
+        if kind == 'reload':
+            self.populate(data)
+            self.set_loading(False)
+            self.main_window.status_bar.showMessage("Kategorie se změnily, produkty byly načteny znovu")
+            return
+        changed_rows, deleted_ids, watermarks = data
+        self.product_watermark, self.tombstone_watermark, self.category_checksum = watermarks
+        changed, removed = self.model.apply_changes(changed_rows, deleted_ids)
+        self.set_loading(False)
+        self.main_window.status_bar.showMessage(
+            f"Data byla obnovena (změněno: {changed}, odebráno: {removed})")
+
+    def estimate_column_widths(self, sample_size=100):
+        """Nastaví šířky sloupců podle vzorku řádků místo resizeColumnsToContents"""
+        metrics = self.table.fontMetrics()
+        header = self.table.horizontalHeader()
+        padding = 24
+        for column, title in enumerate(self.model.HEADERS):
+            texts = self.model.sample_texts(column, sample_size) + [title]
+            width = max(metrics.horizontalAdvance(text) for text in texts) + padding
+            header.resizeSection(column, min(width, 400))
+
+    def selected_product_id(self):
+        """Vrátí ID vybraného produktu nebo None"""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        return self.model.product_id(rows[0].row())
 
     def add_product(self):
         dialog = ProductDialog(self.db, parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_data()
+            self.refresh_data()
             self.main_window.status_bar.showMessage("Produkt byl přidán")
 
     def edit_product(self):
-        selected = self.table.selectedItems()
-        if not selected:
+        product_id = self.selected_product_id()
+        if product_id is None:
             QMessageBox.warning(self, "Varování", "Vyberte produkt k úpravě")
             return
             
-        product_id = int(self.table.item(selected[0].row(), 0).text())
         dialog = ProductDialog(self.db, product_id, parent=self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.load_data()
+            self.refresh_data()
             self.main_window.status_bar.showMessage("Produkt byl upraven")
 
     def delete_product(self):
         """Smaže produkt s použitím transakce"""
-        selected = self.table.selectedItems()
-        if not selected:
+        product_id = self.selected_product_id()
+        if product_id is None:
             QMessageBox.warning(self, "Varování", "Vyberte produkt ke smazání")
             return
-            
-        product_id = int(self.table.item(selected[0].row(), 0).text())
-        
+
+        # Kontrola, zda produkt není v žádné objednávce - ani v archivované
+        # (OrderItemsArchive má na Products cizí klíč); běží ve workeru
+        run_in_background(
+            self.db,
+            lambda connection: (product_id, connection.execute("""
+                SELECT CASE WHEN EXISTS (SELECT 1 FROM OrderItems WHERE ProductID = ?)
+                              OR EXISTS (SELECT 1 FROM OrderItemsArchive WHERE ProductID = ?)
+                            THEN 1 ELSE 0 END
+            """, (product_id, product_id)).fetchone()[0] == 1),
+            self.confirm_delete_product, self.on_delete_check_failed)
+
+    def on_delete_check_failed(self, message):
+        QMessageBox.critical(self, "Chyba", f"Nelze ověřit, zda je produkt v objednávkách: {message}")
+
+    def confirm_delete_product(self, result):
+        """Po kontrole objednávek se zeptá na potvrzení a produkt smaže"""
+        product_id, in_orders = result
         try:
-            cursor = self.db.connection.cursor()
-            
-            # Kontrola, zda produkt není v žádné objednávce
-            cursor.execute("SELECT COUNT(*) FROM OrderItems WHERE ProductID = ?", (product_id,))
-            if cursor.fetchone()[0] > 0:
+            if in_orders:
                 QMessageBox.warning(self, "Varování", 
                                 "Nelze smazat produkt, který je součástí objednávek")
                 return
@@ -143,117 +261,77 @@ class ProductsTab(QWidget):
                                     QMessageBox.StandardButton.No)
                                     
             if reply == QMessageBox.StandardButton.Yes:
-                # Začátek transakce
-                cursor.execute("BEGIN TRANSACTION")
-                try:
-                    # Smazání produktu
-                    cursor.execute("DELETE FROM Products WHERE ProductID = ?", (product_id,))
-                    
-                    # Potvrzení transakce
-                    self.db.connection.commit()
-                    self.load_data()
-                    self.main_window.status_bar.showMessage("Produkt byl smazán")
-                    
-                except Exception as e:
-                    # Rollback v případě chyby
-                    self.db.connection.rollback()
-                    raise e
+                # Smazání produktu v transakci, při deadlocku se opakuje
+                self.db.run_in_transaction(
+                    'delete_product',
+                    lambda cursor: cursor.execute("DELETE FROM Products WHERE ProductID = ?",
+                                                  (product_id,)),
+                    profile='inventory_adjust', tables=('Products',))
+
+                self.refresh_data()
+                self.main_window.status_bar.showMessage("Produkt byl smazán")
                     
         except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Nelze smazat produkt: {str(e)}")
+            show_write_error(self, "Nelze smazat produkt", e)
 
     def refresh_data(self):
-        """Obnoví data v tabulce produktů"""
-        if self.load_data():
-            self.main_window.status_bar.showMessage("Data byla obnovena")
+        """Obnoví data v tabulce produktů - přírůstkově, pokud už byla načtena"""
+        if self.product_watermark is None:
+            self.load_data_async()
+            return
+        self.set_loading(True)
+        run_in_background(self.db, self.fetch_changes, self.apply_changes, self.on_refresh_failed)
+
+    def on_refresh_failed(self, message):
+        self.set_loading(False)
+        QMessageBox.critical(self, "Chyba", f"Nepodařilo se obnovit produkty: {message}")
 
     def change_isolation_level(self, level):
-        try:
-            cursor = self.db.connection.cursor()
-            cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {level}")
-            self.main_window.status_bar.showMessage(f"Izolační úroveň nastavena na: {level}")
-        except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Nelze změnit izolační úroveň: {str(e)}")
+        """Zvolí úroveň, se kterou demonstrace čte (session A).
+
+        Demonstrace si půjčuje vlastní spojení z poolu, ostatní operace
+        používají profily z config.conf.
+        """
+        self.main_window.status_bar.showMessage(f"Izolační úroveň demonstrace nastavena na: {level}")
 
     def demonstrate_non_repeatable_reads(self):
-        """Demonstrace problému Non-repeatable reads s použitím transakce"""
-        selected = self.table.selectedItems()
-        if not selected:
+        """Automatická demonstrace Non-repeatable reads se dvěma session.
+
+        Obě transakce proběhnou na pozadí podle pevné časové osy, dialog
+        s výsledkem se otevře až po jejich ukončení - žádný zámek tak
+        nečeká na kliknutí uživatele.
+        """
+        product_id = self.selected_product_id()
+        if product_id is None:
             QMessageBox.warning(self, "Varování", "Vyberte produkt pro demonstraci")
             return
-                
-        row = selected[0].row()
-        product_id = int(self.table.item(row, 0).text())
-            
-        try:
-            cursor = self.db.connection.cursor()
-            
-            # Začátek transakce
-            cursor.execute("BEGIN TRANSACTION")
-            
-            try:
-                # První čtení v rámci transakce
-                cursor.execute("SELECT Name, StockQuantity FROM Products WHERE ProductID = ?", 
-                            (product_id,))
-                first_read = cursor.fetchone()
-                
-                QMessageBox.information(
-                    self,
-                    "První čtení",
-                    f"""Stav produktu:
-                    Název: {first_read[0]}
-                    Množství: {first_read[1]}
-                    
-                    Nyní v druhé instanci aplikace změňte množství tohoto produktu
-                    a pak klikněte OK pro druhé čtení.
-                    
-                    Izolační úroveň: {self.isolation_combo.currentText()}""")
-                
-                # Druhé čtení ve stejné transakci
-                cursor.execute("SELECT Name, StockQuantity FROM Products WHERE ProductID = ?", 
-                            (product_id,))
-                second_read = cursor.fetchone()
-                
-                # Ukončení transakce
-                self.db.connection.commit()
-                
-                # Zobrazení výsledků
-                message = f"""Výsledek demonstrace:
-
-    První čtení:
-    Název: {first_read[0]}
-    Množství: {first_read[1]}
-
-    Druhé čtení:
-    Název: {second_read[0]}
-    Množství: {second_read[1]}
-
-    {'-' * 30}
-    Izolační úroveň: {self.isolation_combo.currentText()}
-
-    {'❌ Došlo k Non-repeatable read!' if first_read[1] != second_read[1] 
-    else '✅ Data zůstala konzistentní'}
-
-    Vysvětlení:
-    {self._get_isolation_explanation(first_read[1] != second_read[1])}"""
-                
-                QMessageBox.information(self, "Výsledek demonstrace", message)
-                
-            except Exception as e:
-                # Rollback v případě chyby
-                self.db.connection.rollback()
-                raise e
-                
-            finally:
-                # Obnovíme data v tabulce
-                self.load_data()
-                    
-        except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Chyba při demonstraci: {str(e)}")
 
-    def _get_isolation_explanation(self, changed):
-        """Vrátí vysvětlení podle izolační úrovně a výsledku"""
         level = self.isolation_combo.currentText()
+        self.demo_btn.setEnabled(False)
+        self.main_window.status_bar.showMessage(f"Probíhá demonstrace ({level})...")
+        run_in_background(
+            None,
+            lambda: run_non_repeatable_read(self.db, product_id, level),
+            self.on_demo_finished,
+            self.on_demo_failed
+        )
+
+    def on_demo_finished(self, result):
+        self.demo_btn.setEnabled(True)
+        self.main_window.status_bar.showMessage("Demonstrace dokončena")
+        # Sklad je vrácen, ale LastUpdated se změnilo
+        self.refresh_data()
+        dialog = DemoDialog(self)
+        dialog.show_result(result, self._get_isolation_explanation(result['anomaly'],
+                                                                   result['level']))
+        dialog.exec()
+
+    def on_demo_failed(self, message):
+        self.demo_btn.setEnabled(True)
+        QMessageBox.critical(self, "Chyba", f"Chyba při demonstraci: {message}")
+
+    def _get_isolation_explanation(self, changed, level):
+        """Vrátí vysvětlení podle izolační úrovně a výsledku"""
         if level in ["READ UNCOMMITTED", "READ COMMITTED"]:
             if changed:
                 return """Při této izolační úrovni není zajištěno, že opakované čtení 
@@ -262,7 +340,7 @@ class ProductsTab(QWidget):
             else:
                 return """I když data zůstala stejná, při této izolační úrovni 
                 není garantováno, že opakované čtení vrátí stejné výsledky."""
-        else:  # REPEATABLE READ nebo SERIALIZABLE
+        else:  # REPEATABLE READ, SNAPSHOT nebo SERIALIZABLE
             if changed:
                 return """Při této izolační úrovni by nemělo dojít ke změně dat 
                 mezi čteními. Pokud vidíte rozdíl, může to být způsobeno 
@@ -4,42 +4,37 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                            QFileDialog, QMessageBox)
 import json
 import csv
-import xml.etree.ElementTree as ET
 from datetime import datetime
 
 # ui/tabs/settings_tab.py
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, 
                            QPushButton, QLabel, QComboBox,
-                           QFileDialog, QMessageBox, QGroupBox)
-import json
-import os
+                           QFileDialog, QMessageBox, QGroupBox,
+                           QCheckBox)
+from database import ISOLATION_LEVELS
+from ui.workers import WorkerSignals, run_in_background
+from data_transfer import (BulkLoadError, bulk_insert, export_table,
+                           iter_json_records, iter_xml_records)
 
 class SettingsTab(QWidget):
     def __init__(self, db, main_window):
         super().__init__()
         self.db = db
         self.main_window = main_window
-        self.settings_file = "settings.json"
         self.init_ui()
-        self.load_settings()
 
     def init_ui(self):
         layout = QVBoxLayout(self)
 
         # Sekce pro izolační úrovně transakcí
-        isolation_group = QGroupBox("Nastavení izolační úrovně transakcí")
+        isolation_group = QGroupBox("Izolační úrovně transakcí")
         isolation_layout = QVBoxLayout()
 
-        # ComboBox pro výběr izolační úrovně
-        self.isolation_label = QLabel("Výchozí izolační úroveň:")
+        # ComboBox pro výběr izolační úrovně, jejíž popis se zobrazí.
+        # Úrovně spojení určují profily operací v config.conf.
+        self.isolation_label = QLabel("Popis izolační úrovně:")
         self.isolation_combo = QComboBox()
-        self.isolation_combo.addItems([
-            "READ UNCOMMITTED",
-            "READ COMMITTED",
-            "REPEATABLE READ",
-            "SERIALIZABLE"
-        ])
-        self.isolation_combo.currentTextChanged.connect(self.change_isolation_level)
+        self.isolation_combo.addItems(ISOLATION_LEVELS)
 
         # Přidání vysvětlujícího textu
         self.explanation_label = QLabel()
@@ -49,13 +44,32 @@ class SettingsTab(QWidget):
         isolation_layout.addWidget(self.isolation_label)
         isolation_layout.addWidget(self.isolation_combo)
         isolation_layout.addWidget(self.explanation_label)
+
+        # Profily operací z config.conf - seznamy, exporty a zápisy mají vlastní úroveň
+        self.profiles_label = QLabel()
+        self.update_profiles_label()
+        isolation_layout.addWidget(self.profiles_label)
         isolation_group.setLayout(isolation_layout)
         layout.addWidget(isolation_group)
 
-        # Tlačítko pro uložení nastavení
-        save_btn = QPushButton("Uložit nastavení")
-        save_btn.clicked.connect(self.save_settings)
-        layout.addWidget(save_btn)
+        # Sekce pro snapshot izolaci (verzování řádků v tempdb)
+        snapshot_group = QGroupBox("Snapshot izolace")
+        snapshot_layout = QVBoxLayout()
+        self.snapshot_status_label = QLabel("Stav nezjištěn")
+        self.rcsi_check = QCheckBox("Zapnout i READ_COMMITTED_SNAPSHOT (READ COMMITTED bez sdílených zámků)")
+        snapshot_buttons = QHBoxLayout()
+        check_snapshot_btn = QPushButton("Zkontrolovat")
+        check_snapshot_btn.clicked.connect(self.check_snapshot_status)
+        self.enable_snapshot_btn = QPushButton("Zapnout snapshot izolaci")
+        self.enable_snapshot_btn.clicked.connect(self.enable_snapshot_isolation)
+        snapshot_buttons.addWidget(check_snapshot_btn)
+        snapshot_buttons.addWidget(self.enable_snapshot_btn)
+        snapshot_buttons.addStretch()
+        snapshot_layout.addWidget(self.snapshot_status_label)
+        snapshot_layout.addWidget(self.rcsi_check)
+        snapshot_layout.addLayout(snapshot_buttons)
+        snapshot_group.setLayout(snapshot_layout)
+        layout.addWidget(snapshot_group)
 
         
         # Sekce pro import
@@ -64,14 +78,14 @@ class SettingsTab(QWidget):
         import_group.addWidget(import_label)
         
         # Import produktů
-        import_products_btn = QPushButton("Import produktů")
-        import_products_btn.clicked.connect(lambda: self.import_data("products"))
-        import_group.addWidget(import_products_btn)
+        self.import_products_btn = QPushButton("Import produktů")
+        self.import_products_btn.clicked.connect(lambda: self.import_data("products"))
+        import_group.addWidget(self.import_products_btn)
         
         # Import kategorií
-        import_categories_btn = QPushButton("Import kategorií")
-        import_categories_btn.clicked.connect(lambda: self.import_data("categories"))
-        import_group.addWidget(import_categories_btn)
+        self.import_categories_btn = QPushButton("Import kategorií")
+        self.import_categories_btn.clicked.connect(lambda: self.import_data("categories"))
+        import_group.addWidget(self.import_categories_btn)
         
         layout.addLayout(import_group)
         
@@ -81,14 +95,14 @@ class SettingsTab(QWidget):
         export_group.addWidget(export_label)
         
         # Export produktů
-        export_products_btn = QPushButton("Export produktů")
-        export_products_btn.clicked.connect(lambda: self.export_data("products"))
-        export_group.addWidget(export_products_btn)
+        self.export_products_btn = QPushButton("Export produktů")
+        self.export_products_btn.clicked.connect(lambda: self.export_data("products"))
+        export_group.addWidget(self.export_products_btn)
         
         # Export kategorií
-        export_categories_btn = QPushButton("Export kategorií")
-        export_categories_btn.clicked.connect(lambda: self.export_data("categories"))
-        export_group.addWidget(export_categories_btn)
+        self.export_categories_btn = QPushButton("Export kategorií")
+        self.export_categories_btn.clicked.connect(lambda: self.export_data("categories"))
+        export_group.addWidget(self.export_categories_btn)
         
         layout.addLayout(export_group)
         layout.addStretch()
@@ -99,233 +113,157 @@ class SettingsTab(QWidget):
             self,
             f"Vyberte soubor pro import {data_type}",
             "",
-            "CSV soubory (*.csv);;JSON soubory (*.json);;XML soubory (*.xml)"
+            "CSV soubory (*.csv);;JSON soubory (*.json *.ndjson *.jsonl);;XML soubory (*.xml)"
         )
         
         if not file_name:
             return
-            
-        try:
-            file_extension = file_name.split('.')[-1].lower()
-            
-            if file_extension == 'csv':
-                self.import_from_csv(file_name, data_type)
-            elif file_extension == 'json':
-                self.import_from_json(file_name, data_type)
-            elif file_extension == 'xml':
-                self.import_from_xml(file_name, data_type)
-                
-            self.main_window.status_bar.showMessage(f"Data byla úspěšně importována")
-            # Obnovení dat v příslušné záložce
-            if data_type == "products":
-                self.main_window.products_tab.load_data()
-            elif data_type == "categories":
-                self.main_window.categories_tab.load_data()
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Chyba při importu: {str(e)}")
+
+        file_extension = file_name.split('.')[-1].lower()
+        importers = {
+            'csv': self.import_from_csv,
+            'json': self.import_from_json,
+            'ndjson': self.import_from_json,
+            'jsonl': self.import_from_json,
+            'xml': self.import_from_xml
+        }
+        if file_extension not in importers:
+            QMessageBox.critical(self, "Chyba",
+                                 f"Chyba při importu: Nepodporovaný formát souboru: {file_extension}")
+            return
+
+        # Import běží ve workeru, průběh chodí signálem do GUI vlákna
+        self.set_transfer_running(True)
+        self.transfer_signals = WorkerSignals()
+        self.transfer_signals.progress.connect(self.on_import_progress)
+        report = self.transfer_signals.progress.emit
+        importer = importers[file_extension]
+
+        def run():
+            try:
+                return data_type, importer(file_name, data_type, lambda *args: report(args)), None
+            except BulkLoadError as e:
+                # Počet uložených řádků by se přes signál error ztratil
+                return data_type, None, e
+
+        run_in_background(None, run, self.on_import_finished, self.on_import_failed)
+
+    def on_import_progress(self, progress):
+        rows, elapsed = progress
+        rate = rows / elapsed if elapsed > 0 else 0
+        self.main_window.status_bar.showMessage(
+            f"Importováno {rows} řádků ({rate:.0f} řádků/s)...")
+
+    def on_import_finished(self, result):
+        data_type, stats, error = result
+        self.set_transfer_running(False)
+        # Obnovení dat v příslušné záložce (i po částečném importu)
+        if data_type == "products":
+            self.main_window.products_tab.refresh_data()
+        elif data_type == "categories":
+            self.main_window.categories_tab.load_data_async()
+
+        if error is not None:
+            QMessageBox.critical(self, "Chyba",
+                                 f"Chyba při importu: {str(error)}\n\n"
+                                 f"Úspěšně uloženo řádků: {error.rows_committed}")
+            return
+        self.main_window.status_bar.showMessage(
+            f"Importováno {stats['rows']} řádků za {stats['seconds']:.1f} s "
+            f"({stats['rows_per_second']:.0f} řádků/s)")
+
+    def on_import_failed(self, message):
+        self.set_transfer_running(False)
+        QMessageBox.critical(self, "Chyba", f"Chyba při importu: {message}")
+
+    def set_transfer_running(self, running):
+        """Během importu/exportu nejde spustit další přenos"""
+        for button in (self.import_products_btn, self.import_categories_btn,
+                       self.export_products_btn, self.export_categories_btn):
+            button.setEnabled(not running)
 
     def export_data(self, data_type):
         file_name, _ = QFileDialog.getSaveFileName(
             self,
             f"Uložit {data_type} jako",
             "",
-            "CSV soubory (*.csv);;JSON soubory (*.json);;XML soubory (*.xml)"
+            "CSV soubory (*.csv);;JSON soubory (*.json);;NDJSON soubory (*.ndjson);;XML soubory (*.xml)"
         )
         
         if not file_name:
             return
-            
+
+        file_extension = file_name.split('.')[-1].lower()
+        formats = {
+            'csv': 'csv',
+            'json': 'json',
+            'ndjson': 'ndjson',
+            'jsonl': 'ndjson',
+            'xml': 'xml'
+        }
+        if file_extension not in formats:
+            QMessageBox.critical(self, "Chyba",
+                                 f"Chyba při exportu: Nepodporovaný formát souboru: {file_extension}")
+            return
+
+        # Export běží ve workeru, průběh chodí signálem do GUI vlákna
+        self.set_transfer_running(True)
+        self.transfer_signals = WorkerSignals()
+        self.transfer_signals.progress.connect(self.on_export_progress)
+        report = self.transfer_signals.progress.emit
+        run_in_background(
+            None,
+            lambda: self.export_to_file(file_name, data_type, formats[file_extension],
+                                        lambda *args: report(args)),
+            self.on_export_finished,
+            self.on_export_failed
+        )
+
+    def on_export_progress(self, progress):
+        rows, elapsed = progress
+        rate = rows / elapsed if elapsed > 0 else 0
+        self.main_window.status_bar.showMessage(
+            f"Exportováno {rows} řádků ({rate:.0f} řádků/s)...")
+
+    def on_export_finished(self, stats):
+        self.set_transfer_running(False)
+        self.main_window.status_bar.showMessage(
+            f"Exportováno {stats['rows']} řádků za {stats['seconds']:.1f} s "
+            f"({stats['rows_per_second']:.0f} řádků/s)")
+
+    def on_export_failed(self, message):
+        self.set_transfer_running(False)
+        QMessageBox.critical(self, "Chyba", f"Chyba při exportu: {message}")
+
+    def bulk_load(self, records, data_type, report=None):
+        """Vloží záznamy po dávkách s commitem po každé dávce (běží ve workeru)"""
+        batch_size = self.db.config.get_transfer_settings()['batch_size']
         try:
-            file_extension = file_name.split('.')[-1].lower()
-            
-            if file_extension == 'csv':
-                self.export_to_csv(file_name, data_type)
-            elif file_extension == 'json':
-                self.export_to_json(file_name, data_type)
-            elif file_extension == 'xml':
-                self.export_to_xml(file_name, data_type)
-                
-            self.main_window.status_bar.showMessage(f"Data byla úspěšně exportována")
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Chyba při exportu: {str(e)}")
-
-    def import_from_csv(self, file_name, data_type):
+            with self.db.connection_for('bulk_import') as connection:
+                return bulk_insert(connection, data_type, records, batch_size, report)
+        finally:
+            # I částečný import mohl změnit tabulku
+            self.db.invalidate(data_type)
+
+    def export_to_file(self, file_name, data_type, file_format, report=None):
+        """Průběžně zapisuje data po dávkách z fetchmany, bez načtení celé tabulky (běží ve workeru)"""
+        fetch_size = self.db.config.get_transfer_settings()['fetch_size']
+        with self.db.connection_for('report') as connection:
+            return export_table(connection, data_type, file_name, file_format,
+                                fetch_size, report)
+
+    def import_from_csv(self, file_name, data_type, report=None):
         with open(file_name, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            cursor = self.db.connection.cursor()
-            
-            if data_type == "products":
-                for row in reader:
-                    cursor.execute("""
-                        INSERT INTO Products (CategoryID, Name, Price, StockQuantity, Status)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (
-                        int(row['CategoryID']),
-                        row['Name'],
-                        float(row['Price']),
-                        int(row['StockQuantity']),
-                        row['Status']
-                    ))
-            
-            elif data_type == "categories":
-                for row in reader:
-                    cursor.execute("""
-                        INSERT INTO Categories (Name, Description, IsActive)
-                        VALUES (?, ?, ?)
-                    """, (
-                        row['Name'],
-                        row['Description'],
-                        row['IsActive'].lower() == 'true'
-                    ))
-            
-            self.db.connection.commit()
-
-    def export_to_csv(self, file_name, data_type):
-        cursor = self.db.connection.cursor()
-        
-        if data_type == "products":
-            cursor.execute("""
-                SELECT p.CategoryID, p.Name, p.Price, p.StockQuantity, p.Status
-                FROM Products p
-            """)
-            fieldnames = ['CategoryID', 'Name', 'Price', 'StockQuantity', 'Status']
-            
-        elif data_type == "categories":
-            cursor.execute("""
-                SELECT Name, Description, IsActive
-                FROM Categories
-            """)
-            fieldnames = ['Name', 'Description', 'IsActive']
-        
-        rows = cursor.fetchall()
-        
-        with open(file_name, 'w', newline='', encoding='utf-8') as file:
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for row in rows:
-                writer.writerow(dict(zip(fieldnames, row)))
-
-    def import_from_json(self, file_name, data_type):
+            return self.bulk_load(csv.DictReader(file), data_type, report)
+
+    def import_from_json(self, file_name, data_type, report=None):
+        # JSON pole i NDJSON (objekt na řádek) se čtou průběžně, formát se pozná z obsahu
         with open(file_name, 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            cursor = self.db.connection.cursor()
-            
-            if data_type == "products":
-                for item in data:
-                    cursor.execute("""
-                        INSERT INTO Products (CategoryID, Name, Price, StockQuantity, Status)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (
-                        item['CategoryID'],
-                        item['Name'],
-                        item['Price'],
-                        item['StockQuantity'],
-                        item['Status']
-                    ))
-            
-            elif data_type == "categories":
-                for item in data:
-                    cursor.execute("""
-                        INSERT INTO Categories (Name, Description, IsActive)
-                        VALUES (?, ?, ?)
-                    """, (
-                        item['Name'],
-                        item['Description'],
-                        item['IsActive']
-                    ))
-            
-            self.db.connection.commit()
-
-    def export_to_json(self, file_name, data_type):
-        cursor = self.db.connection.cursor()
-        
-        if data_type == "products":
-            cursor.execute("""
-                SELECT CategoryID, Name, Price, StockQuantity, Status
-                FROM Products
-            """)
-            columns = ['CategoryID', 'Name', 'Price', 'StockQuantity', 'Status']
-            
-        elif data_type == "categories":
-            cursor.execute("""
-                SELECT Name, Description, IsActive
-                FROM Categories
-            """)
-            columns = ['Name', 'Description', 'IsActive']
-        
-        rows = cursor.fetchall()
-        data = [dict(zip(columns, row)) for row in rows]
-        
-        with open(file_name, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=2, ensure_ascii=False)
+            return self.bulk_load(iter_json_records(file), data_type, report)
 
-    def import_from_xml(self, file_name, data_type):
-        tree = ET.parse(file_name)
-        root = tree.getroot()
-        cursor = self.db.connection.cursor()
-        
-        if data_type == "products":
-            for product in root.findall('product'):
-                cursor.execute("""
-                    INSERT INTO Products (CategoryID, Name, Price, StockQuantity, Status)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    int(product.find('CategoryID').text),
-                    product.find('Name').text,
-                    float(product.find('Price').text),
-                    int(product.find('StockQuantity').text),
-                    product.find('Status').text
-                ))
-        
-        elif data_type == "categories":
-            for category in root.findall('category'):
-                cursor.execute("""
-                    INSERT INTO Categories (Name, Description, IsActive)
-                    VALUES (?, ?, ?)
-                """, (
-                    category.find('Name').text,
-                    category.find('Description').text,
-                    category.find('IsActive').text.lower() == 'true'
-                ))
-        
-        self.db.connection.commit()
+    def import_from_xml(self, file_name, data_type, report=None):
+        return self.bulk_load(iter_xml_records(file_name, data_type), data_type, report)
 
-    def export_to_xml(self, file_name, data_type):
-        cursor = self.db.connection.cursor()
-        root = ET.Element("data")
-        
-        if data_type == "products":
-            cursor.execute("""
-                SELECT CategoryID, Name, Price, StockQuantity, Status
-                FROM Products
-            """)
-            columns = ['CategoryID', 'Name', 'Price', 'StockQuantity', 'Status']
-            
-            for row in cursor.fetchall():
-                product = ET.SubElement(root, "product")
-                for col, value in zip(columns, row):
-                    elem = ET.SubElement(product, col)
-                    elem.text = str(value)
-                    
-        elif data_type == "categories":
-            cursor.execute("""
-                SELECT Name, Description, IsActive
-                FROM Categories
-            """)
-            columns = ['Name', 'Description', 'IsActive']
-            
-            for row in cursor.fetchall():
-                category = ET.SubElement(root, "category")
-                for col, value in zip(columns, row):
-                    elem = ET.SubElement(category, col)
-                    elem.text = str(value)
-        
-        tree = ET.ElementTree(root)
-        tree.write(file_name, encoding='utf-8', xml_declaration=True)
-        
     def update_explanation(self):
         """Aktualizuje vysvětlující text podle vybrané izolační úrovně"""
         explanations = {
@@ -347,6 +285,13 @@ class SettingsTab(QWidget):
                 - Stejná data při opakovaném čtení
                 - Vhodné pro důležité transakce
             """,
+            "SNAPSHOT": """
+                Verzování řádků místo sdílených zámků.
+                - Transakce čte data platná k jejímu začátku
+                - Čtení neblokuje zápisy a zápisy neblokují čtení
+                - Souběžná změna stejného řádku skončí konfliktem (chyba 3960)
+                - Vyžaduje ALLOW_SNAPSHOT_ISOLATION ON
+            """,
             "SERIALIZABLE": """
                 Nejvyšší úroveň izolace.
                 - Plně sériové zpracování
@@ -357,48 +302,59 @@ class SettingsTab(QWidget):
         current_level = self.isolation_combo.currentText()
         self.explanation_label.setText(explanations[current_level])
 
-    def change_isolation_level(self, level):
-        """Změní izolační úroveň v databázi"""
-        try:
-            cursor = self.db.connection.cursor()
-            cursor.execute(f"SET TRANSACTION ISOLATION LEVEL {level}")
-            self.main_window.status_bar.showMessage(f"Izolační úroveň nastavena na: {level}")
-        except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Nelze změnit izolační úroveň: {str(e)}")
-
-    def load_settings(self):
-        """Načte uložené nastavení"""
-        try:
-            if os.path.exists(self.settings_file):
-                with open(self.settings_file, 'r') as f:
-                    settings = json.load(f)
-                    # Nastavení izolační úrovně
-                    isolation_level = settings.get('isolation_level', 'READ COMMITTED')
-                    self.isolation_combo.setCurrentText(isolation_level)
-                    self.change_isolation_level(isolation_level)
-        except Exception as e:
-            QMessageBox.warning(self, "Varování", f"Nelze načíst nastavení: {str(e)}")
-
-    def save_settings(self):
-        """Uloží aktuální nastavení"""
-        try:
-            settings = {
-                'isolation_level': self.isolation_combo.currentText()
-            }
-            with open(self.settings_file, 'w') as f:
-                json.dump(settings, f)
-            self.main_window.status_bar.showMessage("Nastavení bylo uloženo")
-            
-            # Přidáme popup s potvrzením
-            QMessageBox.information(
-                self,
-                "Úspěch",
-                "Nastavení bylo úspěšně uloženo!\n\nIzolační úroveň: " + self.isolation_combo.currentText()
-            )
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Chyba", f"Nelze uložit nastavení: {str(e)}")    
-
-    def get_current_isolation_level(self):
-        """Vrátí aktuální izolační úroveň"""
-        return self.isolation_combo.currentText()
\ No newline at end of file
+    def update_profiles_label(self):
+        """Zobrazí izolační úrovně jednotlivých profilů operací"""
+        profiles = self.db.config.get_isolation_profiles()
+        lines = [f"  {name}: {level}" for name, level in sorted(profiles.items())]
+        self.profiles_label.setText(
+            "Profily operací (config.conf, [ISOLATION_PROFILES]):\n" + "\n".join(lines))
+
+    def check_snapshot_status(self):
+        """Zjistí, zda databáze povoluje SNAPSHOT a READ_COMMITTED_SNAPSHOT (ve workeru)"""
+        self.snapshot_status_label.setText("Zjišťování stavu...")
+        run_in_background(None, self.db.get_snapshot_status,
+                          self.on_snapshot_status_loaded, self.on_snapshot_status_failed)
+
+    def on_snapshot_status_loaded(self, status):
+        self.show_snapshot_status(*status)
+
+    def on_snapshot_status_failed(self, message):
+        self.snapshot_status_label.setText("Stav nezjištěn")
+        QMessageBox.critical(self, "Chyba", f"Nelze zjistit stav snapshot izolace: {message}")
+
+    def show_snapshot_status(self, allowed, rcsi):
+        self.snapshot_status_label.setText(
+            f"ALLOW_SNAPSHOT_ISOLATION: {'ON' if allowed else 'OFF'}, "
+            f"READ_COMMITTED_SNAPSHOT: {'ON' if rcsi else 'OFF'}")
+        self.rcsi_check.setChecked(rcsi)
+
+    def enable_snapshot_isolation(self):
+        """Zapne snapshot izolaci, případně i READ_COMMITTED_SNAPSHOT"""
+        rcsi = self.rcsi_check.isChecked()
+        text = "Zapnout ALLOW_SNAPSHOT_ISOLATION pro databázi?"
+        if rcsi:
+            text += ("\n\nREAD_COMMITTED_SNAPSHOT vyžaduje výhradní přístup k databázi - "
+                     "otevřené transakce ostatních spojení budou vráceny zpět.")
+        reply = QMessageBox.question(self, "Snapshot izolace", text,
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        self.enable_snapshot_btn.setEnabled(False)
+        self.main_window.status_bar.showMessage("Zapínání snapshot izolace...")
+        run_in_background(
+            None,
+            lambda: self.db.enable_snapshot_isolation(read_committed_snapshot=rcsi),
+            self.on_snapshot_enabled,
+            self.on_snapshot_enable_failed
+        )
+
+    def on_snapshot_enabled(self, status):
+        allowed, rcsi_on = status
+        self.enable_snapshot_btn.setEnabled(True)
+        self.show_snapshot_status(allowed, rcsi_on)
+        self.main_window.status_bar.showMessage("Snapshot izolace zapnuta")
+
+    def on_snapshot_enable_failed(self, message):
+        self.enable_snapshot_btn.setEnabled(True)
+        self.main_window.status_bar.showMessage("Snapshot izolaci se nepodařilo zapnout")
+        QMessageBox.critical(self, "Chyba", f"Nelze zapnout snapshot izolaci: {message}")
@@ -0,0 +1,201 @@
+# ui/tabs/tracing_tab.py
+from datetime import datetime
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
+                           QPushButton, QLabel, QCheckBox, QComboBox, QSpinBox,
+                           QTableWidget, QTableWidgetItem, QTextEdit, QSplitter,
+                           QGroupBox, QAbstractButton)
+from PyQt6.QtCore import Qt, QObject, QEvent, QTimer
+import tracing
+
+# Zobrazení řazení -> klíč v Tracer.top()
+SORT_KEYS = {
+    "Celkový čas": 'total_ms',
+    "Průměr": 'avg_ms',
+    "Maximum": 'max_ms',
+    "Počet": 'count'
+}
+RECENT_LIMIT = 200
+
+
+class ActionTracker(QObject):
+    """Filtr událostí aplikace: kliknutí na tlačítko je akce pro trasování.
+
+    Dotazy spuštěné sloty kliknutí v GUI vlákně (i z workerů, které tyto
+    sloty spustí) se v trasování připíší např. "Produkty: Smazat produkt".
+    Akce platí jen po dobu zpracování kliknutí.
+    """
+
+    def __init__(self, tabs):
+        super().__init__()
+        self.tabs = tabs
+
+    def eventFilter(self, obj, event):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and isinstance(obj, QAbstractButton) and obj.isEnabled()):
+            # Uvolnění tlačítka doručíme sami, aby sloty signálu clicked
+            # běžely uvnitř akce a pozdější dotazy se jí nepřipsaly
+            with tracing.action(f"{self.describe_place(obj)}: {obj.text()}"):
+                obj.event(event)
+            return True
+        return False
+
+    def describe_place(self, widget):
+        """Název záložky, ve které widget je, jinak titulek jeho okna"""
+        parent = widget
+        while parent is not None:
+            index = self.tabs.indexOf(parent)
+            if index >= 0:
+                return self.tabs.tabText(index)
+            parent = parent.parentWidget()
+        return widget.window().windowTitle()
+
+
+def _item(value):
+    table_item = QTableWidgetItem("" if value is None else str(value))
+    table_item.setFlags(table_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+    return table_item
+
+
+class TracingTab(QWidget):
+    """Přehled doby trvání SQL příkazů zaznamenaných ``db.tracer``"""
+
+    def __init__(self, db, main_window):
+        super().__init__()
+        self.db = db
+        self.main_window = main_window
+        self.top_stats = []
+        self.init_ui()
+
+        # Data jsou v paměti, obnova nesahá na databázi
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        control_layout = QHBoxLayout()
+        refresh_btn = QPushButton("Obnovit")
+        refresh_btn.clicked.connect(self.refresh)
+        reset_btn = QPushButton("Vymazat")
+        reset_btn.clicked.connect(self.reset)
+        self.auto_check = QCheckBox("Obnovovat automaticky")
+        self.auto_check.toggled.connect(self.toggle_auto_refresh)
+        self.sort_combo = QComboBox()
+        self.sort_combo.addItems(SORT_KEYS.keys())
+        self.sort_combo.currentTextChanged.connect(self.refresh)
+        self.top_spin = QSpinBox()
+        self.top_spin.setRange(5, 500)
+        self.top_spin.setValue(20)
+        self.top_spin.valueChanged.connect(self.refresh)
+
+        control_layout.addWidget(refresh_btn)
+        control_layout.addWidget(reset_btn)
+        control_layout.addWidget(self.auto_check)
+        control_layout.addWidget(QLabel("Řadit podle:"))
+        control_layout.addWidget(self.sort_combo)
+        control_layout.addWidget(QLabel("Top:"))
+        control_layout.addWidget(self.top_spin)
+        control_layout.addStretch()
+        layout.addLayout(control_layout)
+
+        settings = self.db.config.get_tracing_settings()
+        self.info_label = QLabel(
+            f"Pomalé dotazy (≥ {settings['slow_threshold_ms']:.0f} ms) se zapisují do "
+            f"{settings['slow_log']}" if settings['enabled'] else
+            "Trasování je vypnuté ([TRACING] enabled v config.conf)")
+        layout.addWidget(self.info_label)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+
+        # Příkazy s největším podílem na čase
+        top_group = QGroupBox("Nejnáročnější příkazy")
+        top_layout = QHBoxLayout(top_group)
+        self.top_table = QTableWidget()
+        self.top_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.top_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.top_table.itemSelectionChanged.connect(self.show_histogram)
+        self.histogram_text = QTextEdit()
+        self.histogram_text.setReadOnly(True)
+        self.histogram_text.setFontFamily("monospace")
+        top_layout.addWidget(self.top_table, 3)
+        top_layout.addWidget(self.histogram_text, 2)
+        splitter.addWidget(top_group)
+
+        # Posledních N příkazů
+        recent_group = QGroupBox("Poslední příkazy")
+        recent_layout = QVBoxLayout(recent_group)
+        self.recent_table = QTableWidget()
+        recent_layout.addWidget(self.recent_table)
+        splitter.addWidget(recent_group)
+
+        layout.addWidget(splitter)
+
+    def toggle_auto_refresh(self, enabled):
+        if enabled:
+            self.timer.start(2000)
+            self.refresh()
+        else:
+            self.timer.stop()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def reset(self):
+        self.db.tracer.reset()
+        self.refresh()
+
+    def refresh(self):
+        """Načte statistiky z traceru a naplní obě tabulky"""
+        key = SORT_KEYS[self.sort_combo.currentText()]
+        self.top_stats = self.db.tracer.top(self.top_spin.value(), key)
+
+        def ms(value):
+            return "" if value is None else f"{value:.1f}"
+
+        headers = ["SQL", "Počet", "Celkem ms", "Průměr ms", "p50 ≤ ms", "p99 ≤ ms",
+                   "Max ms", "Řádky", "Chyby", "Poslední akce"]
+        self.top_table.setColumnCount(len(headers))
+        self.top_table.setHorizontalHeaderLabels(headers)
+        self.top_table.setRowCount(len(self.top_stats))
+        for row, stats in enumerate(self.top_stats):
+            values = [stats['sql'], stats['count'], ms(stats['total_ms']), ms(stats['avg_ms']),
+                      stats['p50_ms'] or "více", stats['p99_ms'] or "více", ms(stats['max_ms']),
+                      stats['rows'], stats['errors'], stats['last_action']]
+            for col, value in enumerate(values):
+                table_item = _item(value)
+                if col == 0:
+                    table_item.setToolTip(stats['sql'])
+                self.top_table.setItem(row, col, table_item)
+        self.top_table.setColumnWidth(0, 400)
+
+        recent = self.db.tracer.recent(RECENT_LIMIT)
+        headers = ["Čas", "Akce", "SQL", "Parametry", "Provedení ms", "Načtení ms",
+                   "Řádky", "Chyba"]
+        self.recent_table.setColumnCount(len(headers))
+        self.recent_table.setHorizontalHeaderLabels(headers)
+        self.recent_table.setRowCount(len(recent))
+        for row, record in enumerate(recent):
+            values = [datetime.fromtimestamp(record.started).strftime('%H:%M:%S.%f')[:-3],
+                      record.action, record.sql, record.params,
+                      ms(record.execute_seconds * 1000), ms(record.fetch_seconds * 1000),
+                      record.rows, record.error]
+            for col, value in enumerate(values):
+                self.recent_table.setItem(row, col, _item(value))
+        self.recent_table.setColumnWidth(2, 400)
+
+    def show_histogram(self):
+        """Textový histogram latencí vybraného příkazu"""
+        rows = self.top_table.selectionModel().selectedRows()
+        if not rows or rows[0].row() >= len(self.top_stats):
+            return
+        stats = self.top_stats[rows[0].row()]
+        buckets = stats['buckets']
+        largest = max(buckets) or 1
+        labels = [f"≤ {bound} ms" for bound in tracing.HISTOGRAM_BOUNDS_MS]
+        labels.append(f"> {tracing.HISTOGRAM_BOUNDS_MS[-1]} ms")
+        lines = [stats['sql'], ""]
+        for label, count in zip(labels, buckets):
+            bar = "█" * round(40 * count / largest)
+            lines.append(f"{label:>11} {count:>7} {bar}")
+        self.histogram_text.setPlainText("\n".join(lines))
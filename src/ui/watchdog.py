@@ -0,0 +1,191 @@
+# ui/watchdog.py
+import json
+import linecache
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+# Kód aplikace - jen jeho rámce se berou jako místo volání
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_FILE = os.path.join(SRC_DIR, 'main.py')
+
+# Volání, ve kterých běží vnořená smyčka událostí (modální dialog,
+# processEvents při dlouhé operaci) - zaseknutí způsobil až kód pod nimi
+NESTED_LOOP_CALLS = ('.exec(', 'processEvents(')
+
+UNKNOWN_SITE = "(neznámé místo)"
+MAX_SAMPLES = 50
+STACK_DEPTH = 40
+
+
+def capture_stack(frame):
+    """Zásobník od nejvnějšího rámce: seznam (soubor, řádek, funkce)"""
+    stack = []
+    while frame is not None and len(stack) < STACK_DEPTH:
+        code = frame.f_code
+        stack.append((code.co_filename, frame.f_lineno,
+                      getattr(code, 'co_qualname', code.co_name)))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def _is_app_frame(filename):
+    if filename.startswith('<'):
+        # <string>, <frozen ...> - nemají soubor v aplikaci
+        return False
+    filename = os.path.abspath(filename)
+    return (filename.startswith(SRC_DIR) and filename != ENTRY_FILE
+            and filename != os.path.abspath(__file__))
+
+
+def call_site(stack):
+    """Funkce aplikace, kterou smyčka událostí zavolala, např. OrdersTab.apply_filters.
+
+    Je to nejvnější rámec aplikace; pokud zásobník prochází vnořenou
+    smyčkou událostí, bere se první rámec aplikace pod ní.
+    """
+    site = None
+    nested = False
+    for filename, lineno, name in stack:
+        if _is_app_frame(filename) and (site is None or nested):
+            site = name
+            nested = False
+        if any(call in linecache.getline(filename, lineno) for call in NESTED_LOOP_CALLS):
+            nested = True
+    return site or UNKNOWN_SITE
+
+
+def format_stack(stack):
+    return [f"{os.path.relpath(filename, SRC_DIR) if filename.startswith(SRC_DIR) else filename}"
+            f":{lineno} in {name}" for filename, lineno, name in stack]
+
+
+class StallWatchdog(QObject):
+    """Měří, jak dlouho GUI vlákno nezpracovává události.
+
+    QTimer v GUI vlákně zapisuje čas posledního "tepu". Sledovací vlákno
+    kontroluje, jak je tep starý; pokud déle než ``threshold_ms``, bere
+    vzorky zásobníku GUI vlákna. Když smyčka událostí znovu naběhne, tep
+    zjistí délku mezery a zaseknutí se připíše místu volání, které se
+    ve vzorcích objevilo nejčastěji.
+    """
+
+    stall_detected = pyqtSignal(dict)
+
+    def __init__(self, heartbeat_ms=50, threshold_ms=250, parent=None):
+        super().__init__(parent)
+        # Watchdog se vytváří v GUI vlákně
+        self.thread_id = threading.get_ident()
+        self.heartbeat = heartbeat_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.sites = {}
+        self.started_at = None
+
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._beat)
+
+    def start(self):
+        self.started_at = time.time()
+        with self._lock:
+            self._last_beat = time.monotonic()
+        self.timer.start(int(self.heartbeat * 1000))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._monitor, name="gui-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1)
+            self._thread = None
+
+    def _beat(self):
+        """Tep v GUI vlákně; dlouhá mezera od minulého znamená zaseknutí"""
+        now = time.monotonic()
+        with self._lock:
+            gap = now - self._last_beat
+            self._last_beat = now
+            samples, self._samples = self._samples, []
+        stalled = gap - self.heartbeat
+        if stalled >= self.threshold:
+            self._record(stalled, samples)
+
+    def _monitor(self):
+        """Sledovací vlákno: při zaseknutí vzorkuje zásobník GUI vlákna"""
+        interval = self.threshold / 4
+        while not self._stop.wait(interval):
+            with self._lock:
+                last_beat = self._last_beat
+            if time.monotonic() - last_beat - self.heartbeat < self.threshold:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = capture_stack(frame)
+            del frame
+            with self._lock:
+                # Tep mezitím proběhl - vzorek už k zaseknutí nepatří
+                if self._last_beat == last_beat and len(self._samples) < MAX_SAMPLES:
+                    self._samples.append(stack)
+
+    def _record(self, seconds, samples):
+        sites = Counter(call_site(stack) for stack in samples)
+        site = sites.most_common(1)[0][0] if sites else UNKNOWN_SITE
+        stack = next((stack for stack in samples if call_site(stack) == site), [])
+        ms = seconds * 1000
+
+        entry = self.sites.get(site)
+        if entry is None:
+            entry = self.sites[site] = {
+                'site': site, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'last_at': None, 'stack': []
+            }
+        entry['count'] += 1
+        entry['total_ms'] += ms
+        entry['last_at'] = datetime.now().isoformat(timespec='seconds')
+        if ms >= entry['max_ms']:
+            # Zásobník nejdelšího zaseknutí na tomto místě
+            entry['max_ms'] = ms
+            entry['stack'] = format_stack(stack)
+        self.stall_detected.emit({'site': site, 'ms': ms, 'samples': len(samples)})
+
+    def summary(self):
+        """Celkové počty a místa volání seřazená podle celkové doby zaseknutí"""
+        sites = sorted(self.sites.values(), key=lambda entry: entry['total_ms'], reverse=True)
+        return {
+            'stalls': sum(entry['count'] for entry in sites),
+            'total_ms': sum(entry['total_ms'] for entry in sites),
+            'max_ms': max((entry['max_ms'] for entry in sites), default=0.0),
+            'sites': sites
+        }
+
+    def report(self):
+        report = {
+            'started': (datetime.fromtimestamp(self.started_at).isoformat(timespec='seconds')
+                        if self.started_at else None),
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'heartbeat_ms': self.heartbeat * 1000,
+            'threshold_ms': self.threshold * 1000
+        }
+        report.update(self.summary())
+        return report
+
+    def write_report(self, path):
+        """Zapíše JSON report; relativní cesta je vůči adresáři src"""
+        if not os.path.isabs(path):
+            path = os.path.join(SRC_DIR, path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
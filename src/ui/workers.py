@@ -0,0 +1,105 @@
+# ui/workers.py
+from PyQt6.QtWidgets import QLabel, QMessageBox
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+import tracing
+
+# Reference na běžící workery, aby je garbage collector neuklidil před dokončením
+_active_workers = set()
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+    # Průběžné zprávy z běžící funkce (např. neúspěšné pokusy o připojení)
+    progress = pyqtSignal(object)
+
+
+class DbWorker(QRunnable):
+    """Spustí funkci s vlastním spojením z poolu mimo GUI vlákno.
+
+    Spojení má izolační úroveň profilu ``profile``. Funkce musí jen číst:
+    po výpadku spojení se zavolá znovu na novém spojení. Bez ``db`` se
+    funkce zavolá bez argumentů a o spojení se stará sama. Výsledek (nebo
+    text chyby) se do GUI vlákna předá přes signály.
+    """
+
+    def __init__(self, db, fn, profile='list_read'):
+        super().__init__()
+        self.db = db
+        self.fn = fn
+        self.profile = profile
+        # Dotazy workeru se v trasování připíší akci, která ho spustila
+        self.action = tracing.current_action()
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            with tracing.action(self.action):
+                if self.db is None:
+                    result = self.fn()
+                else:
+                    result = self.db.run_read(self.fn, self.profile)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            _active_workers.discard(self)
+
+
+def run_in_background(db, fn, on_finished=None, on_error=None, profile='list_read'):
+    """Spustí ``fn(connection)`` na globálním QThreadPool.
+
+    ``on_finished`` a ``on_error`` by měly být metody objektů z GUI vlákna,
+    aby je Qt zavolal přes frontu událostí v GUI vlákně.
+    """
+    worker = DbWorker(db, fn, profile)
+    if on_finished:
+        worker.signals.finished.connect(on_finished)
+    if on_error:
+        worker.signals.error.connect(on_error)
+    _active_workers.add(worker)
+    QThreadPool.globalInstance().start(worker)
+    return worker
+
+
+class AsyncLoadMixin:
+    """Společné načítání dat záložky na pozadí.
+
+    Záložka implementuje ``fetch_data(connection)`` (běží ve workeru, nesmí
+    sahat na widgety), ``populate(data)`` (běží v GUI vlákně) a nastaví
+    ``load_error_message``. Data se čtou v izolačním profilu ``load_profile``.
+    """
+
+    load_error_message = "Nepodařilo se načíst data"
+    load_profile = 'list_read'
+
+    def create_loading_label(self):
+        self.loading_label = QLabel("Načítání dat...")
+        self.loading_label.hide()
+        return self.loading_label
+
+    def set_loading(self, loading):
+        """Zobrazí nebo skryje stav načítání"""
+        self.loading_label.setVisible(loading)
+        self.table.setEnabled(not loading)
+
+    def load_data_async(self):
+        """Spustí načtení dat na pozadí"""
+        self.set_loading(True)
+        run_in_background(self.db, self.fetch_data,
+                          self.on_data_loaded, self.on_load_failed, self.load_profile)
+
+    def on_data_loaded(self, data):
+        try:
+            self.populate(data)
+        except Exception as e:
+            self.on_load_failed(str(e))
+            return
+        self.set_loading(False)
+        self.main_window.tab_load_finished(self, True)
+
+    def on_load_failed(self, message):
+        self.set_loading(False)
+        QMessageBox.critical(self, "Chyba", f"{self.load_error_message}: {message}")
+        self.main_window.tab_load_finished(self, False)